@@ -0,0 +1,403 @@
+"""Offline benchmarks for SDK hot paths, with stored baselines and regression checks.
+
+    python benchmarks/run.py                                   # run and print
+    python benchmarks/run.py --save benchmarks/baseline.json   # record a baseline
+    python benchmarks/run.py --compare benchmarks/baseline.json
+
+Each round runs the suite in a fresh interpreter, since hash seeds, memory
+layout and the host's load differ per process; a case's result is its best
+round. A baseline also stores each case's spread over its fastest rounds as its
+threshold, so noisy cases get a wider band. Baselines are machine-specific:
+record them on the machine that compares against them.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from agentinterface import shaper
+from agentinterface.ai import _extract_text, _Session, _stream, protocol
+from agentinterface.callback import Http
+from agentinterface.wire import WireEncoder
+
+REPEATS = 5
+MIN_TIME = 0.1
+THRESHOLD = 0.25
+ROUNDS = 5
+
+_cases: dict[str, tuple[Callable[..., Any], int]] = {}
+
+
+def bench(name: str, ops: int = 1) -> Callable:
+    """Register a setup function returning the callable to time; ops per call."""
+
+    def register(setup: Callable[..., Any]) -> Callable[..., Any]:
+        _cases[name] = (setup, ops)
+        return setup
+
+    return register
+
+
+def _registry(size: int) -> dict[str, Any]:
+    return {
+        f"component{i}": {
+            "description": f"Component number {i} for benchmark registries",
+            "schema": {
+                "required": ["title"],
+                "properties": {
+                    "title": {"type": "string"},
+                    "value": {"type": "string"},
+                    "items": {"type": "array", "optional": True},
+                },
+            },
+        }
+        for i in range(size)
+    }
+
+
+@contextlib.contextmanager
+def _registry_cache(registry: dict[str, Any]):
+    previous, shaper._REGISTRY_CACHE = shaper._REGISTRY_CACHE, registry
+    try:
+        yield
+    finally:
+        shaper._REGISTRY_CACHE = previous
+
+
+@bench("protocol_large_registry")
+def protocol_large_registry(stack: contextlib.ExitStack) -> Callable[[], Any]:
+    directory = stack.enter_context(tempfile.TemporaryDirectory())
+    Path(directory, "ai.json").write_text(json.dumps({"components": _registry(500)}))
+    cwd = os.getcwd()
+    os.chdir(directory)
+    stack.callback(os.chdir, cwd)
+    return protocol
+
+
+@bench("protocol_component_list")
+def protocol_component_list(stack: contextlib.ExitStack) -> Callable[[], Any]:
+    components = [f"component{i}" for i in range(50)]
+    return lambda: protocol(components)
+
+
+@bench("validate_wide_tree")
+def validate_wide_tree(stack: contextlib.ExitStack) -> Callable[[], Any]:
+    stack.enter_context(_registry_cache(_registry(50)))
+    tree = [
+        {"type": f"component{i % 50}", "data": {"title": f"Item {i}", "value": str(i)}}
+        for i in range(2000)
+    ]
+    return lambda: shaper._validate_component_tree(tree)
+
+
+@bench("validate_deep_tree")
+def validate_deep_tree(stack: contextlib.ExitStack) -> Callable[[], Any]:
+    stack.enter_context(_registry_cache(_registry(50)))
+    tree: list[Any] = [{"type": "component0", "data": {"title": "leaf"}}]
+    for depth in range(200):
+        tree = [tree, {"type": f"component{depth % 50}", "data": {"title": str(depth)}}]
+    return lambda: shaper._validate_component_tree(tree)
+
+
+class _Message:
+    def __init__(self, content: str):
+        self.content = content
+
+
+@bench("extract_text", ops=5)
+def extract_text(stack: contextlib.ExitStack) -> Callable[[], Any]:
+    events = [
+        "plain text chunk",
+        {"content": "dict content"},
+        {"type": "tool", "output": "tool output"},
+        {"type": "status"},
+        _Message("object content"),
+    ]
+    return lambda: [_extract_text(event) for event in events]
+
+
+@bench("strip_fences_large")
+def strip_fences_large(stack: contextlib.ExitStack) -> Callable[[], Any]:
+    body = json.dumps([{"type": "markdown", "data": {"content": "x" * 200}}] * 5000)
+    fenced = f"Here are the components:\n```json\n{body}\n```\nDone."
+    return lambda: shaper._strip_markdown_fences(fenced)
+
+
+@bench("wire_encode_table")
+def wire_encode_table(stack: contextlib.ExitStack) -> Callable[[], Any]:
+    """A 500-row table plus cards sharing one author object, encoded on a fresh session."""
+    author = {"name": "Analytics team", "avatar": "https://example.com/avatar.png"}
+    tree = [
+        {
+            "type": "table",
+            "data": {
+                "columns": ["region", "quarter", "revenue", "notes"],
+                "rows": [
+                    {
+                        "region": f"Region {i % 12}",
+                        "quarter": f"Q{i % 4 + 1}",
+                        "revenue": i * 1000,
+                        "notes": {"status": "final", "owner": f"user{i}"},
+                    }
+                    for i in range(500)
+                ],
+            },
+        },
+        *[
+            {"type": "card", "data": {"title": f"Card {i}", "author": author, "body": "x" * 80}}
+            for i in range(50)
+        ],
+    ]
+    return lambda: WireEncoder().encode(tree)
+
+
+class _StubLLM:
+    async def generate(self, prompt: str) -> str:
+        return "[]"
+
+
+@bench("stream_passthrough", ops=1000)
+async def stream_passthrough(stack: contextlib.AsyncExitStack) -> Callable[[], Any]:
+    """Per-event overhead of _stream around an agent emitting 1000 events."""
+
+    async def agent(query: str):
+        for i in range(1000):
+            yield {"type": "token", "content": f"t{i}"}
+
+    async def run() -> None:
+        session = _Session(agent, _StubLLM(), None, None, 1, ("q",), {})
+        async for _event in _stream(session, agent("q")):
+            pass
+
+    return run
+
+
+@bench("callback_round_trip")
+async def callback_round_trip(stack: contextlib.AsyncExitStack) -> Callable[[], Any]:
+    """Register, POST over a keep-alive connection, resolve: asyncio backend."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    server = Http(port=port, backend="asyncio")._server
+    await server.ready()
+    stack.push_async_callback(server.close)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+    async def disconnect() -> None:
+        writer.close()
+        await writer.wait_closed()
+        await asyncio.sleep(0.01)  # let the server's connection handler exit
+
+    stack.push_async_callback(disconnect)
+    body = b'{"action": "select", "data": "A"}'
+
+    async def run() -> None:
+        callback = Http(id="bench", port=port, backend="asyncio")
+        interaction = asyncio.ensure_future(callback.await_interaction(timeout=5))
+        await asyncio.sleep(0)
+        writer.write(
+            b"POST /callback/bench HTTP/1.1\r\nContent-Type: application/json\r\n"
+            b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+        )
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+        await reader.readexactly(length)
+        await interaction
+
+    return run
+
+
+def _loops(elapsed: float, loops: int, min_time: float) -> Optional[int]:
+    if elapsed >= min_time:
+        return None
+    return loops * 10 if elapsed == 0 else max(loops + 1, int(loops * min_time / elapsed * 1.2))
+
+
+def _time_sync(fn: Callable[[], Any], min_time: float) -> float:
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        more = _loops(elapsed, loops, min_time)
+        if more is None:
+            break
+        loops = more
+
+    best = elapsed / loops
+    for _ in range(REPEATS - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+
+async def _time_async(fn: Callable[[], Any], min_time: float) -> float:
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            await fn()
+        elapsed = time.perf_counter() - start
+        more = _loops(elapsed, loops, min_time)
+        if more is None:
+            break
+        loops = more
+
+    best = elapsed / loops
+    for _ in range(REPEATS - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            await fn()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+
+async def _run_async(setup: Callable[..., Any], min_time: float) -> float:
+    async with contextlib.AsyncExitStack() as stack:
+        return await _time_async(await setup(stack), min_time)
+
+
+def measure(selected: Optional[str] = None, min_time: float = MIN_TIME) -> dict[str, float]:
+    """Microseconds per operation for each case whose name contains `selected`."""
+    results: dict[str, float] = {}
+    for name, (setup, ops) in _cases.items():
+        if selected and selected not in name:
+            continue
+        if asyncio.iscoroutinefunction(setup):
+            seconds = asyncio.run(_run_async(setup, min_time))
+        else:
+            with contextlib.ExitStack() as stack:
+                seconds = _time_sync(setup(stack), min_time)
+        results[name] = seconds / ops * 1e6
+    return results
+
+
+def _round(selected: Optional[str], min_time: float) -> dict[str, float]:
+    """One measure() in a fresh interpreter, so hash seeds and memory layout vary per round."""
+    command = [sys.executable, __file__, "--worker", "--min-time", str(min_time)]
+    if selected:
+        command += ["-k", selected]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def run(
+    selected: Optional[str] = None, min_time: float = MIN_TIME, rounds: int = ROUNDS
+) -> dict[str, list[float]]:
+    """Per-round microseconds per operation for each case whose name contains `selected`."""
+    samples: dict[str, list[float]] = {}
+    for _ in range(rounds):
+        for name, value in _round(selected, min_time).items():
+            samples.setdefault(name, []).append(value)
+    print(f"{'case':<28} {'us/op':>12} {'spread':>8}")
+    for name, values in samples.items():
+        print(f"{name:<28} {min(values):>12.3f} {_spread(values):>8.0%}")
+    return samples
+
+
+def _spread(values: list[float]) -> float:
+    """Relative range of the fastest half of a case's rounds; the noise left in its best.
+
+    Interference only slows a round down, so the slower half says little about the code.
+    """
+    fastest = sorted(values)[: (len(values) + 1) // 2]
+    return fastest[-1] / fastest[0] - 1 if fastest[0] else 0.0
+
+
+def compare(
+    results: dict[str, float],
+    baseline: dict[str, float],
+    threshold: float = THRESHOLD,
+    thresholds: Optional[dict[str, float]] = None,
+) -> list[str]:
+    """Names of cases slower than baseline by more than their threshold (0.25 = 25%).
+
+    thresholds holds per-case values from the baseline; threshold is the floor.
+    """
+    thresholds = thresholds or {}
+    regressions = []
+    print(f"\n{'case':<28} {'baseline':>12} {'current':>12} {'ratio':>7} {'limit':>7}")
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<28} {'-':>12} {current:>12.3f} {'new':>7}")
+            continue
+        limit = max(threshold, thresholds.get(name, 0.0))
+        ratio = current / before if before else float("inf")
+        flag = ""
+        if ratio > 1 + limit:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:<28} {before:>12.3f} {current:>12.3f} {ratio:>6.2f}x {1 + limit:>6.2f}x{flag}"
+        )
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="selected", help="only cases whose name contains this")
+    parser.add_argument("--save", type=Path, help="write results as a baseline file")
+    parser.add_argument("--compare", type=Path, help="baseline file to check against")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="minimum per case")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME, help="seconds per repeat")
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help="interpreters; best kept")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(measure(args.selected, args.min_time)))
+        return 0
+    if args.compare and not args.compare.exists():
+        print(f"No baseline at {args.compare}; record one on this machine with --save first")
+        return 2
+
+    samples = run(args.selected, args.min_time, args.rounds)
+    results = {name: min(values) for name, values in samples.items()}
+
+    if args.save:
+        args.save.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "results": {name: round(value, 4) for name, value in results.items()},
+                    "thresholds": {
+                        name: round(max(args.threshold, _spread(values)), 2)
+                        for name, values in samples.items()
+                    },
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(
+            results, baseline["results"], args.threshold, baseline.get("thresholds")
+        )
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over their thresholds")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,8 +2,42 @@
 
 __version__ = "1.0.0"
 from .ai import ai, protocol
-from .callback import Callback, Http
+from .broker import Broker, PageBroker, UnixSocketBroker
+from .callback import Callback, Http, Socket, mount
 from .llms import LLM, create_llm
-from .shaper import shape
+from .offload import AgentPool
+from .profiling import Profiler, set_profiler
+from .sessions import SessionStore
+from .shaper import shape, shape_components
+from .sync import iter_sync, run_sync
+from .telemetry import Hooks, OpenTelemetryHooks, PrometheusHooks, set_hooks
+from .usage import Completion, Usage, track
 
-__all__ = ["ai", "protocol", "shape", "create_llm", "LLM", "Callback", "Http"]
+__all__ = [
+    "ai",
+    "protocol",
+    "shape",
+    "shape_components",
+    "create_llm",
+    "LLM",
+    "Callback",
+    "Http",
+    "Socket",
+    "mount",
+    "Broker",
+    "PageBroker",
+    "UnixSocketBroker",
+    "SessionStore",
+    "AgentPool",
+    "run_sync",
+    "iter_sync",
+    "Hooks",
+    "set_hooks",
+    "OpenTelemetryHooks",
+    "PrometheusHooks",
+    "Completion",
+    "Usage",
+    "track",
+    "Profiler",
+    "set_profiler",
+]
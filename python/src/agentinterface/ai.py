@@ -3,14 +3,29 @@
 import asyncio
 import json
 import logging
+import time
+import uuid
 from typing import Any, Awaitable, Callable, Optional, Union
 
 from .callback import Callback
+from .canonical import etag
+from .deadline import bounded, expires_in, until
+from .history import DEFAULT_CONTEXT_BUDGET, ContextWindow
+from .incremental import SectionCache
 from .llms import LLM, create_llm
+from .offload import AgentPool, is_async
+from .patch import TreeDiffer
+from .prefetch import Prefetcher
+from .profiling import sample
+from .sessions import SessionStore
+from .telemetry import count, observe, span
+from .usage import attributed
+from .wire import WireEncoder
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_INTERACTION_TIMEOUT = 300
+ENCODINGS = ("json", "compact")
 
 
 def protocol(components: Optional[list[str]] = None) -> str:
@@ -86,103 +101,417 @@ def ai(
     components: Optional[list[str]] = None,
     callback: Optional[Callback] = None,
     timeout: int = DEFAULT_INTERACTION_TIMEOUT,
+    *,
+    page_size: Optional[int] = None,
+    encoding: str = "json",
+    incremental: bool = False,
+    delta: bool = False,
+    context_budget: int = DEFAULT_CONTEXT_BUDGET,
+    summarize_context: bool = False,
+    sessions: Optional[SessionStore] = None,
+    prefetch: int = 0,
+    deadline: Optional[float] = None,
+    progressive: bool = False,
+    pool: Optional[AgentPool] = None,
 ) -> Callable:
-    """Universal agent-to-UI wrapper."""
+    """Universal agent-to-UI wrapper.
+
+    deadline bounds each response (agent, shaping and provider calls) in seconds; user
+    think time between continuation turns is not counted. progressive emits a markdown
+    tree as soon as the agent finishes, then the shaped tree when it arrives. pool runs
+    blocking sync agents off the event loop; the wrapper then returns an awaitable.
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown encoding: {encoding}")
     llm_instance = create_llm(llm) if isinstance(llm, str) else llm
 
-    def enhanced(*agent_args, **agent_kwargs):
+    def invoke(agent_args: tuple[Any, ...], agent_kwargs: dict[str, Any]) -> Any:
+        expires = expires_in(deadline)
+        if pool is not None and not is_async(agent):
+            return _offload(
+                pool, agent, llm_instance, components, agent_args, agent_kwargs, expires
+            )
         agent_output = agent(*agent_args, **agent_kwargs)
 
         if hasattr(agent_output, "__aiter__"):
-            return _stream(
+            session = _Session(
                 agent,
-                agent_output,
                 llm_instance,
                 components,
                 callback,
+                timeout,
                 agent_args,
                 agent_kwargs,
-                timeout,
+                page_size=page_size,
+                encoder=WireEncoder() if encoding == "compact" else None,
+                cache=SectionCache() if incremental else None,
+                differ=TreeDiffer() if delta else None,
+                context_budget=context_budget,
+                summarizer=llm_instance if summarize_context else None,
+                sessions=sessions,
+                prefetcher=Prefetcher(prefetch) if prefetch > 0 else None,
+                deadline=deadline,
+                progressive=progressive and (not components or "markdown" in components),
             )
+            return _stream(session, agent_output)
         elif asyncio.iscoroutine(agent_output):
-            return _async(agent, agent_output, llm_instance, components, agent_args, agent_kwargs)
+            return _async(
+                agent, agent_output, llm_instance, components, agent_args, agent_kwargs, expires
+            )
         else:
-            return _sync(agent, agent_output, llm_instance, components, agent_args, agent_kwargs)
+            return _sync(
+                agent, agent_output, llm_instance, components, agent_args, agent_kwargs, expires
+            )
 
+    def enhanced(*agent_args, **agent_kwargs):
+        profile = sample()
+        if profile is None:
+            return invoke(agent_args, agent_kwargs)
+        profile.start()
+        try:
+            result = invoke(agent_args, agent_kwargs)
+        except BaseException:
+            profile.finish()
+            raise
+        profile.stop()  # continued only once the caller consumes the result
+        if hasattr(result, "__aiter__"):
+            return _profiled_stream(profile, result)
+        return _profiled(profile, result)
+
+    def resume(session_id: str, interaction: dict[str, Any]):
+        """Continue a detached session with the user's interaction."""
+        if sessions is None:
+            raise ValueError("resume() requires ai(..., sessions=SessionStore())")
+        session = sessions.pop(session_id)
+        if session is None:
+            raise KeyError(f"Unknown or expired session: {session_id}")
+        return _resume(session, interaction)
+
+    enhanced.resume = resume
     return enhanced
 
 
 async def _generate_components(
-    text: str,
+    text: Any,
     agent_args: tuple[Any, ...],
     agent_kwargs: dict[str, Any],
     components: Optional[list[str]],
     llm: LLM,
+    cache: Optional[SectionCache] = None,
+    expires: Optional[float] = None,
+    agent: Any = None,
 ) -> list[dict[str, Any]]:
-    """Generate components from text via shaper LLM."""
-    from .shaper import shape
+    """Generate components from text via shaper LLM, within the request deadline.
+
+    Shaping token usage is attributed to agent.
+    """
+    from .shaper import shape_components, shape_sections
 
     try:
         query_context = (
             str(agent_args[0]) if agent_args else agent_kwargs.get("query", "User request")
         )
-        shaped = await shape(text, {"query": query_context, "components": components}, llm)
-        return json.loads(shaped)
+        context = {"query": query_context, "components": components}
+        with until(expires), attributed(agent), span("ai.generate_components"):
+            if cache is not None:
+                return await bounded(
+                    cache.reshape(
+                        str(text), lambda sections: shape_sections(sections, context, llm)
+                    )
+                )
+            return await bounded(shape_components(text, context, llm))
     except Exception as e:
         logger.warning(f"Component generation failed, falling back: {e}")
+        count("shaper.fallback", reason=type(e).__name__)
         if components and "markdown" not in components:
             if isinstance(e, ValueError) and e.__cause__:
                 raise e.__cause__ from None
             raise
-        return [{"type": "markdown", "data": {"content": text}}]
+        return [{"type": "markdown", "data": {"content": str(text)}}]
+
+
+class _Session:
+    """Explicit state for one streaming conversation across continuation turns."""
+
+    def __init__(
+        self,
+        agent: Any,
+        llm: LLM,
+        components: Optional[list[str]],
+        callback: Optional[Callback],
+        timeout: int,
+        agent_args: tuple[Any, ...],
+        agent_kwargs: dict[str, Any],
+        *,
+        page_size: Optional[int] = None,
+        encoder: Optional[WireEncoder] = None,
+        cache: Optional[SectionCache] = None,
+        differ: Optional[TreeDiffer] = None,
+        context_budget: int = DEFAULT_CONTEXT_BUDGET,
+        summarizer: Optional[LLM] = None,
+        sessions: Optional[SessionStore] = None,
+        prefetcher: Optional[Prefetcher] = None,
+        deadline: Optional[float] = None,
+        progressive: bool = False,
+    ):
+        self.id = uuid.uuid4().hex
+        self.agent = agent
+        self.llm = llm
+        self.components = components
+        self.callback = callback
+        self.timeout = timeout
+        self.agent_args = agent_args
+        self.agent_kwargs = agent_kwargs
+        self.page_size = page_size
+        self.encoder = encoder
+        self.cache = cache
+        self.differ = differ
+        self.history = ContextWindow(self.query, context_budget, summarizer)
+        self.sessions = sessions
+        self.prefetcher = prefetcher
+        self.deadline = deadline
+        self.progressive = progressive
+        self.turns = 0
+
+    @property
+    def query(self) -> str:
+        return (
+            str(self.agent_args[0])
+            if self.agent_args
+            else self.agent_kwargs.get("query", "User request")
+        )
 
+    def component_event(
+        self, component_array: list[Any], interactive: bool = True
+    ) -> dict[str, Any]:
+        """Full or patch component event for this turn's tree; callback_url if interactive."""
+        callback = self.callback
+        if callback and self.page_size and hasattr(callback, "paginate"):
+            component_array = callback.paginate(component_array, self.page_size)
+
+        tag = etag(component_array)
+        base = self.differ.etag if self.differ else None
+        patch = self.differ.update(component_array, tag) if self.differ else None
+        if patch is not None:
+            event = {"type": "component_patch", "data": {"patch": patch, "base": base, "etag": tag}}
+        else:
+            payload = self.encoder.encode(component_array) if self.encoder else component_array
+            event = {"type": "component", "data": {"components": payload, "etag": tag}}
+
+        if callback and interactive:
+            event["data"]["callback_url"] = callback.endpoint()
+        if self.sessions is not None:
+            event["data"]["session_id"] = self.id
+        return event
+
+    def arguments(self, query: str) -> tuple[tuple[Any, ...], dict[str, Any]]:
+        """Agent arguments with the query replaced."""
+        if self.agent_args or "query" not in self.agent_kwargs:
+            return (query, *self.agent_args[1:]), self.agent_kwargs
+        return self.agent_args, {**self.agent_kwargs, "query": query}
+
+    async def continue_with(self, user_event: dict[str, Any]) -> tuple[Any, Optional[list[Any]]]:
+        """Advance to the next turn: (agent stream, pre-shaped components or None)."""
+        turn = await self.prefetcher.claim(user_event) if self.prefetcher is not None else None
+        self.turns += 1
+        if turn is not None:
+            self.history, self.agent_args, self.agent_kwargs = (
+                turn.history,
+                turn.agent_args,
+                turn.agent_kwargs,
+            )
+            return _replay(turn.events), turn.components
+
+        continuation_query = await self.history.add(user_event["data"])
+        self.agent_args, self.agent_kwargs = self.arguments(continuation_query)
+        return self.agent(*self.agent_args, **self.agent_kwargs), None
+
+    async def speculate(self, data: dict[str, Any]) -> "_Turn":
+        """Run the agent and shaper for a choice the user has not made yet."""
+        history = self.history.fork()
+        agent_args, agent_kwargs = self.arguments(await history.add(data))
+        events, chunks = [], []
+        stream = self.agent(*agent_args, **agent_kwargs)
+        try:
+            async for event in stream:
+                events.append(event)
+                if text := _extract_text(event):
+                    chunks.append(text)
+        finally:
+            await _aclose(stream)
+
+        text = " ".join(chunks).strip()
+        components = (
+            await _generate_components(
+                text,
+                agent_args,
+                agent_kwargs,
+                self.components,
+                self.llm,
+                self.cache,
+                agent=self.agent,
+            )
+            if text
+            else None
+        )
+        return _Turn(history, agent_args, agent_kwargs, events, components)
+
+
+class _Turn:
+    """Continuation turn computed ahead of the user's choice."""
+
+    def __init__(
+        self,
+        history: ContextWindow,
+        agent_args: tuple[Any, ...],
+        agent_kwargs: dict[str, Any],
+        events: list[Any],
+        components: Optional[list[Any]],
+    ):
+        self.history = history
+        self.agent_args = agent_args
+        self.agent_kwargs = agent_kwargs
+        self.events = events
+        self.components = components
 
-async def _stream(
-    agent: Any,
-    stream: Any,
-    llm: LLM,
-    components: Optional[list[str]],
-    callback: Optional[Callback],
-    agent_args: tuple[Any, ...],
-    agent_kwargs: dict[str, Any],
-    timeout: int,
-):
-    """Streaming: Passthrough + Collect + Tack-on."""
-    collected_text = ""
 
-    async for event in stream:
+async def _replay(events: list[Any]):
+    for event in events:
         yield event
-        if text := _extract_text(event):
-            collected_text += text + " "
 
-    if not collected_text.strip():
-        return
 
-    component_array = await _generate_components(
-        collected_text.strip(), agent_args, agent_kwargs, components, llm
-    )
+async def _aclose(stream: Any) -> None:
+    """Stop an agent stream that will not be consumed further."""
+    if stream is not None and hasattr(stream, "aclose"):
+        await stream.aclose()
 
-    if callback:
-        yield {
-            "type": "component",
-            "data": {"components": component_array, "callback_url": callback.endpoint()},
-        }
 
-        try:
-            user_event = await callback.await_interaction(timeout=timeout)
-            query_context = (
-                str(agent_args[0]) if agent_args else agent_kwargs.get("query", "User request")
-            )
-            continuation_query = f"{query_context}\n\nUser selected: {user_event['data']}"
-            continuation_agent = ai(agent, llm, components, callback, timeout)
-            async for event in continuation_agent(
-                continuation_query, *agent_args[1:], **agent_kwargs
-            ):
+async def _reserve(session: _Session) -> bool:
+    """Whether this turn offers its callback; registers it before the URL is sent if supported."""
+    callback = session.callback
+    if not callback:
+        return False
+    if session.sessions is not None or not hasattr(callback, "reserve"):
+        return True
+    return await callback.reserve(session.timeout)
+
+
+async def _next_event(events: Any, expires: Optional[float]) -> Any:
+    """Next agent event, or asyncio.TimeoutError once the turn deadline passes."""
+    if expires is None:
+        return await events.__anext__()
+    return await asyncio.wait_for(events.__anext__(), max(expires - time.monotonic(), 0))
+
+
+async def _stream(session: _Session, stream: Any, shaped: Optional[list[Any]] = None):
+    """Streaming: Passthrough + Collect + Tack-on, looping over continuation turns."""
+    parked = reserved = False
+    try:
+        while stream is not None:
+            expires = expires_in(session.deadline)
+            started = time.monotonic()
+            events = stream.__aiter__()
+            chunks: list[str] = []
+            while True:
+                try:
+                    event = await _next_event(events, expires)
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    logger.warning("Agent exceeded deadline, shaping partial output")
+                    break
                 yield event
-        except asyncio.TimeoutError:
-            logger.warning("User interaction timed out")
-    else:
-        yield {"type": "component", "data": {"components": component_array}}
+                if text := _extract_text(event):
+                    chunks.append(text)
+
+            observe("ai.agent", time.monotonic() - started)
+            collected_text = " ".join(chunks).strip()
+            chunks = []
+            stream = None
+            if not collected_text:
+                return
+
+            interactive = reserved = await _reserve(session)
+            if shaped is None and session.progressive:
+                provisional = [{"type": "markdown", "data": {"content": collected_text}}]
+                event = session.component_event(provisional, interactive)
+                event["data"]["provisional"] = True
+                yield event
+                event = None
+
+            if shaped is None:
+                shaped = await _generate_components(
+                    collected_text,
+                    session.agent_args,
+                    session.agent_kwargs,
+                    session.components,
+                    session.llm,
+                    session.cache,
+                    expires,
+                    agent=session.agent,
+                )
+            collected_text = ""
+            if session.prefetcher is not None and (interactive or session.sessions is not None):
+                session.prefetcher.start(shaped, session.speculate)
+            event = session.component_event(shaped, interactive)  # replaces any provisional tree
+            yield event
+            event = None
+            shaped = None
+
+            if session.sessions is not None:
+                session.sessions.put(session.id, session)
+                parked = True
+                return
+
+            if not interactive:
+                return
+
+            waiting = time.monotonic()
+            reserved = False  # await_interaction owns the registration from here
+            try:
+                user_event = await session.callback.await_interaction(timeout=session.timeout)
+            except asyncio.TimeoutError:
+                logger.warning("User interaction timed out")
+                count("ai.callback_timeout")
+                return
+            observe("ai.callback_wait", time.monotonic() - waiting)
+
+            stream, shaped = await session.continue_with(user_event)
+    finally:
+        if reserved and hasattr(session.callback, "release"):
+            session.callback.release()
+        if session.prefetcher is not None and not parked:
+            session.prefetcher.cancel()
+        await _aclose(stream)
+
+
+async def _profiled_stream(profile: Any, stream: Any):
+    """Stream under a profiler sample that ends with the stream."""
+    try:
+        profile.start()
+        async for event in stream:
+            yield event
+    finally:
+        await _aclose(stream)
+        profile.finish()
+
+
+async def _profiled(profile: Any, awaitable: Awaitable[Any]) -> Any:
+    try:
+        profile.start()
+        return await awaitable
+    finally:
+        profile.finish()
+
+
+async def _resume(session: _Session, interaction: dict[str, Any]):
+    """Detached: run the continuation turn for a session claimed from its store."""
+    events = _stream(session, *await session.continue_with(interaction))
+    try:
+        async for event in events:
+            yield event
+    finally:
+        await events.aclose()
 
 
 async def _async(
@@ -192,15 +521,40 @@ async def _async(
     components: Optional[list[str]],
     agent_args: tuple[Any, ...],
     agent_kwargs: dict[str, Any],
+    expires: Optional[float] = None,
 ) -> tuple[Any, list[dict[str, Any]]]:
     """Async agent: returns (text, components) tuple."""
-    response = await coroutine
+    with until(expires):
+        response = await bounded(coroutine)
     component_array = await _generate_components(
-        str(response), agent_args, agent_kwargs, components, llm
+        response, agent_args, agent_kwargs, components, llm, expires=expires, agent=agent
     )
     return (response, component_array)
 
 
+async def _offload(
+    pool: AgentPool,
+    agent: Any,
+    llm: LLM,
+    components: Optional[list[str]],
+    agent_args: tuple[Any, ...],
+    agent_kwargs: dict[str, Any],
+    expires: Optional[float] = None,
+) -> tuple[Any, list[dict[str, Any]]]:
+    """Blocking sync agent: runs in the pool, returns (text, components) tuple."""
+    with until(expires):
+        response = await bounded(pool.run(agent, *agent_args, **agent_kwargs))
+    if hasattr(response, "__aiter__"):
+        await _aclose(response)
+        raise TypeError(
+            f"{getattr(agent, '__name__', agent)!r} returned a stream; pool= is for blocking "
+            "agents, so wrap agents that return streams without it"
+        )
+    if asyncio.iscoroutine(response):
+        return await _async(agent, response, llm, components, agent_args, agent_kwargs, expires)
+    return await _sync(agent, response, llm, components, agent_args, agent_kwargs, expires)
+
+
 def _sync(
     agent: Any,
     response: Any,
@@ -208,12 +562,13 @@ def _sync(
     components: Optional[list[str]],
     agent_args: tuple[Any, ...],
     agent_kwargs: dict[str, Any],
+    expires: Optional[float] = None,
 ) -> Awaitable[tuple[Any, list[dict[str, Any]]]]:
     """Sync agent: returns coroutine resolving to (text, components) tuple."""
 
     async def _shape():
         component_array = await _generate_components(
-            str(response), agent_args, agent_kwargs, components, llm
+            response, agent_args, agent_kwargs, components, llm, expires=expires, agent=agent
         )
         return (response, component_array)
 
@@ -0,0 +1,169 @@
+"""Cross-process routing of callback interactions and pages to the worker that owns them."""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Optional, Protocol, runtime_checkable
+
+logger = logging.getLogger(__name__)
+
+FORWARD_TIMEOUT = 5
+
+Deliver = Callable[[str, dict[str, Any]], bool]
+Pages = Callable[[str, int, int], Optional[dict[str, Any]]]
+
+
+@runtime_checkable
+class Broker(Protocol):
+    """Routes interactions for callback ids owned by other worker processes."""
+
+    async def start(self, deliver: Deliver) -> None:
+        """Begin accepting interactions; deliver(id, interaction) resolves a local callback."""
+        ...
+
+    def claim(self, callback_id: str) -> None:
+        """Record this process as the owner of callback_id."""
+        ...
+
+    def release(self, callback_id: str) -> None:
+        """Forget ownership of callback_id."""
+        ...
+
+    async def forward(self, callback_id: str, interaction: dict[str, Any]) -> bool:
+        """Send an interaction to the owning process; False if no owner is known."""
+        ...
+
+
+@runtime_checkable
+class PageBroker(Broker, Protocol):
+    """A broker that also serves pages of paginated data stored by other workers.
+
+    Page handles are claimed and released under page_id(handle).
+    """
+
+    async def start(self, deliver: Deliver, pages: Optional[Pages] = None) -> None:
+        """As Broker.start; pages(handle, offset, limit) reads a locally stored page."""
+        ...
+
+    async def fetch(self, handle: str, offset: int, limit: int) -> Optional[dict[str, Any]]:
+        """Read a page from the worker that stored it; None if no owner has it."""
+        ...
+
+
+def page_id(handle: str) -> str:
+    """Ownership key of a page handle, distinct from any callback id."""
+    return f"page:{handle}"
+
+
+def _frame(payload: bytes) -> bytes:
+    """Length-prefixed frame; pages and interactions are unbounded, so no line limit applies."""
+    return len(payload).to_bytes(4, "big") + payload
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> bytes:
+    return await reader.readexactly(int.from_bytes(await reader.readexactly(4), "big"))
+
+
+class UnixSocketBroker:
+    """Default broker: one Unix socket per worker, ownership as symlinks in a shared directory.
+
+    Workers on one host share `directory`; a claim is an atomic symlink from the
+    callback id to the owner's socket, so forwarding is a lookup and one local write.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        base = directory or os.path.join(tempfile.gettempdir(), "agentinterface-callbacks")
+        self.directory = Path(base)
+        self.socket_path = self.directory / f"worker-{os.getpid()}.sock"
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._deliver: Optional[Deliver] = None
+        self._pages: Optional[Pages] = None
+
+    async def start(self, deliver: Deliver, pages: Optional[Pages] = None) -> None:
+        self._deliver = deliver
+        self._pages = pages
+        if self._server is not None and self._server.get_loop() is asyncio.get_running_loop():
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with contextlib.suppress(FileNotFoundError):
+            self.socket_path.unlink()
+        self._server = await asyncio.start_unix_server(self._handle, path=str(self.socket_path))
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        with contextlib.suppress(FileNotFoundError):
+            self.socket_path.unlink()
+
+    def _link(self, callback_id: str) -> Path:
+        return self.directory / f"id-{callback_id.replace('/', '_')}"
+
+    def claim(self, callback_id: str) -> None:
+        link = self._link(callback_id)
+        with contextlib.suppress(FileNotFoundError):
+            link.unlink()
+        os.symlink(self.socket_path, link)
+
+    def release(self, callback_id: str) -> None:
+        link = self._link(callback_id)
+        with contextlib.suppress(FileNotFoundError, OSError):
+            if os.readlink(link) == str(self.socket_path):
+                link.unlink()
+
+    async def forward(self, callback_id: str, interaction: dict[str, Any]) -> bool:
+        reply = await self._request(callback_id, {"id": callback_id, "interaction": interaction})
+        return reply == b"ok"
+
+    async def fetch(self, handle: str, offset: int, limit: int) -> Optional[dict[str, Any]]:
+        reply = await self._request(
+            page_id(handle), {"page": handle, "offset": offset, "limit": limit}
+        )
+        if not reply or reply == b"missing":
+            return None
+        return json.loads(reply)
+
+    async def _request(self, key: str, message: dict[str, Any]) -> Optional[bytes]:
+        """One frame to the owner of key and its one-frame reply; None if unreachable."""
+        try:
+            owner = os.readlink(self._link(key))
+        except OSError:
+            return None
+
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_unix_connection(owner), FORWARD_TIMEOUT
+            )
+            try:
+                writer.write(_frame(json.dumps(message).encode()))
+                await writer.drain()
+                return await asyncio.wait_for(_read_frame(reader), FORWARD_TIMEOUT)
+            finally:
+                writer.close()
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+            logger.warning(f"Broker request to {owner} failed: {e}")
+            return None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            message = json.loads(await _read_frame(reader))
+            if "page" in message:
+                page = self._pages and self._pages(
+                    message["page"], int(message["offset"]), int(message["limit"])
+                )
+                writer.write(_frame(json.dumps(page).encode() if page else b"missing"))
+            else:
+                delivered = self._deliver is not None and self._deliver(
+                    message["id"], message["interaction"]
+                )
+                writer.write(_frame(b"ok" if delivered else b"missing"))
+            await writer.drain()
+        except (ValueError, KeyError, TypeError, ConnectionError, asyncio.IncompleteReadError) as e:
+            logger.warning(f"Malformed broker request: {e}")
+        finally:
+            writer.close()
@@ -3,13 +3,26 @@
 import asyncio
 import logging
 import os
+import socket
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from threading import Thread
-from typing import Optional, Protocol, runtime_checkable
+from typing import Any, AsyncIterable, Awaitable, Callable, Optional, Protocol, runtime_checkable
+
+from .broker import Broker, PageBroker, page_id
+from .server import start_server
+from .telemetry import count
 
 logger = logging.getLogger(__name__)
 
 ABANDONED_CALLBACK_TIMEOUT = 600
+MAX_PENDING_CALLBACKS = 10_000
+PAGE_TTL = 600
+MAX_PAGED_DATASETS = 256
+PAGED_FIELDS = {"table": "items", "timeline": "events", "accordion": "sections"}
+BACKENDS = ("fastapi", "asyncio")
 
 
 @runtime_checkable
@@ -25,24 +38,97 @@ class Callback(Protocol):
         ...
 
 
+class _PageStore:
+    """Bounded LRU store of paged component data with TTL; safe across threads."""
+
+    def __init__(
+        self,
+        capacity: int = MAX_PAGED_DATASETS,
+        ttl: float = PAGE_TTL,
+        on_evict: Optional[Callable[[str], None]] = None,
+    ):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._entries: OrderedDict[str, tuple[float, list[Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, items: list[Any]) -> str:
+        """Store items, evicting expired and least recently used entries."""
+        handle = uuid.uuid4().hex
+        evicted = []
+        with self._lock:
+            now = time.monotonic()
+            while self._entries:
+                oldest, (expires, _items) = next(iter(self._entries.items()))
+                if expires > now and len(self._entries) < self.capacity:
+                    break
+                del self._entries[oldest]
+                evicted.append(oldest)
+            self._entries[handle] = (now + self.ttl, items)
+        self._evicted(evicted)
+        return handle
+
+    def _evicted(self, handles: list[str]) -> None:
+        if self.on_evict is not None:
+            for handle in handles:
+                self.on_evict(handle)
+
+    def get(self, handle: str, offset: int, limit: int) -> Optional[dict[str, Any]]:
+        """Slice of stored items, or None if unknown or expired."""
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                return None
+            expires, items = entry
+            expired = expires <= time.monotonic()
+            if expired:
+                del self._entries[handle]
+            else:
+                self._entries[handle] = (time.monotonic() + self.ttl, items)
+                self._entries.move_to_end(handle)
+        if expired:
+            self._evicted([handle])
+            return None
+        offset = max(offset, 0)
+        return {
+            "items": items[offset : offset + max(limit, 0)],
+            "offset": offset,
+            "total": len(items),
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class _HttpCallbackServer:
-    """Internal HTTP server for callbacks."""
+    """Internal HTTP server for callbacks.
+
+    Runs its own uvicorn thread on a port, or is mounted into the host
+    application's ASGI server when created with a base_url. Callbacks may be
+    registered from any number of event loops in any threads; each resolves on
+    the loop that created its future.
+    """
 
-    def __init__(self, port: int = 8228):
+    def __init__(
+        self, port: int = 8228, base_url: Optional[str] = None, broker: Optional[Broker] = None
+    ):
         self.port = port
+        self.base_url = base_url
+        self.broker = broker
         self.callbacks: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self.max_pending = int(os.getenv("AI_CALLBACK_MAX_PENDING", MAX_PENDING_CALLBACKS))
+        self.pages = _PageStore(on_evict=self._release_page)
+        self._expiry: dict[str, asyncio.TimerHandle] = {}
+        self._lock = threading.RLock()
         self._started = False
-        self._cleanup_task = None
-
-    def start(self):
-        """Start HTTP server if not already running."""
-        if self._started:
-            return
 
+    def app(self) -> Any:
+        """ASGI app serving /callback/{id} and /page/{handle}."""
         try:
-            import uvicorn
             from fastapi import FastAPI, Request
             from fastapi.middleware.cors import CORSMiddleware
+            from fastapi.responses import JSONResponse
         except ImportError:
             raise ImportError("pip install fastapi uvicorn") from None
 
@@ -52,95 +138,485 @@ class _HttpCallbackServer:
         @app.post("/callback/{callback_id}")
         async def handle_callback(callback_id: str, request: Request):
             data = await request.json()
-            if callback_id in self.callbacks:
-                loop, future = self.callbacks[callback_id]
-                if not future.done():
-                    loop.call_soon_threadsafe(
-                        future.set_result,
-                        {"action": data.get("action"), "data": data.get("data")},
-                    )
-            return {"status": "continued"}
+            interaction = {"action": data.get("action"), "data": data.get("data")}
+            if await self.route(callback_id, interaction):
+                return {"status": "continued"}
+            return JSONResponse({"status": "expired"}, status_code=404)
+
+        @app.get("/page/{handle}")
+        async def handle_page(handle: str, offset: int = 0, limit: int = 50):
+            status, page = await self.page(handle, offset, limit)
+            return page if status == 200 else JSONResponse(page, status_code=status)
+
+        return app
+
+    def store_page(self, items: list[Any]) -> str:
+        """Keep items for page requests, claimed through a page-routing broker."""
+        handle = self.pages.put(items)
+        if isinstance(self.broker, PageBroker):
+            self.broker.claim(page_id(handle))
+        return handle
+
+    def _release_page(self, handle: str) -> None:
+        if isinstance(self.broker, PageBroker):
+            self.broker.release(page_id(handle))
+
+    async def page(self, handle: str, offset: int, limit: int) -> tuple[int, dict[str, Any]]:
+        """Status and body for a page request, read from the worker that stored it."""
+        page = self.pages.get(handle, offset, limit)
+        if page is None and isinstance(self.broker, PageBroker):
+            page = await self.broker.fetch(handle, offset, limit)
+        elif page is None and self.broker is not None:
+            return 501, {
+                "status": "unroutable",
+                "error": "broker cannot route pages stored by other workers",
+            }
+        return (404, {"status": "expired"}) if page is None else (200, page)
+
+    def register(
+        self, callback_id: str, future: asyncio.Future, ttl: Optional[float] = None
+    ) -> None:
+        """Track a pending interaction that expires after ttl; RuntimeError when full.
+
+        Expiry rides the future's own event loop timer heap, so each entry is removed
+        at its exact deadline in O(log n) with no periodic sweep. Entries without a
+        ttl are treated as abandoned after ABANDONED_CALLBACK_TIMEOUT.
+        """
+        if ttl is None:
+            ttl = ABANDONED_CALLBACK_TIMEOUT
+        loop = future.get_loop()
+        with self._lock:
+            if callback_id not in self.callbacks and len(self.callbacks) >= self.max_pending:
+                raise RuntimeError(f"Too many pending callbacks ({self.max_pending})")
+            self.unregister(callback_id)
+            self.callbacks[callback_id] = (loop, future)
+            self._expiry[callback_id] = loop.call_later(ttl, self._expire, callback_id, future)
+        if self.broker is not None:
+            self.broker.claim(callback_id)
+        count("callback.registered")
+
+    def unregister(self, callback_id: str) -> None:
+        with self._lock:
+            entry = self.callbacks.pop(callback_id, None)
+            timer = self._expiry.pop(callback_id, None)
+        if entry is not None and self.broker is not None:
+            self.broker.release(callback_id)
+        if timer is not None:
+            loop = entry[0] if entry is not None else None
+            if loop is None or _on_loop(loop):
+                timer.cancel()
+            elif not loop.is_closed():
+                loop.call_soon_threadsafe(timer.cancel)
+
+    def _expire(self, callback_id: str, future: asyncio.Future) -> None:
+        with self._lock:
+            entry = self.callbacks.get(callback_id)
+            if entry is not None and entry[1] is future:
+                self.unregister(callback_id)
+        if not future.done():
+            count("callback.expired")
+            future.set_exception(asyncio.TimeoutError())
+            future.exception()  # waiters still raise; abandoned futures don't log
+
+    def deliver(self, callback_id: str, interaction: dict[str, Any]) -> bool:
+        """Resolve a callback owned by this process; False if unknown here."""
+        with self._lock:
+            entry = self.callbacks.get(callback_id)
+        if entry is None:
+            return False
+        self._resolve(entry, interaction)
+        return True
+
+    async def route(self, callback_id: str, interaction: dict[str, Any]) -> bool:
+        """Deliver locally, else through the broker to the owning worker."""
+        if self.deliver(callback_id, interaction):
+            count("callback.delivered", route="local")
+            return True
+        if self.broker is not None and await self.broker.forward(callback_id, interaction):
+            count("callback.delivered", route="forwarded")
+            return True
+        count("callback.delivered", route="missing")
+        return False
+
+    def resolve(self, callback_id: str, interaction: dict[str, Any]) -> None:
+        """Complete a pending interaction, directly when already on its loop."""
+        with self._lock:
+            entry = self.callbacks[callback_id]
+        self._resolve(entry, interaction)
+
+    @staticmethod
+    def _resolve(
+        entry: tuple[asyncio.AbstractEventLoop, asyncio.Future], interaction: dict[str, Any]
+    ) -> None:
+        loop, future = entry
+        if future.done():
+            return
+        if _on_loop(loop):
+            future.set_result(interaction)
+        else:
+            loop.call_soon_threadsafe(
+                lambda: None if future.done() else future.set_result(interaction)
+            )
+
+    async def ready(self) -> None:
+        """Wait until the server (and broker) accept connections."""
+        if isinstance(self.broker, PageBroker):
+            await self.broker.start(self.deliver, self.pages.get)
+        elif self.broker is not None:
+            await self.broker.start(self.deliver)
+
+    def _listener(self) -> socket.socket:
+        """Port socket shared with other workers via SO_REUSEPORT."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind(("0.0.0.0", self.port))
+        return sock
+
+    def start(self):
+        """Start HTTP server if not already running."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+
+        try:
+            import uvicorn
+        except ImportError:
+            raise ImportError("pip install fastapi uvicorn") from None
+
+        app = self.app()
 
         def run_server():
-            uvicorn.run(app, host="0.0.0.0", port=self.port, log_level="critical")
+            if self.broker is None:
+                uvicorn.run(app, host="0.0.0.0", port=self.port, log_level="critical")
+                return
+            server = uvicorn.Server(uvicorn.Config(app, log_level="critical"))
+            server.run(sockets=[self._listener()])
 
         Thread(target=run_server, daemon=True).start()
-        self._started = True
 
+
+class _AsyncioCallbackServer(_HttpCallbackServer):
+    """Callback server on asyncio.start_server in the caller's loop; no web framework."""
+
+    def __init__(self, port: int = 8228, broker: Optional[Broker] = None):
+        super().__init__(port, broker=broker)
+        self._binding: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Bind on the running loop; deferred to ready() when called outside one."""
         try:
             loop = asyncio.get_running_loop()
-            if self._cleanup_task is None:
-                self._cleanup_task = loop.create_task(self._cleanup_abandoned_callbacks())
         except RuntimeError:
-            pass
+            return
+        with self._lock:
+            if self._binding is not None and not self._binding.get_loop().is_closed():
+                return
+            self._binding = loop.create_task(
+                start_server(self.handle, "0.0.0.0", self.port, reuse_port=self.broker is not None)
+            )
+            self._started = True
 
-    async def _cleanup_abandoned_callbacks(self):
-        """Clean up callbacks that have been waiting too long."""
-        while True:
+    async def ready(self) -> None:
+        await super().ready()
+        self.start()
+        if self._binding is not None and self._binding.get_loop() is asyncio.get_running_loop():
+            await self._binding
+
+    async def close(self) -> None:
+        """Stop listening; the next start() or ready() binds again."""
+        with self._lock:
+            binding, self._binding = self._binding, None
+            self._started = False
+        if (
+            binding is not None
+            and binding.done()
+            and not binding.cancelled()
+            and not binding.exception()
+        ):
+            server = binding.result()
+            server.close()
+            await server.wait_closed()
+
+    async def handle(
+        self, method: str, path: str, query: dict[str, str], data: Any
+    ) -> tuple[int, Any]:
+        """Route one request to callbacks or pages."""
+        route, _, key = path.strip("/").partition("/")
+        if method == "POST" and route == "callback" and key:
+            data = data if isinstance(data, dict) else {}
+            interaction = {"action": data.get("action"), "data": data.get("data")}
+            if await self.route(key, interaction):
+                return 200, {"status": "continued"}
+            return 404, {"status": "expired"}
+        if method == "GET" and route == "page" and key:
             try:
-                await asyncio.sleep(60)
-                current_time = asyncio.get_event_loop().time()
-                abandoned = []
-
-                for callback_id, (_loop, future) in list(self.callbacks.items()):
-                    if (
-                        not future.done()
-                        and hasattr(future, "_created_at")
-                        and current_time - future._created_at > ABANDONED_CALLBACK_TIMEOUT
-                    ):
-                        abandoned.append(callback_id)
-
-                for callback_id in abandoned:
-                    entry = self.callbacks.pop(callback_id, None)
-                    if entry:
-                        _loop, future = entry
-                        if not future.done():
-                            _loop.call_soon_threadsafe(future.cancel)
-
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Callback cleanup error: {e}")
+                offset, limit = int(query.get("offset", 0)), int(query.get("limit", 50))
+            except ValueError:
+                return 400, {"error": "offset and limit must be integers"}
+            return await self.page(key, offset, limit)
+        return 404, {"error": "Not Found"}
 
 
 _servers: dict[int, _HttpCallbackServer] = {}
+_mounted: dict[str, _HttpCallbackServer] = {}
+_servers_lock = threading.Lock()
+
+
+def _on_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+def _get_shared_server(
+    port: int = 8228,
+    base_url: Optional[str] = None,
+    backend: str = "fastapi",
+    broker: Optional[Broker] = None,
+) -> _HttpCallbackServer:
+    """Get or create HTTP callback server; mounted servers never start a thread.
 
+    A broker routes interactions between worker processes, which then share the
+    port through SO_REUSEPORT.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown callback backend: {backend}")
+    if base_url is not None:
+        base_url = base_url.rstrip("/")
+        with _servers_lock:
+            if base_url not in _mounted:
+                _mounted[base_url] = _HttpCallbackServer(port, base_url=base_url, broker=broker)
+            server = _mounted[base_url]
+    else:
+        server_type = _AsyncioCallbackServer if backend == "asyncio" else _HttpCallbackServer
+        with _servers_lock:
+            created = port not in _servers
+            if created:
+                _servers[port] = server_type(port, broker=broker)
+            server = _servers[port]
+        if created:
+            server.start()
+        if type(server) is not server_type:
+            raise ValueError(f"Port {port} already serves a different callback backend")
+    if broker is not None and server.broker is not broker:
+        raise ValueError("Callback server already configured with a different broker")
+    return server
 
-def _get_shared_server(port: int = 8228):
-    """Get or create HTTP callback server."""
-    if port not in _servers:
-        server = _HttpCallbackServer(port)
-        server.start()
-        _servers[port] = server
-    return _servers[port]
+
+def mount(base_url: str, broker: Optional[Broker] = None) -> Any:
+    """ASGI app for callbacks inside your own server and event loop.
+
+    Mount it where base_url points, e.g. app.mount("/ai", mount("https://api.example.com/ai")),
+    and create callbacks with Http(base_url="https://api.example.com/ai"). Pass the same
+    broker to both when several workers serve the app.
+    """
+    return _get_shared_server(base_url=base_url, broker=broker).app()
 
 
 class Http(Callback):
     """HTTP-based component callback."""
 
-    def __init__(self, id: str = None, port: int = 8228):
-        """Create HTTP callback with self-managed lifecycle."""
+    def __init__(
+        self,
+        id: str = None,
+        port: int = 8228,
+        base_url: Optional[str] = None,
+        backend: str = "fastapi",
+        broker: Optional[Broker] = None,
+    ):
+        """Create HTTP callback with self-managed lifecycle.
+
+        base_url targets a mount() app instead of a port server. backend="asyncio" serves
+        the port from a built-in HTTP/1.1 server on the caller's loop, without fastapi.
+        broker (e.g. UnixSocketBroker) routes interactions across worker processes.
+        """
         self.id = id or str(uuid.uuid4())
-        self._server = _get_shared_server(port)
+        self._server = _get_shared_server(port, base_url, backend, broker)
         self._future: Optional[asyncio.Future] = None
 
+    async def reserve(self, timeout: int = 300) -> bool:
+        """Register the next interaction before its endpoint is sent; False at capacity.
+
+        An interaction that arrives before await_interaction is kept for it.
+        """
+        await self._server.ready()
+        loop = asyncio.get_running_loop()
+        if self._future is not None and self._future.get_loop() is loop:
+            return True
+        future = loop.create_future()
+        try:
+            self._server.register(self.id, future, timeout)
+        except RuntimeError as e:
+            logger.warning(f"Callback {self.id} not offered: {e}")
+            count("callback.rejected")
+            return False
+        self._future = future
+        return True
+
+    def release(self) -> None:
+        """Drop a reserved interaction that will not be awaited."""
+        self._server.unregister(self.id)
+        self._future = None
+
     async def await_interaction(self, timeout: int = 300) -> dict:
-        """Wait for user interaction with component."""
+        """Wait for user interaction with component; RuntimeError when the server is full."""
+        await self._server.ready()
         try:
-            if self._future is None or self._future.done():
-                loop = asyncio.get_running_loop()
+            loop = asyncio.get_running_loop()
+            future = self._future
+            if future is None or future.get_loop() is not loop:
                 future = loop.create_future()
-                future._created_at = loop.time()
+                self._server.register(self.id, future, timeout)
                 self._future = future
-                self._server.callbacks[self.id] = (loop, future)
+            elif not future.done():
+                self._server.register(self.id, future, timeout)  # reserved: restart the clock
 
-            return await asyncio.wait_for(self._future, timeout=timeout)
+            return await future
         finally:
-            self._server.callbacks.pop(self.id, None)
+            self._server.unregister(self.id)
             if self._future and self._future.done():
                 self._future = None
 
     def endpoint(self) -> str:
         """Get endpoint string for component integration."""
+        return f"{self._base_url()}/callback/{self.id}"
+
+    def paginate(self, components: list[Any], page_size: int) -> list[Any]:
+        """Ship the first page of large table/timeline/accordion data; serve the rest on demand."""
+
+        def _paginate(node: Any) -> Any:
+            if isinstance(node, list):
+                return [_paginate(child) for child in node]
+            if not isinstance(node, dict) or not isinstance(node.get("data"), dict):
+                return node
+
+            data = {
+                key: _paginate(value) if isinstance(value, (list, dict)) else value
+                for key, value in node["data"].items()
+            }
+            field = PAGED_FIELDS.get(node.get("type"))
+            items = data.get(field) if field else None
+            if isinstance(items, list) and len(items) > page_size:
+                handle = self._server.store_page(items)
+                data[field] = items[:page_size]
+                data["page"] = {
+                    "url": f"{self._base_url()}/page/{handle}",
+                    "field": field,
+                    "size": page_size,
+                    "total": len(items),
+                }
+            return {**node, "data": data}
+
+        return _paginate(components)
+
+    def _base_url(self) -> str:
+        if self._server.base_url is not None:
+            return self._server.base_url
         host = os.getenv("AI_CALLBACK_HOST", "localhost")
-        return f"http://{host}:{self._server.port}/callback/{self.id}"
+        return f"http://{host}:{self._server.port}"
+
+
+class Socket(Callback):
+    """Duplex callback over one long-lived client connection (WebSocket or similar).
+
+    Component events go out through send and interactions come back on the same
+    connection, so a turn costs no connection setup, CORS preflight or callback port.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[dict[str, Any]], Awaitable[None]],
+        id: str = None,
+    ):
+        """send delivers one JSON message to the client, e.g. websocket.send_json."""
+        self.id = id or str(uuid.uuid4())
+        self._send = send
+        self._waiter: Optional[asyncio.Future] = None
+        self._armed = False
+        self._ready: Optional[dict] = None
+
+    def arm(self) -> None:
+        """Open a turn: the next interaction is kept even if it beats await_interaction().
+
+        serve() arms on every component event it sends; call it yourself when sending
+        events another way.
+        """
+        self._armed = True
+        self._ready = None
+
+    def receive(self, message: Any) -> bool:
+        """Feed one client message; False when dropped because no turn is open.
+
+        Like an expired Http callback, clicks after the turn's interaction (or before
+        any component event) are stale and never drive a later turn.
+        """
+        if not isinstance(message, dict) or message.get("id", self.id) != self.id:
+            return False
+        interaction = {"action": message.get("action"), "data": message.get("data")}
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(interaction)
+        elif self._armed and self._ready is None:
+            self._ready = interaction
+        else:
+            logger.debug(f"Socket {self.id} dropped interaction outside a turn")
+            return False
+        self._armed = False
+        return True
+
+    async def await_interaction(self, timeout: int = 300) -> dict:
+        """Wait for the interaction that answers the current turn."""
+        if self._ready is not None:
+            interaction, self._ready = self._ready, None
+            return interaction
+        self._waiter = asyncio.get_running_loop().create_future()
+        try:
+            return await asyncio.wait_for(self._waiter, timeout)
+        finally:
+            self._waiter = None
+            self._armed = False
+
+    def endpoint(self) -> str:
+        """Reply on the open connection instead of POSTing: socket:{id}."""
+        return f"socket:{self.id}"
+
+    async def serve(
+        self,
+        events: AsyncIterable[dict[str, Any]],
+        receive: Callable[[], Awaitable[Any]],
+    ) -> None:
+        """Stream an ai() agent over the connection until it finishes or the client leaves.
+
+        receive reads one client message, e.g. websocket.receive_json. A disconnect
+        stops the agent; errors from the agent propagate.
+        """
+
+        async def _pump() -> None:
+            endpoint = self.endpoint()
+            async for event in events:
+                data = event.get("data") if isinstance(event, dict) else None
+                if isinstance(data, dict) and data.get("callback_url") == endpoint:
+                    self.arm()
+                await self._send(event)
+
+        async def _read() -> None:
+            while True:
+                self.receive(await receive())
+
+        pump, reader = asyncio.ensure_future(_pump()), asyncio.ensure_future(_read())
+        try:
+            done, _ = await asyncio.wait({pump, reader}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (pump, reader):
+                task.cancel()
+            await asyncio.gather(pump, reader, return_exceptions=True)
+            if hasattr(events, "aclose"):
+                await events.aclose()
+
+        if pump in done:
+            pump.result()
+        elif not reader.cancelled() and reader.exception() is not None:
+            logger.debug(f"Socket {self.id} closed: {reader.exception()}")
@@ -0,0 +1,35 @@
+"""Canonical component serialization, content hashing and ETags."""
+
+import hashlib
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumpb(value: Any) -> bytes:
+    """Compact, key-sorted UTF-8 JSON; orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def dumps(value: Any) -> str:
+    """Compact, key-sorted JSON string."""
+    return dumpb(value).decode()
+
+
+def digest(value: Any) -> str:
+    """SHA-256 hex digest of the canonical form."""
+    return hashlib.sha256(dumpb(value)).hexdigest()
+
+
+def etag(value: Any) -> str:
+    """Strong HTTP ETag for a component tree."""
+    return f'"{digest(value)[:32]}"'
@@ -0,0 +1,42 @@
+"""Per-request deadlines shared by agent, shaper and provider calls."""
+
+import asyncio
+import contextlib
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Iterator, Optional
+
+_expires: ContextVar[Optional[float]] = ContextVar("agentinterface_deadline", default=None)
+
+
+def expires_in(seconds: Optional[float]) -> Optional[float]:
+    """Absolute monotonic deadline `seconds` from now, or None for unbounded."""
+    return None if seconds is None else time.monotonic() + seconds
+
+
+@contextlib.contextmanager
+def until(expires: Optional[float]) -> Iterator[None]:
+    """Bound calls inside the block by `expires`, never loosening an outer deadline."""
+    outer = _expires.get()
+    if expires is None or (outer is not None and outer <= expires):
+        yield
+        return
+    token = _expires.set(expires)
+    try:
+        yield
+    finally:
+        _expires.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left under the current deadline, or None when unbounded."""
+    expires = _expires.get()
+    return None if expires is None else max(expires - time.monotonic(), 0.0)
+
+
+async def bounded(awaitable: Awaitable[Any]) -> Any:
+    """Await under the current deadline; asyncio.TimeoutError once it passes."""
+    left = remaining()
+    if left is None:
+        return await awaitable
+    return await asyncio.wait_for(awaitable, left)
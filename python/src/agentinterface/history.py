@@ -0,0 +1,98 @@
+"""Bounded conversation context for continuation turns."""
+
+import logging
+from typing import Any, Optional
+
+from .llms import LLM
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONTEXT_BUDGET = 1000
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def selection_text(data: Any) -> str:
+    """Interaction data as the agent sees it: the full payload, never reduced to one field."""
+    return str(data)
+
+
+class ContextWindow:
+    """Original query plus a compacted selection history within a token budget."""
+
+    def __init__(
+        self, query: str, budget: int = DEFAULT_CONTEXT_BUDGET, summarizer: Optional[LLM] = None
+    ):
+        self.query = query
+        self.budget = budget
+        self.summarizer = summarizer
+        self.summary = ""
+        self.omitted = 0
+        self.selections: list[str] = []
+
+    def fork(self) -> "ContextWindow":
+        """Independent copy for speculative turns."""
+        window = ContextWindow(self.query, self.budget, self.summarizer)
+        window.summary = self.summary
+        window.omitted = self.omitted
+        window.selections = list(self.selections)
+        return window
+
+    async def add(self, data: Any) -> str:
+        """Record a selection and return the bounded continuation query."""
+        self.selections.append(selection_text(data))
+        await self._compact()
+        return self.render()
+
+    def render(self) -> str:
+        """Continuation query for the latest selection."""
+        history = []
+        if self.summary:
+            history.append(f"Earlier selections (summary): {self.summary}")
+        elif self.omitted:
+            history.append(f"({self.omitted} earlier selections omitted)")
+        history.extend(f"Previously selected: {selection}" for selection in self.selections[:-1])
+
+        parts = [self.query]
+        if history:
+            parts.append("\n".join(history))
+        if self.selections:
+            parts.append(f"User selected: {self.selections[-1]}")
+        return "\n\n".join(parts)
+
+    async def _compact(self) -> None:
+        """Drop, summarize, then trim older history while over budget.
+
+        The query and the latest selection are never cut, so a prompt they alone
+        push over budget is sent as is.
+        """
+        if estimate_tokens(self.render()) <= self.budget:
+            return
+        dropped = []
+        while len(self.selections) > 1 and estimate_tokens(self.render()) > self.budget:
+            dropped.append(self.selections.pop(0))
+            self.omitted += 1
+
+        if dropped and self.summarizer is not None:
+            self.summary = await self._summarize(dropped)
+
+        overflow = estimate_tokens(self.render()) - self.budget
+        if overflow > 0 and self.summary:
+            keep = max(len(self.summary) - overflow * CHARS_PER_TOKEN, 0)
+            self.summary = self.summary[:keep].rstrip()
+
+    async def _summarize(self, dropped: list[str]) -> str:
+        previous = f"Summary so far: {self.summary}\n" if self.summary else ""
+        selections = "\n".join(f"- {selection}" for selection in dropped)
+        prompt = f"""Summarize the user's earlier selections in one short sentence.
+{previous}New selections:
+{selections}"""
+        try:
+            return (await self.summarizer.generate(prompt)).strip()
+        except Exception as e:
+            logger.warning(f"Context summarization failed, truncating: {e}")
+            return self.summary
@@ -0,0 +1,63 @@
+"""Section-level incremental shaping for continuation turns."""
+
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+SECTION_CACHE_SIZE = 256
+
+_SECTION_BREAK = re.compile(r"\n[ \t]*\n|\n(?=#{1,6} )")
+
+
+def split_sections(text: str) -> list[str]:
+    """Split agent text into paragraphs and heading-led sections."""
+    return [section.strip() for section in _SECTION_BREAK.split(text) if section.strip()]
+
+
+class SectionCache:
+    """Per-session LRU of shaped components keyed by section hash."""
+
+    def __init__(self, capacity: int = SECTION_CACHE_SIZE):
+        self.capacity = capacity
+        self._entries: OrderedDict[str, list[Any]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[list[Any]]:
+        components = self._entries.get(key)
+        if components is not None:
+            self._entries.move_to_end(key)
+        return components
+
+    def put(self, key: str, components: list[Any]) -> None:
+        self._entries[key] = components
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def reshape(
+        self, text: str, shape: Callable[[list[str]], Awaitable[list[list[Any]]]]
+    ) -> list[Any]:
+        """Shape only sections not seen before, in one batch; reuse cached components.
+
+        shape receives the new sections in order and returns one tree per section.
+        """
+        sections = split_sections(text)
+        keys = [hashlib.sha256(section.encode()).hexdigest() for section in sections]
+
+        shaped = {key: cached for key in keys if (cached := self.get(key)) is not None}
+        missing = {key: section for key, section in zip(keys, sections) if key not in shaped}
+
+        if missing:
+            results = await shape(list(missing.values()))
+            if len(results) != len(missing):
+                raise ValueError(
+                    f"Shaper returned {len(results)} trees for {len(missing)} sections"
+                )
+            for key, result in zip(missing, results):
+                self.put(key, result)
+                shaped[key] = result
+
+        return [component for key in keys for component in shaped[key]]
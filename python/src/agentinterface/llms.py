@@ -1,11 +1,17 @@
 """LLM providers with key rotation."""
 
+import asyncio
 import logging
 import os
+import threading
 import time
 from pathlib import Path
 from typing import Any, Callable, Optional, Protocol, Union, runtime_checkable
 
+from .deadline import bounded, remaining
+from .telemetry import count, span
+from .usage import Completion, Usage
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -21,7 +27,33 @@ except ImportError:
                 key, value = line.split("=", 1)
                 os.environ.setdefault(key.strip(), value.strip().strip("\"'"))
 
-_rotators = {}
+_rotators: dict[str, "Rotator"] = {}
+_rotators_lock = threading.Lock()
+_clients: dict[tuple[str, str], Any] = {}
+_clients_loop: Optional[asyncio.AbstractEventLoop] = None
+_clients_lock = threading.Lock()
+
+
+def _client(service: str, key: str, factory: Callable[[], Any]) -> Any:
+    """Provider client for this key, reused on the long-lived background loop.
+
+    Async SDK clients pool connections bound to one event loop and keep that loop
+    alive, so they are only cached for background_loop(); any other loop (e.g.
+    asyncio.run() per call, short-lived threaded loops) gets a fresh client.
+    """
+    global _clients_loop
+    from .sync import current_background_loop
+
+    loop = asyncio.get_running_loop()
+    if loop is not current_background_loop():
+        return factory()
+    with _clients_lock:
+        if _clients_loop is not loop:
+            _clients.clear()
+            _clients_loop = loop
+        if (service, key) not in _clients:
+            _clients[(service, key)] = factory()
+        return _clients[(service, key)]
 
 
 class Rotator:
@@ -32,6 +64,7 @@ class Rotator:
         self.keys = self._load()
         self.idx = 0
         self.last = 0
+        self._lock = threading.Lock()
 
     def _load(self) -> list[str]:
         """Load all keys for service."""
@@ -73,22 +106,37 @@ class Rotator:
         if not any(s in err.lower() for s in signals):
             return False
 
-        now = time.time()
-        if now - self.last >= 1:
-            self.idx = (self.idx + 1) % len(self.keys)
-            self.last = now
-            logger.debug(f"Rotated {self.service} key to index {self.idx}")
-            return True
+        with self._lock:
+            now = time.time()
+            if now - self.last >= 1:
+                self.idx = (self.idx + 1) % len(self.keys)
+                self.last = now
+                logger.debug(f"Rotated {self.service} key to index {self.idx}")
+                return True
         return False
 
 
-async def with_rotation(service: str, fn: Callable, *args, **kwargs) -> Any:
-    """Execute with automatic key rotation."""
+def _rotator(service: str) -> Rotator:
+    """Process-wide rotator for a service, shared by every thread and event loop."""
     svc = service.upper()
-    if svc not in _rotators:
-        _rotators[svc] = Rotator(svc)
+    with _rotators_lock:
+        if svc not in _rotators:
+            _rotators[svc] = Rotator(svc)
+        return _rotators[svc]
 
-    rot = _rotators[svc]
+
+def _key_index(service: str, key: str) -> int:
+    keys = _rotator(service).keys
+    return keys.index(key) if key in keys else 0
+
+
+def _tokens(value: Any) -> int:
+    return value if isinstance(value, int) else 0
+
+
+async def with_rotation(service: str, fn: Callable, *args, **kwargs) -> Any:
+    """Execute with automatic key rotation."""
+    rot = _rotator(service)
     err = None
 
     for _attempt in range(3):
@@ -96,22 +144,41 @@ async def with_rotation(service: str, fn: Callable, *args, **kwargs) -> Any:
         if not key:
             logger.error(f"No {service} keys found")
             raise ImportError(f"No {service} keys found")
+        if remaining() == 0:
+            raise asyncio.TimeoutError(f"{service} deadline exceeded")
 
         try:
-            return await fn(key, *args, **kwargs)
+            with span("llm.request", service=rot.service, key=str(rot.keys.index(key))):
+                return await bounded(fn(key, *args, **kwargs))
+        except asyncio.TimeoutError:
+            logger.warning(f"{service} request exceeded deadline")
+            count("llm.error", service=rot.service, reason="TimeoutError")
+            raise
         except Exception as e:
             err = e
             logger.warning(f"{service} request failed: {e}")
+            count("llm.error", service=rot.service, reason=type(e).__name__)
             if not rot.rotate(str(e)):
                 break
+            count("llm.retry", service=rot.service)
 
     logger.error(f"All {service} attempts failed")
     raise err
 
 
+def _timeout() -> dict[str, float]:
+    """SDK request timeout for the remaining deadline, if any."""
+    left = remaining()
+    return {"timeout": left} if left is not None else {}
+
+
 @runtime_checkable
 class LLM(Protocol):
-    """LLM provider interface for component shaping."""
+    """LLM provider interface for component shaping.
+
+    Providers may also implement `async complete(prompt) -> Completion` to report
+    token usage; the shaper prefers it when present.
+    """
 
     async def generate(self, prompt: str) -> str:
         """Generate text response from prompt."""
@@ -141,20 +208,38 @@ class OpenAI(LLM):
         self.model = model or "gpt-4.1-mini"
 
     async def generate(self, prompt: str) -> str:
+        return (await self.complete(prompt)).text
+
+    async def complete(self, prompt: str) -> Completion:
         try:
             import openai
         except ImportError:
             raise ImportError("pip install openai") from None
 
-        async def _gen(key: str) -> str:
-            client = openai.AsyncOpenAI(api_key=key)
+        async def _gen(key: str) -> Completion:
+            client = _client("openai", key, lambda: openai.AsyncOpenAI(api_key=key))
+            start = time.perf_counter()
             resp = await client.chat.completions.create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=2000,
                 temperature=0.1,
+                **_timeout(),
+            )
+            usage = getattr(resp, "usage", None)
+            details = getattr(usage, "prompt_tokens_details", None)
+            return Completion(
+                resp.choices[0].message.content,
+                Usage(
+                    "openai",
+                    self.model,
+                    input_tokens=_tokens(getattr(usage, "prompt_tokens", 0)),
+                    output_tokens=_tokens(getattr(usage, "completion_tokens", 0)),
+                    cached_tokens=_tokens(getattr(details, "cached_tokens", 0)),
+                    latency=time.perf_counter() - start,
+                    key=_key_index("openai", key),
+                ),
             )
-            return resp.choices[0].message.content
 
         return await with_rotation("openai", _gen)
 
@@ -166,15 +251,39 @@ class Gemini(LLM):
         self.model = model or "gemini-2.5-flash"
 
     async def generate(self, prompt: str) -> str:
+        return (await self.complete(prompt)).text
+
+    async def complete(self, prompt: str) -> Completion:
         try:
             import google.genai as genai
         except ImportError:
             raise ImportError("pip install google-genai") from None
 
-        async def _gen(key: str) -> str:
-            client = genai.Client(api_key=key)
-            resp = await client.aio.models.generate_content(model=self.model, contents=prompt)
-            return resp.text
+        async def _gen(key: str) -> Completion:
+            left = remaining()
+            config = (
+                {"http_options": {"timeout": max(int(left * 1000), 1)}}
+                if left is not None
+                else None
+            )
+            client = _client("gemini", key, lambda: genai.Client(api_key=key))
+            start = time.perf_counter()
+            resp = await client.aio.models.generate_content(
+                model=self.model, contents=prompt, config=config
+            )
+            usage = getattr(resp, "usage_metadata", None)
+            return Completion(
+                resp.text,
+                Usage(
+                    "gemini",
+                    self.model,
+                    input_tokens=_tokens(getattr(usage, "prompt_token_count", 0)),
+                    output_tokens=_tokens(getattr(usage, "candidates_token_count", 0)),
+                    cached_tokens=_tokens(getattr(usage, "cached_content_token_count", 0)),
+                    latency=time.perf_counter() - start,
+                    key=_key_index("gemini", key),
+                ),
+            )
 
         return await with_rotation("gemini", _gen)
 
@@ -186,19 +295,36 @@ class Anthropic(LLM):
         self.model = model or "claude-4.5-sonnet-latest"
 
     async def generate(self, prompt: str) -> str:
+        return (await self.complete(prompt)).text
+
+    async def complete(self, prompt: str) -> Completion:
         try:
             import anthropic
         except ImportError:
             raise ImportError("pip install anthropic") from None
 
-        async def _gen(key: str) -> str:
-            client = anthropic.AsyncAnthropic(api_key=key)
+        async def _gen(key: str) -> Completion:
+            client = _client("anthropic", key, lambda: anthropic.AsyncAnthropic(api_key=key))
+            start = time.perf_counter()
             resp = await client.messages.create(
                 model=self.model,
                 max_tokens=2000,
                 temperature=0.1,
                 messages=[{"role": "user", "content": prompt}],
+                **_timeout(),
+            )
+            usage = getattr(resp, "usage", None)
+            return Completion(
+                resp.content[0].text,
+                Usage(
+                    "anthropic",
+                    self.model,
+                    input_tokens=_tokens(getattr(usage, "input_tokens", 0)),
+                    output_tokens=_tokens(getattr(usage, "output_tokens", 0)),
+                    cached_tokens=_tokens(getattr(usage, "cache_read_input_tokens", 0)),
+                    latency=time.perf_counter() - start,
+                    key=_key_index("anthropic", key),
+                ),
             )
-            return resp.content[0].text
 
         return await with_rotation("anthropic", _gen)
@@ -0,0 +1,86 @@
+"""Bounded worker pools for blocking synchronous agents."""
+
+import asyncio
+import functools
+import inspect
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+POOL_KINDS = ("thread", "process")
+
+
+def is_async(agent: Any) -> bool:
+    """Whether calling the agent returns a coroutine or async stream rather than blocking."""
+    if inspect.iscoroutinefunction(agent) or inspect.isasyncgenfunction(agent):
+        return True
+    call = getattr(type(agent), "__call__", None)  # noqa: B004
+    return inspect.iscoroutinefunction(call) or inspect.isasyncgenfunction(call)
+
+
+class AgentPool:
+    """Runs sync agents off the event loop in a bounded thread or process pool.
+
+    Process pools need picklable, module-level agents and arguments.
+    """
+
+    def __init__(
+        self, kind: str = "thread", max_workers: int = 8, max_queued: Optional[int] = None
+    ):
+        if kind not in POOL_KINDS:
+            raise ValueError(f"Unknown pool kind: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> Executor:
+        """The pool, created on first use; call with the lock held."""
+        if self._executor is None:
+            pool = ThreadPoolExecutor if self.kind == "thread" else ProcessPoolExecutor
+            self._executor = pool(max_workers=self.max_workers)
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run fn in the pool; RuntimeError when the queue is full.
+
+        Cancelling the caller stops a queued call, but a running one occupies its
+        worker until it returns and is counted in flight until then.
+        """
+        with self._lock:
+            queued = max(self._in_flight - self.max_workers, 0)
+            if self.max_queued is not None and queued >= self.max_queued:
+                self._rejected += 1
+                raise RuntimeError(f"Agent pool queue full ({queued} waiting)")
+            future = self._get_executor().submit(functools.partial(fn, *args, **kwargs))
+            self._in_flight += 1
+        future.add_done_callback(self._done)
+        return await asyncio.wrap_future(future)
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if not future.cancelled():
+                self._completed += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Pool sizing and queue depth."""
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "workers": self.max_workers,
+                "active": min(self._in_flight, self.max_workers),
+                "queued": max(self._in_flight - self.max_workers, 0),
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -0,0 +1,101 @@
+"""JSON Patch deltas between component trees."""
+
+import copy
+from typing import Any, Optional
+
+from .canonical import dumpb
+
+
+def _escape(token: Any) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def diff(old: Any, new: Any, path: str = "") -> list[dict[str, Any]]:
+    """RFC 6902 operations (add/remove/replace) turning old into new."""
+    if old == new:
+        return []
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = [{"op": "remove", "path": f"{path}/{_escape(key)}"} for key in old if key not in new]
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key in old:
+                ops.extend(diff(old[key], value, child))
+            else:
+                ops.append({"op": "add", "path": child, "value": value})
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list):
+        prefix = 0
+        limit = min(len(old), len(new))
+        while prefix < limit and old[prefix] == new[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+            suffix += 1
+
+        old_mid = old[prefix : len(old) - suffix]
+        new_mid = new[prefix : len(new) - suffix]
+        shared = min(len(old_mid), len(new_mid))
+
+        ops = []
+        for offset in range(shared):
+            ops.extend(diff(old_mid[offset], new_mid[offset], f"{path}/{prefix + offset}"))
+        for index in reversed(range(prefix + shared, prefix + len(old_mid))):
+            ops.append({"op": "remove", "path": f"{path}/{index}"})
+        for offset in range(shared, len(new_mid)):
+            ops.append({"op": "add", "path": f"{path}/{prefix + offset}", "value": new_mid[offset]})
+        return ops
+
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply(doc: Any, ops: list[dict[str, Any]]) -> Any:
+    """Apply add/remove/replace operations to a copy of doc."""
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        tokens = [_unescape(token) for token in op["path"].split("/")[1:]]
+        if not tokens:
+            doc = copy.deepcopy(op.get("value"))
+            continue
+
+        parent = doc
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+
+        last = tokens[-1]
+        value = copy.deepcopy(op.get("value"))
+        if isinstance(parent, list):
+            index = len(parent) if last == "-" else int(last)
+            if op["op"] == "add":
+                parent.insert(index, value)
+            elif op["op"] == "remove":
+                del parent[index]
+            else:
+                parent[index] = value
+        elif op["op"] == "remove":
+            del parent[last]
+        else:
+            parent[last] = value
+    return doc
+
+
+class TreeDiffer:
+    """Last tree emitted in a session; diffs each new tree against it."""
+
+    def __init__(self):
+        self.tree: Optional[list[Any]] = None
+        self.etag: Optional[str] = None
+
+    def update(self, tree: list[Any], etag: str) -> Optional[list[dict[str, Any]]]:
+        """Patch from the previous tree, or None when the full tree is smaller or first."""
+        previous = self.tree
+        self.tree, self.etag = tree, etag
+        if previous is None:
+            return None
+        ops = diff(previous, tree)
+        return ops if len(dumpb(ops)) < len(dumpb(tree)) else None
@@ -0,0 +1,87 @@
+"""Speculative prefetch of likely continuation turns."""
+
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+CHOICE_FIELDS = {"suggestions": "suggestions"}
+PRIORITY = {"high": 0, "medium": 1, "low": 2}
+
+
+def _key(data: Any) -> str:
+    """Match key for an interaction payload; null fields count as absent."""
+    if isinstance(data, dict):
+        data = {key: value for key, value in data.items() if value is not None}
+    return json.dumps(data, sort_keys=True, default=str)
+
+
+def choices(components: list[Any], limit: int) -> list[dict[str, Any]]:
+    """Top discrete options in a component tree, shaped like their callback data.
+
+    Fields the client leaves undefined (and JSON drops) are omitted, so a choice
+    renders exactly like the interaction the user would send.
+    """
+    found: list[dict[str, Any]] = []
+
+    def _walk(node: Any) -> None:
+        if isinstance(node, list):
+            for child in node:
+                _walk(child)
+            return
+        if not isinstance(node, dict) or not isinstance(node.get("data"), dict):
+            return
+        field = CHOICE_FIELDS.get(node.get("type"))
+        items = node["data"].get(field) if field else None
+        for item in items if isinstance(items, list) else []:
+            if isinstance(item, dict) and item.get("text"):
+                choice = {
+                    "text": item["text"],
+                    "id": item.get("id"),
+                    "priority": item.get("priority"),
+                }
+                found.append({key: value for key, value in choice.items() if value is not None})
+
+    _walk(components)
+    found.sort(key=lambda choice: PRIORITY.get(choice.get("priority"), 1))
+
+    unique: dict[str, dict[str, Any]] = {}
+    for choice in found:
+        unique.setdefault(_key(choice), choice)
+    return list(unique.values())[:limit]
+
+
+class Prefetcher:
+    """Runs continuation turns for the top-N choices while the user decides."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def start(self, components: list[Any], run: Callable[[dict[str, Any]], Awaitable[Any]]) -> None:
+        """Cancel outstanding speculation and start a turn per likely choice."""
+        self.cancel()
+        for choice in choices(components, self.limit):
+            self._tasks[_key(choice)] = asyncio.create_task(run(choice))
+
+    async def claim(self, interaction: dict[str, Any]) -> Optional[Any]:
+        """Prefetched turn matching the interaction, or None; cancels the rest."""
+        task = self._tasks.pop(_key(interaction.get("data")), None)
+        self.cancel()
+        if task is None:
+            return None
+        try:
+            return await task
+        except Exception as e:
+            logger.warning(f"Prefetched continuation failed, rerunning: {e}")
+            return None
+
+    def cancel(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+    def __len__(self) -> int:
+        return len(self._tasks)
@@ -0,0 +1,212 @@
+"""Opt-in sampling profiler for 1-in-N ai() requests."""
+
+import cProfile
+import itertools
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("collapsed", "pstats")
+SAMPLE_INTERVAL = 0.005
+
+
+class _Sample:
+    """Profile of one request, written to path when finished.
+
+    Nothing runs until start(); a sample that is stopped and never finished (an
+    unconsumed stream or coroutine) leaves no thread or profiler behind.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def start(self) -> None:
+        """Profile the current thread (e.g. a background loop) until stop()."""
+
+    def stop(self) -> None:
+        """Pause profiling; start() continues the same sample."""
+
+    def finish(self) -> None:
+        """Stop profiling and write the output file."""
+
+
+class _StackSample(_Sample):
+    """Wall-clock stack sampling of the request's thread into collapsed-stack lines.
+
+    A daemon thread snapshots the target thread's frames every interval, so the
+    request itself pays nothing per call. On an event loop thread, samples include
+    whatever coroutine was running at the time.
+    """
+
+    def __init__(self, path: Path, interval: float):
+        super().__init__(path)
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._target = threading.get_ident()
+        self._stopped: Optional[threading.Event] = None
+        self._finished = False
+
+    def start(self) -> None:
+        self._target = threading.get_ident()
+        if self._stopped is None and not self._finished:
+            self._stopped = threading.Event()
+            thread = threading.Thread(
+                target=self._run, args=(self._stopped,), name="agentinterface-profiler"
+            )
+            thread.daemon = True
+            thread.start()
+
+    def stop(self) -> None:
+        if self._stopped is not None:
+            self._stopped.set()
+            self._stopped = None
+
+    def finish(self) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        if self._stopped is None:
+            self._write()
+        else:
+            self.stop()  # the sampler thread writes once it exits
+
+    def _run(self, stopped: threading.Event) -> None:
+        own = threading.get_ident()
+        while not stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None or self._target == own:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+        if self._finished:
+            self._write()
+
+    def _write(self) -> None:
+        partial = self.path.with_suffix(".tmp")
+        try:
+            partial.write_text(
+                "".join(f"{stack} {hits}\n" for stack, hits in self.stacks.most_common())
+            )
+            partial.replace(self.path)
+        except OSError as e:
+            logger.warning(f"Could not write profile {self.path}: {e}")
+
+
+_tracing = threading.Lock()
+
+
+class _TraceSample(_Sample):
+    """Deterministic cProfile of the request's thread, dumped as pstats.
+
+    cProfile replaces the thread's profile function, so only one sample traces at a
+    time; a sample that cannot take the tracer at any point is dropped whole rather
+    than written with gaps.
+    """
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.profile = cProfile.Profile()
+        self._active = False
+        self._traced = False
+        self._skipped = False
+
+    def start(self) -> None:
+        if self._active:
+            self.stop()
+        if self._skipped:
+            return
+        if not _tracing.acquire(blocking=False):
+            self._skip(f"another sample is tracing ({self.path})")
+            return
+        try:
+            self.profile.enable()
+        except (ValueError, RuntimeError) as e:  # another profiler owns this thread
+            _tracing.release()
+            self._skip(str(e))
+            return
+        self._active = True
+        self._traced = True
+
+    def stop(self) -> None:
+        if not self._active:
+            return
+        self._active = False
+        try:
+            self.profile.disable()
+        finally:
+            _tracing.release()
+
+    def _skip(self, reason: str) -> None:
+        logger.debug(f"Profile sample skipped: {reason}")
+        self._skipped = True
+
+    def finish(self) -> None:
+        self.stop()
+        if not self._traced or self._skipped:
+            return
+        self._traced = False
+        try:
+            self.profile.dump_stats(str(self.path))
+        except OSError as e:
+            logger.warning(f"Could not write profile {self.path}: {e}")
+
+
+class Profiler:
+    """Profile every Nth ai() invocation end to end, one output file per sample.
+
+    format="collapsed" samples stacks from a side thread (flamegraph input, lowest
+    overhead); format="pstats" traces every call with cProfile for pstats/snakeviz.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        every: int = 100,
+        format: str = "collapsed",
+        interval: float = SAMPLE_INTERVAL,
+    ):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown profile format: {format}")
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        self.directory = Path(directory)
+        self.every = every
+        self.format = format
+        self.interval = interval
+        self._calls = itertools.count()
+        self._samples = itertools.count()
+
+    def sample(self) -> Optional[_Sample]:
+        """An unstarted sample for this invocation if it is the Nth, else None."""
+        if next(self._calls) % self.every:
+            return None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"ai-{os.getpid()}-{next(self._samples)}"
+        if self.format == "pstats":
+            return _TraceSample(self.directory / f"{name}.pstats")
+        return _StackSample(self.directory / f"{name}.collapsed", self.interval)
+
+
+_profiler: Optional[Profiler] = None
+
+
+def set_profiler(profiler: Optional[Profiler]) -> Optional[Profiler]:
+    """Enable sampling (None disables) at runtime; returns the previous profiler."""
+    global _profiler
+    previous, _profiler = _profiler, profiler
+    return previous
+
+
+def sample() -> Optional[_Sample]:
+    profiler = _profiler
+    return None if profiler is None else profiler.sample()
@@ -0,0 +1,162 @@
+"""Minimal dependency-free HTTP/1.1 server for callback traffic."""
+
+import asyncio
+import contextlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+logger = logging.getLogger(__name__)
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024
+KEEPALIVE_TIMEOUT = 15
+
+Handler = Callable[[str, str, dict[str, str], Any], Awaitable[tuple[int, Any]]]
+
+_REASONS = {
+    200: "OK",
+    204: "No Content",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+    501: "Not Implemented",
+}
+
+
+class _RequestError(Exception):
+    def __init__(self, status: int):
+        super().__init__(_REASONS[status])
+        self.status = status
+
+
+def _response(status: int, payload: Any = None, keep_alive: bool = True, **headers: str) -> bytes:
+    body = b"" if payload is None else json.dumps(payload).encode()
+    lines = [
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}",
+        "Access-Control-Allow-Origin: *",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    if body:
+        lines.append("Content-Type: application/json")
+    lines.extend(f"{name.replace('_', '-')}: {value}" for name, value in headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> Optional[tuple[str, str, str, dict[str, str], bytes]]:
+    """(method, target, version, headers, body), or None when the peer closed."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise _RequestError(400) from None
+        return None
+    except asyncio.LimitOverrunError:
+        raise _RequestError(431) from None
+
+    request_line, *header_lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = request_line.split(" ")
+    except ValueError:
+        raise _RequestError(400) from None
+
+    headers = {}
+    for line in header_lines:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise _RequestError(501)
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise _RequestError(400) from None
+    if method == "POST" and "content-length" not in headers:
+        raise _RequestError(411)
+    if length > MAX_BODY_BYTES:
+        raise _RequestError(413)
+    body = await reader.readexactly(length) if length else b""
+    return method, target, version, headers, body
+
+
+def _keep_alive(version: str, headers: dict[str, str]) -> bool:
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+def connection_handler(
+    handle: Handler,
+) -> Callable[[asyncio.StreamReader, asyncio.StreamWriter], Awaitable[None]]:
+    """asyncio.start_server callback serving keep-alive requests through handle()."""
+
+    async def _serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(_read_request(reader), KEEPALIVE_TIMEOUT)
+                except _RequestError as e:
+                    writer.write(_response(e.status, {"error": str(e)}, keep_alive=False))
+                    await writer.drain()
+                    return
+                if request is None:
+                    return
+
+                method, target, version, headers, body = request
+                keep_alive = _keep_alive(version, headers)
+                if method == "OPTIONS":
+                    allowed = headers.get("access-control-request-headers", "*")
+                    writer.write(
+                        _response(
+                            204,
+                            keep_alive=keep_alive,
+                            Access_Control_Allow_Methods="GET, POST, OPTIONS",
+                            Access_Control_Allow_Headers=allowed,
+                        )
+                    )
+                else:
+                    url = urlsplit(target)
+                    try:
+                        data = json.loads(body) if body else None
+                    except ValueError:
+                        status, payload = 400, {"error": "Invalid JSON"}
+                    else:
+                        status, payload = await handle(
+                            method, url.path, dict(parse_qsl(url.query)), data
+                        )
+                    writer.write(_response(status, payload, keep_alive=keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        except Exception as e:
+            logger.error(f"Callback server error: {e}")
+        finally:
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+
+    return _serve
+
+
+async def start_server(
+    handle: Handler, host: str, port: int, reuse_port: bool = False
+) -> asyncio.AbstractServer:
+    """Listen on host:port in the running loop; reuse_port lets worker processes share it."""
+    return await asyncio.start_server(
+        connection_handler(handle),
+        host,
+        port,
+        limit=MAX_HEADER_BYTES,
+        reuse_port=reuse_port or None,
+    )
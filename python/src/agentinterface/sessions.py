@@ -0,0 +1,48 @@
+"""Detached conversation sessions resumable by id."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+SESSION_TTL = 600
+MAX_SESSIONS = 1024
+
+
+class SessionStore:
+    """Bounded in-memory LRU of parked sessions with TTL.
+
+    Streams end after emitting components; the session waits here instead of
+    holding a generator and connection open while the user thinks.
+    """
+
+    def __init__(self, capacity: int = MAX_SESSIONS, ttl: float = SESSION_TTL):
+        self.capacity = capacity
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def put(self, session_id: str, session: Any) -> None:
+        """Park a session, evicting expired and least recently used entries."""
+        self._entries.pop(session_id, None)
+        now = time.monotonic()
+        while self._entries:
+            oldest, (expires, _session) = next(iter(self._entries.items()))
+            if expires > now and len(self._entries) < self.capacity:
+                break
+            del self._entries[oldest]
+
+        self._entries[session_id] = (now + self.ttl, session)
+
+    def pop(self, session_id: str) -> Optional[Any]:
+        """Claim a parked session, or None if unknown or expired."""
+        entry = self._entries.pop(session_id, None)
+        if entry is None:
+            return None
+        expires, session = entry
+        return session if expires > time.monotonic() else None
+
+    def __contains__(self, session_id: str) -> bool:
+        entry = self._entries.get(session_id)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._entries)
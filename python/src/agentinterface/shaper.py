@@ -1,15 +1,22 @@
 """Agent text to component JSON."""
 
+import asyncio
 import json
 import logging
+import threading
 from pathlib import Path
 from typing import Any, Iterable, Optional
 
+from .deadline import bounded, expires_in, remaining, until
 from .llms import LLM
+from .tabular import extract_tables, splice_tables
+from .telemetry import count, span
+from .usage import complete, record
 
 logger = logging.getLogger(__name__)
 
 _REGISTRY_CACHE: Optional[dict[str, Any]] = None
+_registry_lock = threading.Lock()
 
 
 def find_registry_path() -> Optional[Path]:
@@ -43,9 +50,14 @@ def _load_registry() -> dict[str, Any]:
 def _registry() -> dict[str, Any]:
     """Cached registry accessor."""
     global _REGISTRY_CACHE
-    if _REGISTRY_CACHE is None:
-        _REGISTRY_CACHE = _load_registry()
-    return _REGISTRY_CACHE
+    registry = _REGISTRY_CACHE
+    if registry is None:
+        with _registry_lock:
+            if _REGISTRY_CACHE is None:
+                with span("shaper.registry"):
+                    _REGISTRY_CACHE = _load_registry()
+            registry = _REGISTRY_CACHE
+    return registry
 
 
 def _validate_component_tree(components: Any, allowed: Optional[Iterable[str]] = None) -> None:
@@ -113,39 +125,161 @@ def _strip_markdown_fences(text: str) -> str:
 
 
 async def shape(
-    response: str, context: Optional[dict[str, Any]] = None, llm: Optional[LLM] = None
+    response: Any,
+    context: Optional[dict[str, Any]] = None,
+    llm: Optional[LLM] = None,
+    deadline: Optional[float] = None,
 ) -> str:
     """Transform agent text into component JSON via shaper LLM."""
     if not llm:
         return response
-    return await _generate_component(response, context or {}, llm)
+    components = await shape_components(response, context, llm, deadline)
+    return json.dumps(components, indent=2)
+
 
+async def shape_components(
+    response: Any,
+    context: Optional[dict[str, Any]] = None,
+    llm: Optional[LLM] = None,
+    deadline: Optional[float] = None,
+) -> list[Any]:
+    """Transform agent text into a validated component tree via shaper LLM.
 
-async def _generate_component(response: str, context: dict[str, Any], llm: LLM) -> str:
-    """Generate component JSON from text using shaper LLM."""
+    With a deadline (seconds), shaping that runs out of time falls back to markdown.
+    """
+    fallback = [{"type": "markdown", "data": {"content": str(response)}}]
+    if not llm:
+        return fallback
+
+    context = context or {}
+    with until(expires_in(deadline)):
+        try:
+            return await bounded(_generate_component(response, context, llm))
+        except asyncio.TimeoutError:
+            allowed = context.get("components")
+            if remaining() is None or (allowed and "markdown" not in allowed):
+                raise
+            logger.warning("Shaping deadline exceeded, falling back to markdown")
+            count("shaper.fallback", reason="TimeoutError")
+            return fallback
+
+
+async def _generate_component(response: Any, context: dict[str, Any], llm: LLM) -> list[Any]:
+    """Generate component tree from text using shaper LLM."""
     from .ai import protocol
 
     available_components = context.get("components")
-    instructions = protocol(available_components)
+    with span("shaper.protocol"):
+        instructions = protocol(available_components)
+    content, tables = extract_tables(response, available_components)
 
     prompt = f"""Transform this content into a component JSON array:
 
-{response}
+{content}
 
 {instructions}"""
 
-    result = await llm.generate(prompt)
-    result = _strip_markdown_fences(result)
+    with span("shaper.llm"):
+        completion = await complete(llm, prompt)
 
+    produced: list[str] = []
     try:
-        components = json.loads(result)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"LLM returned invalid JSON: {e}") from e
+        with span("shaper.parse"):
+            components = _parse(completion.text, list)
 
-    if not isinstance(components, list):
-        actual_type = type(components).__name__
-        raise ValueError(f"LLM returned {actual_type}, expected array")
+        if tables:
+            components = splice_tables(components, tables)
 
-    allowed_components = context.get("components") if context else None
-    _validate_component_tree(components, allowed_components)
-    return json.dumps(components, indent=2)
+        allowed_components = context.get("components") if context else None
+        with span("shaper.validate"):
+            _validate_component_tree(components, allowed_components)
+        produced = _component_types(components)
+        return components
+    finally:
+        if completion.usage is not None:
+            record(completion.usage, produced)
+
+
+async def shape_sections(
+    sections: list[str], context: Optional[dict[str, Any]] = None, llm: Optional[LLM] = None
+) -> list[list[Any]]:
+    """Shape independent sections in one shaper call; one validated tree per section."""
+    if not llm:
+        return [[{"type": "markdown", "data": {"content": section}}] for section in sections]
+    context = context or {}
+    if len(sections) == 1:
+        return [await _generate_component(sections[0], context, llm)]
+    return await _generate_sections(sections, context, llm)
+
+
+async def _generate_sections(
+    sections: list[str], context: dict[str, Any], llm: LLM
+) -> list[list[Any]]:
+    """Shape several sections with one prompt, answered as a JSON object keyed by section."""
+    from .ai import protocol
+
+    available_components = context.get("components")
+    with span("shaper.protocol"):
+        instructions = protocol(available_components)
+    extracted = [extract_tables(section, available_components) for section in sections]
+    keys = [f"s{i}" for i in range(len(sections))]
+    numbered = "\n\n".join(f"[{key}]\n{content}" for key, (content, _) in zip(keys, extracted))
+    layout = ", ".join(f'"{key}": [...]' for key in keys)
+
+    prompt = f"""Transform each section below into its own component JSON array:
+
+{numbered}
+
+{instructions}
+Wrap the arrays in one JSON object keyed by section id: {{{layout}}}"""
+
+    with span("shaper.llm"):
+        completion = await complete(llm, prompt)
+
+    produced: list[str] = []
+    try:
+        with span("shaper.parse"):
+            shaped = _parse(completion.text, dict)
+
+        trees = []
+        for key, (_, tables) in zip(keys, extracted):
+            components = shaped.get(key)
+            if not isinstance(components, list):
+                raise ValueError(f"LLM returned no component array for section {key}")
+            if tables:
+                components = splice_tables(components, tables)
+            with span("shaper.validate"):
+                _validate_component_tree(components, available_components)
+            trees.append(components)
+        produced = _component_types(trees)
+        return trees
+    finally:
+        if completion.usage is not None:
+            record(completion.usage, produced)
+
+
+def _parse(text: str, expected: type) -> Any:
+    """JSON from LLM output, without markdown fences, of the expected type."""
+    result = _strip_markdown_fences(text)
+    try:
+        value = json.loads(result)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"LLM returned invalid JSON: {e}") from e
+    if not isinstance(value, expected):
+        actual_type = type(value).__name__
+        expected_name = "array" if expected is list else "object"
+        raise ValueError(f"LLM returned {actual_type}, expected {expected_name}")
+    return value
+
+
+def _component_types(node: Any) -> list[str]:
+    """Component types in a tree, in order of first appearance."""
+    if isinstance(node, list):
+        return list(dict.fromkeys(kind for child in node for kind in _component_types(child)))
+    if not isinstance(node, dict):
+        return []
+    kinds = [node["type"]] if isinstance(node.get("type"), str) else []
+    for value in node.values():
+        if isinstance(value, (list, dict)):
+            kinds.extend(_component_types(value))
+    return list(dict.fromkeys(kinds))
@@ -0,0 +1,82 @@
+"""Synchronous facade over one long-lived background event loop."""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, AsyncIterable, Awaitable, Iterator, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = threading.Lock()
+
+
+def background_loop() -> asyncio.AbstractEventLoop:
+    """Shared event loop running in a daemon thread, started on first use.
+
+    Provider clients, connection pools and caches live on this loop, so they are
+    reused across sync calls instead of being rebuilt by asyncio.run() each time.
+    """
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            threading.Thread(target=_run, name="agentinterface-loop", daemon=True).start()
+            ready.wait()
+            _loop = loop
+        return _loop
+
+
+def current_background_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """The running background loop, without starting one."""
+    loop = _loop
+    return loop if loop is not None and not loop.is_closed() else None
+
+
+def _submit(awaitable: Awaitable[Any]) -> concurrent.futures.Future:
+    loop = background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise RuntimeError("run_sync() cannot block the background loop; await instead")
+
+    async def _await() -> Any:
+        return await awaitable
+
+    return asyncio.run_coroutine_threadsafe(_await(), loop)
+
+
+def run_sync(awaitable: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """Run an awaitable on the background loop and block for its result.
+
+    Safe to call from any number of threads concurrently.
+    """
+    future = _submit(awaitable)
+    try:
+        return future.result(timeout)
+    except BaseException:
+        future.cancel()
+        raise
+
+
+def iter_sync(stream: AsyncIterable[Any]) -> Iterator[Any]:
+    """Iterate an async stream (e.g. a streaming ai() agent) from synchronous code."""
+    iterator = stream.__aiter__()
+    try:
+        while True:
+            try:
+                yield run_sync(iterator.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        if hasattr(iterator, "aclose"):
+            run_sync(iterator.aclose())
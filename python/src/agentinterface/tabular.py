@@ -0,0 +1,148 @@
+"""Large tabular payloads: schema plus sample to the shaper, rows spliced locally."""
+
+import datetime
+import json
+import math
+import re
+from typing import Any, Iterable, Optional
+
+TABULAR_ROW_THRESHOLD = 20
+TABULAR_SAMPLE_ROWS = 5
+
+_MARKDOWN_TABLE = re.compile(r"(?:^[ \t]*\|.*\|[ \t]*(?:\n|$)){3,}", re.MULTILINE)
+_SEPARATOR_ROW = re.compile(r"^\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?$")
+
+
+class _Table:
+    """Table held out of the shaper prompt."""
+
+    def __init__(self, ref: str, columns: list[str], rows: list[list[Any]]):
+        self.ref = ref
+        self.columns = columns
+        self.rows = rows
+
+    def summary(self) -> str:
+        """Schema and sample rows shown to the shaper instead of the full table."""
+        header = "| " + " | ".join(self.columns) + " |"
+        divider = "| " + " | ".join("---" for _ in self.columns) + " |"
+        sample = [
+            "| " + " | ".join(str(cell) for cell in row) + " |"
+            for row in self.rows[:TABULAR_SAMPLE_ROWS]
+        ]
+        lines = "\n".join([header, divider, *sample])
+        return f"""[Table {self.ref}: {len(self.rows)} rows. Columns: {", ".join(self.columns)}. Sample rows:
+{lines}
+Render it as {{"type": "table", "data": {{"ref": "{self.ref}", "title": "..."}}}}. Rows are filled in automatically.]"""
+
+    def data(self) -> dict[str, Any]:
+        """Full `table` component data: first column names each row."""
+        keys = self.columns[1:]
+        return {
+            "attributes": [{"key": key, "label": key} for key in keys],
+            "items": [
+                {"id": str(index), "name": str(row[0]), "attributes": dict(zip(keys, row[1:]))}
+                for index, row in enumerate(self.rows)
+            ],
+        }
+
+
+def _cell(value: Any) -> Any:
+    """JSON-safe cell: dates as ISO strings, NaN and infinities as None."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if hasattr(value, "item") and not isinstance(value, (str, bytes)):
+        return _cell(value.item())  # numpy scalar
+    return value
+
+
+def _dataset(obj: Any) -> Optional[tuple[list[str], list[list[Any]]]]:
+    """Columns and JSON-safe rows of a DataFrame, 2-D ndarray or list of records."""
+    if hasattr(obj, "columns") and hasattr(obj, "to_json"):
+        # pandas converts the whole frame at once: timestamps to ISO, NaN/NaT to null
+        split = json.loads(obj.to_json(orient="split", date_format="iso"))
+        return [str(col) for col in obj.columns], split["data"]
+
+    if hasattr(obj, "tolist") and getattr(obj, "ndim", 0) == 2:
+        rows = [[_cell(cell) for cell in row] for row in obj.tolist()]
+        width = len(rows[0]) if rows else 0
+        return [f"column_{i + 1}" for i in range(width)], rows
+
+    if isinstance(obj, list) and obj and all(isinstance(row, dict) for row in obj):
+        columns = list(dict.fromkeys(key for row in obj for key in row))
+        rows = [[_cell(row.get(col)) for col in columns] for row in obj]
+        return [str(col) for col in columns], rows
+
+    return None
+
+
+def _parse_markdown_table(block: str) -> Optional[tuple[list[str], list[list[Any]]]]:
+    """Parse a pipe table into columns and rows."""
+    lines = [line.strip() for line in block.strip().splitlines()]
+    if len(lines) < 3 or not _SEPARATOR_ROW.match(lines[1]):
+        return None
+
+    def cells(line: str) -> list[str]:
+        return [cell.strip() for cell in line.strip("|").split("|")]
+
+    columns = cells(lines[0])
+    rows = [cells(line) for line in lines[2:]]
+    return columns, [row + [""] * (len(columns) - len(row)) for row in rows]
+
+
+def extract_tables(
+    response: Any, allowed: Optional[Iterable[str]] = None
+) -> tuple[str, dict[str, _Table]]:
+    """Replace large tables with schema-plus-sample summaries for the shaper prompt."""
+    if allowed is not None and "table" not in set(allowed):
+        return str(response), {}
+
+    tables: dict[str, _Table] = {}
+
+    dataset = None if isinstance(response, str) else _dataset(response)
+    if dataset is not None:
+        columns, rows = dataset
+        if len(rows) <= TABULAR_ROW_THRESHOLD or not columns:
+            return str(response), {}
+        table = _Table("t0", columns, rows)
+        tables[table.ref] = table
+        return table.summary(), tables
+
+    text = str(response)
+
+    def _replace(match: re.Match) -> str:
+        parsed = _parse_markdown_table(match.group(0))
+        if parsed is None or len(parsed[1]) <= TABULAR_ROW_THRESHOLD:
+            return match.group(0)
+        table = _Table(f"t{len(tables)}", *parsed)
+        tables[table.ref] = table
+        return table.summary() + "\n"
+
+    return _MARKDOWN_TABLE.sub(_replace, text), tables
+
+
+def splice_tables(components: list[Any], tables: dict[str, _Table]) -> list[Any]:
+    """Fill referenced `table` components with full rows; append any the shaper dropped."""
+    pending = dict(tables)
+
+    def _splice(node: Any) -> None:
+        if isinstance(node, list):
+            for child in node:
+                _splice(child)
+            return
+        if not isinstance(node, dict):
+            return
+
+        data = node.get("data")
+        if not isinstance(data, dict):
+            return
+        if node.get("type") == "table" and data.get("ref") in pending:
+            table = pending.pop(data.pop("ref"))
+            data.update(table.data())
+        for value in data.values():
+            if isinstance(value, (list, dict)):
+                _splice(value)
+
+    _splice(components)
+    return components + [{"type": "table", "data": table.data()} for table in pending.values()]
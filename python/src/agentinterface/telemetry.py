@@ -0,0 +1,139 @@
+"""Pluggable metrics and tracing hooks; no-op unless installed with set_hooks()."""
+
+import contextlib
+import threading
+import time
+from typing import Any, ContextManager, Iterator, Optional, Protocol, runtime_checkable
+
+
+@runtime_checkable
+class Hooks(Protocol):
+    """Instrumentation surface called from the shaping pipeline and callback server.
+
+    Attribute keys are fixed per metric name, so label-based backends can rely on them.
+    """
+
+    def span(self, name: str, **attributes: str) -> ContextManager[None]:
+        """Time a block of work (e.g. shaper.llm, llm.request)."""
+        ...
+
+    def observe(self, name: str, value: float, **attributes: str) -> None:
+        """Record one histogram sample (e.g. ai.callback_wait seconds)."""
+        ...
+
+    def count(self, name: str, value: int = 1, **attributes: str) -> None:
+        """Increment a counter (e.g. shaper.fallback, llm.retry)."""
+        ...
+
+
+class NoopHooks:
+    """Default hooks: every call returns immediately."""
+
+    _null = contextlib.nullcontext()
+
+    def span(self, name: str, **attributes: str) -> ContextManager[None]:
+        return self._null
+
+    def observe(self, name: str, value: float, **attributes: str) -> None:
+        pass
+
+    def count(self, name: str, value: int = 1, **attributes: str) -> None:
+        pass
+
+
+_hooks: Hooks = NoopHooks()
+
+
+def set_hooks(hooks: Optional[Hooks]) -> Hooks:
+    """Install process-wide hooks (None restores the no-op default); returns the previous."""
+    global _hooks
+    previous, _hooks = _hooks, hooks if hooks is not None else NoopHooks()
+    return previous
+
+
+def span(name: str, **attributes: str) -> ContextManager[None]:
+    return _hooks.span(name, **attributes)
+
+
+def observe(name: str, value: float, **attributes: str) -> None:
+    _hooks.observe(name, value, **attributes)
+
+
+def count(name: str, value: int = 1, **attributes: str) -> None:
+    _hooks.count(name, value, **attributes)
+
+
+class OpenTelemetryHooks:
+    """Spans through an OpenTelemetry tracer, samples and counts through a meter."""
+
+    def __init__(self, tracer: Any = None, meter: Any = None):
+        try:
+            from opentelemetry import metrics, trace
+        except ImportError:
+            raise ImportError("pip install opentelemetry-api") from None
+
+        self.tracer = tracer or trace.get_tracer("agentinterface")
+        self.meter = meter or metrics.get_meter("agentinterface")
+        self._instruments: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _instrument(self, name: str, create: Any) -> Any:
+        with self._lock:
+            if name not in self._instruments:
+                self._instruments[name] = create(name)
+            return self._instruments[name]
+
+    def span(self, name: str, **attributes: str) -> ContextManager[None]:
+        return self.tracer.start_as_current_span(name, attributes=attributes)
+
+    def observe(self, name: str, value: float, **attributes: str) -> None:
+        self._instrument(name, self.meter.create_histogram).record(value, attributes)
+
+    def count(self, name: str, value: int = 1, **attributes: str) -> None:
+        self._instrument(name, self.meter.create_counter).add(value, attributes)
+
+
+class PrometheusHooks:
+    """Histograms and counters in a prometheus_client registry.
+
+    Names become agentinterface_<name>; spans are histograms of seconds.
+    """
+
+    def __init__(self, registry: Any = None):
+        try:
+            import prometheus_client
+        except ImportError:
+            raise ImportError("pip install prometheus-client") from None
+
+        self._prometheus = prometheus_client
+        self.registry = registry or prometheus_client.REGISTRY
+        self._metrics: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _metric(self, kind: str, name: str, labels: tuple[str, ...]) -> Any:
+        metric_name = "agentinterface_" + name.replace(".", "_")
+        with self._lock:
+            if metric_name not in self._metrics:
+                metric_type = getattr(self._prometheus, kind)
+                self._metrics[metric_name] = metric_type(
+                    metric_name, name, labels, registry=self.registry
+                )
+            return self._metrics[metric_name]
+
+    def _labelled(self, kind: str, name: str, attributes: dict[str, str]) -> Any:
+        metric = self._metric(kind, name, tuple(sorted(attributes)))
+        return metric.labels(**attributes) if attributes else metric
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(f"{name}.seconds", time.perf_counter() - start, **attributes)
+
+    def observe(self, name: str, value: float, **attributes: str) -> None:
+        self._labelled("Histogram", name, attributes).observe(value)
+
+    def count(self, name: str, value: int = 1, **attributes: str) -> None:
+        self._labelled("Counter", name, attributes).inc(value)
@@ -0,0 +1,152 @@
+"""Token usage accounting for shaping calls, per request and per process."""
+
+import contextlib
+import threading
+from contextvars import ContextVar
+from typing import Any, Iterable, Iterator, Optional
+
+SUMMARY_KEYS = ("agent", "component", "service", "model")
+
+
+class Usage:
+    """Tokens, latency and key index reported by one provider call."""
+
+    def __init__(
+        self,
+        service: str,
+        model: str,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cached_tokens: int = 0,
+        latency: float = 0.0,
+        key: int = 0,
+    ):
+        self.service = service
+        self.model = model
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.cached_tokens = cached_tokens
+        self.latency = latency
+        self.key = key
+
+    def __repr__(self) -> str:
+        return (
+            f"Usage({self.service}/{self.model}, in={self.input_tokens}, "
+            f"out={self.output_tokens}, cached={self.cached_tokens}, {self.latency:.3f}s)"
+        )
+
+
+class Completion:
+    """Result of LLM.complete(): generated text plus usage when the provider reports it."""
+
+    def __init__(self, text: str, usage: Optional[Usage] = None):
+        self.text = text
+        self.usage = usage
+
+
+async def complete(llm: Any, prompt: str) -> Completion:
+    """Call llm.complete() when implemented, else wrap llm.generate() without usage."""
+    if callable(getattr(type(llm), "complete", None)):
+        return await llm.complete(prompt)
+    return Completion(await llm.generate(prompt))
+
+
+def _totals() -> dict[str, float]:
+    return {"calls": 0, "input_tokens": 0, "output_tokens": 0, "cached_tokens": 0, "latency": 0.0}
+
+
+class UsageLedger:
+    """Thread-safe running totals of shaping usage, kept per grouping in constant space."""
+
+    def __init__(self):
+        self._groups: dict[Optional[str], dict[str, dict[str, float]]] = {}
+        self._calls = 0
+        self._lock = threading.Lock()
+
+    def record(
+        self, usage: Usage, agent: Optional[str] = None, components: Iterable[str] = ()
+    ) -> None:
+        """Add one call; a call producing several component types counts toward each."""
+        keys = {
+            None: ("total",),
+            "agent": (agent or "unknown",),
+            "component": tuple(dict.fromkeys(components)) or ("unknown",),
+            "service": (usage.service,),
+            "model": (usage.model,),
+        }
+        with self._lock:
+            self._calls += 1
+            for by, names in keys.items():
+                groups = self._groups.setdefault(by, {})
+                for name in names:
+                    totals = groups.setdefault(name, _totals())
+                    totals["calls"] += 1
+                    totals["input_tokens"] += usage.input_tokens
+                    totals["output_tokens"] += usage.output_tokens
+                    totals["cached_tokens"] += usage.cached_tokens
+                    totals["latency"] += usage.latency
+
+    def summary(self, by: Optional[str] = None) -> dict[str, dict[str, float]]:
+        """Totals as {"total": ...}, or grouped by agent, component, service or model."""
+        if by is not None and by not in SUMMARY_KEYS:
+            raise ValueError(f"Unknown usage grouping: {by}")
+        with self._lock:
+            groups = self._groups.get(by, {})
+            return {name: dict(totals) for name, totals in groups.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._groups.clear()
+            self._calls = 0
+
+    def __len__(self) -> int:
+        return self._calls
+
+
+_process = UsageLedger()
+_request: ContextVar[Optional[UsageLedger]] = ContextVar("agentinterface_usage", default=None)
+_agent: ContextVar[Optional[str]] = ContextVar("agentinterface_usage_agent", default=None)
+
+
+@contextlib.contextmanager
+def track() -> Iterator[UsageLedger]:
+    """Collect usage of shaping calls made inside the block into a fresh ledger.
+
+    Wrap the await (or the `async for` over a stream) of one ai() request.
+    """
+    ledger = UsageLedger()
+    token = _request.set(ledger)
+    try:
+        yield ledger
+    finally:
+        _request.reset(token)
+
+
+@contextlib.contextmanager
+def attributed(agent: Any) -> Iterator[None]:
+    """Attribute usage recorded inside the block to this agent (None: unattributed)."""
+    name = None if agent is None else getattr(agent, "__qualname__", None) or type(agent).__name__
+    token = _agent.set(name)
+    try:
+        yield
+    finally:
+        _agent.reset(token)
+
+
+def record(usage: Usage, components: Iterable[str] = ()) -> None:
+    """Add one call to the process ledger and to the current request's ledger."""
+    agent = _agent.get()
+    components = tuple(components)
+    _process.record(usage, agent, components)
+    request = _request.get()
+    if request is not None:
+        request.record(usage, agent, components)
+
+
+def summary(by: Optional[str] = None) -> dict[str, dict[str, float]]:
+    """Process-wide usage since start (or the last reset())."""
+    return _process.summary(by)
+
+
+def reset() -> None:
+    _process.reset()
@@ -0,0 +1,226 @@
+"""Compact wire encoding for component trees: columnar rows and deduplicated references."""
+
+import hashlib
+import uuid
+from collections import Counter
+from typing import Any, Optional, Union
+
+from .canonical import dumpb
+
+WIRE_VERSION = 1
+MAX_WIRE_REFS = 4096
+
+_MIN_REF_CHARS = 32
+_MIN_INTERN_CHARS = 16
+_RESERVED = frozenset({"$ref", "$cols", "$rows", "$lit"})
+
+_PLACEHOLDER_CHARS = len('[""]') + 32  # a child container inside its parent's hash
+
+
+def _columns(rows: list[Any]) -> Optional[list[Any]]:
+    """Column spec for a list of same-shaped objects, nesting same-shaped object columns."""
+    if len(rows) < 2 or not all(isinstance(row, dict) and row for row in rows):
+        return None
+    keys = tuple(rows[0])
+    if _RESERVED.intersection(keys) or any(tuple(row) != keys for row in rows[1:]):
+        return None
+
+    spec: list[Any] = []
+    for key in keys:
+        nested = _columns([row[key] for row in rows])
+        spec.append([key, nested] if nested else key)
+    return spec
+
+
+def _scalar_cells(spec: list[Any], rows: list[Any]) -> bool:
+    """Whether every cell the spec leaves in the rows is a scalar."""
+    for col in spec:
+        if isinstance(col, list):
+            if not _scalar_cells(col[1], [row[col[0]] for row in rows]):
+                return False
+        elif any(isinstance(row[col], (dict, list)) for row in rows):
+            return False
+    return True
+
+
+def _distinct(rows: list[Any]) -> bool:
+    return len({dumpb(row) for row in rows}) == len(rows)
+
+
+class _Index:
+    """Digest and canonical JSON size of every container in a tree, hashed once bottom-up.
+
+    Child containers enter their parent's hash as ["<digest hex>"], which no scalar
+    child can produce, so equal digests still mean equal canonical JSON. Tables of
+    distinct rows whose cells are all scalars are hashed whole and hold no references.
+    """
+
+    def __init__(self):
+        self.nodes: dict[int, tuple[bytes, int]] = {}
+        self.tables: dict[int, list[Any]] = {}
+
+    def add(self, node: Any) -> tuple[bytes, int]:
+        known = self.nodes.get(id(node))
+        if known is not None:
+            return known
+        if isinstance(node, list):
+            spec = _columns(node)
+            if spec and _scalar_cells(spec, node) and _distinct(node):
+                self.tables[id(node)] = spec
+                encoded = dumpb(node)
+                known = self.nodes[id(node)] = (
+                    hashlib.blake2b(b"T" + encoded, digest_size=16).digest(),
+                    len(encoded),
+                )
+                return known
+
+        nested = 0
+        shallow: Any
+        if isinstance(node, dict):
+            shallow = {}
+            for key, value in node.items():
+                if isinstance(value, (dict, list)):
+                    digest, size = self.add(value)
+                    nested += size - _PLACEHOLDER_CHARS
+                    value = [digest.hex()]
+                shallow[key] = value
+        else:
+            shallow = []
+            for value in node:
+                if isinstance(value, (dict, list)):
+                    digest, size = self.add(value)
+                    nested += size - _PLACEHOLDER_CHARS
+                    value = [digest.hex()]
+                shallow.append(value)
+        encoded = dumpb(shallow)
+        known = self.nodes[id(node)] = (
+            hashlib.blake2b(encoded, digest_size=16).digest(),
+            len(encoded) + nested,
+        )
+        return known
+
+
+class WireEncoder:
+    """Session encoder; references sent in earlier turns are reused in later ones."""
+
+    def __init__(self, session: Optional[str] = None):
+        self.session = session or uuid.uuid4().hex
+        self._refs: dict[Union[bytes, str], int] = {}
+
+    def encode(self, components: list[Any]) -> dict[str, Any]:
+        """Encode a component tree as a self-describing compact payload."""
+        # Keys: a container's fingerprint digest, or a long string itself.
+        counts: Counter[Union[bytes, str]] = Counter()
+        digests: dict[int, bytes] = {}
+        index = _Index()
+
+        def _count(node: Any) -> None:
+            fingerprint, size = index.add(node)
+            if node and size >= _MIN_REF_CHARS:
+                digests[id(node)] = fingerprint
+                counts[fingerprint] += 1
+                if counts[fingerprint] > 1:
+                    return
+            if id(node) in index.tables:
+                return
+            for value in node.values() if isinstance(node, dict) else node:
+                if isinstance(value, (dict, list)):
+                    _count(value)
+                elif isinstance(value, str) and len(value) >= _MIN_INTERN_CHARS:
+                    counts[value] += 1
+
+        if isinstance(components, (dict, list)):
+            _count(components)
+        refs: dict[str, Any] = {}
+
+        def _key(node: Any) -> Optional[Union[bytes, str]]:
+            if isinstance(node, str):
+                return node if len(node) >= _MIN_INTERN_CHARS else None
+            return digests.get(id(node))
+
+        def _shared(node: Any) -> bool:
+            key = _key(node)
+            return key is not None and (key in self._refs or counts[key] > 1)
+
+        def _encode(node: Any) -> Any:
+            if isinstance(node, str):
+                if len(node) < _MIN_INTERN_CHARS:
+                    return node
+                key: Optional[Union[bytes, str]] = node
+            elif isinstance(node, (dict, list)):
+                key = digests.get(id(node))
+            else:
+                return node
+            if key is not None:
+                if key in self._refs:
+                    return {"$ref": self._refs[key]}
+                if counts[key] > 1 and len(self._refs) < MAX_WIRE_REFS:
+                    ref = self._refs[key] = len(self._refs)
+                    refs[str(ref)] = _structure(node)
+                    return {"$ref": ref}
+            return _structure(node)
+
+        def _row(spec: list[Any], row: dict[str, Any]) -> list[Any]:
+            return [
+                _row(col[1], row[col[0]]) if isinstance(col, list) else _encode(row[col])
+                for col in spec
+            ]
+
+        def _cells(spec: list[Any], row: dict[str, Any]) -> list[Any]:
+            return [
+                _cells(col[1], row[col[0]]) if isinstance(col, list) else row[col] for col in spec
+            ]
+
+        def _structure(node: Any) -> Any:
+            if isinstance(node, list):
+                table = index.tables.get(id(node))
+                if table is not None:
+                    return {"$cols": table, "$rows": [_cells(table, row) for row in node]}
+                spec = None if any(_shared(row) for row in node) else _columns(node)
+                if spec:
+                    return {"$cols": spec, "$rows": [_row(spec, row) for row in node]}
+                return [_encode(child) for child in node]
+            if isinstance(node, dict):
+                encoded = {key: _encode(value) for key, value in node.items()}
+                return {"$lit": encoded} if _RESERVED.intersection(node) else encoded
+            return node
+
+        tree = _structure(components)
+        return {"$wire": WIRE_VERSION, "session": self.session, "refs": refs, "tree": tree}
+
+
+def decode(payload: dict[str, Any], refs: Optional[dict[str, Any]] = None) -> Any:
+    """Decode a compact payload; pass the same refs dict across turns of a session."""
+    known = refs if refs is not None else {}
+    known.update(payload.get("refs", {}))
+    resolved: dict[str, Any] = {}
+
+    def _ref(ref: Any) -> Any:
+        key = str(ref)
+        if key not in resolved:
+            resolved[key] = _decode(known[key])
+        return resolved[key]
+
+    def _row(spec: list[Any], row: list[Any]) -> dict[str, Any]:
+        decoded = {}
+        for col, value in zip(spec, row):
+            if isinstance(col, list):
+                decoded[col[0]] = _row(col[1], value)
+            else:
+                decoded[col] = _decode(value)
+        return decoded
+
+    def _decode(node: Any) -> Any:
+        if isinstance(node, list):
+            return [_decode(child) for child in node]
+        if not isinstance(node, dict):
+            return node
+        if "$ref" in node and len(node) == 1:
+            return _ref(node["$ref"])
+        if "$cols" in node and "$rows" in node:
+            return [_row(node["$cols"], row) for row in node["$rows"]]
+        if "$lit" in node and len(node) == 1:
+            return {key: _decode(value) for key, value in node["$lit"].items()}
+        return {key: _decode(value) for key, value in node.items()}
+
+    return _decode(payload["tree"])
@@ -196,6 +196,62 @@ async def test_streaming_with_callback_integration():
     assert callback.id in component_event["data"]["callback_url"]
 
 
+@pytest.mark.asyncio
+async def test_callback_at_capacity_is_not_offered():
+    """A full callback server yields non-interactive components and ends the turn cleanly."""
+    from unittest.mock import patch
+
+    async def stream_agent(q: str):
+        yield "Content"
+
+    callback = Http(id="full-cb")
+    wrapped = ai(
+        stream_agent,
+        llm=StubLLM('[{"type": "markdown", "data": {"content": "x"}}]'),
+        callback=callback,
+    )
+    with patch.object(callback._server, "max_pending", 0):
+        with patch("agentinterface.callback.count") as counted:
+            events = [evt async for evt in wrapped("query")]
+
+    component = events[-1]
+    assert component["type"] == "component"
+    assert "callback_url" not in component["data"]
+    assert "full-cb" not in callback._server.callbacks
+    counted.assert_any_call("callback.rejected")
+
+
+@pytest.mark.asyncio
+async def test_interaction_sent_before_the_wait_is_kept():
+    """The callback is registered before its URL goes out, so a fast click is not lost."""
+    queries = []
+
+    async def stream_agent(query: str):
+        queries.append(query)
+        yield "Content"
+
+    callback = Http(id="early-cb")
+    result = ai(
+        stream_agent,
+        llm=StubLLM('[{"type": "markdown", "data": {"content": "x"}}]'),
+        callback=callback,
+        timeout=1,
+    )("query")
+    try:
+        async for evt in result:
+            if isinstance(evt, dict) and evt.get("type") == "component":
+                break
+        assert callback._server.deliver("early-cb", {"action": "select", "data": "North"})
+        async for evt in result:
+            if isinstance(evt, dict) and evt.get("type") == "component":
+                break
+    finally:
+        await result.aclose()
+
+    assert len(queries) == 2 and "North" in queries[1]
+    assert "early-cb" not in callback._server.callbacks
+
+
 @pytest.mark.asyncio
 async def test_streaming_callback_continuation_preserves_kwargs():
     """Continuation call retains original keyword arguments."""
@@ -238,6 +294,193 @@ async def test_streaming_callback_continuation_preserves_kwargs():
     assert any(isinstance(evt, dict) and evt.get("type") == "component" for evt in events)
 
 
+@pytest.mark.asyncio
+async def test_streaming_page_size_ships_first_page():
+    """page_size truncates large tables in the component event to a first page."""
+
+    async def stream_agent(q: str):
+        yield "Rows"
+
+    items = [{"id": str(i), "name": f"row{i}", "attributes": {}} for i in range(30)]
+    table = {"type": "table", "data": {"attributes": [], "items": items}}
+
+    class PagingCallback:
+        def endpoint(self) -> str:
+            return "stub://callback"
+
+        async def await_interaction(self, timeout: int = 300) -> dict:
+            raise asyncio.TimeoutError()
+
+        def paginate(self, components, page_size):
+            data = {**components[0]["data"], "items": items[:page_size], "page": {"total": 30}}
+            return [{**components[0], "data": data}]
+
+    wrapped = ai(
+        stream_agent, llm=StubLLM(json.dumps([table])), callback=PagingCallback(), page_size=5
+    )
+    events = [evt async for evt in wrapped("query")]
+
+    component = events[-1]["data"]["components"][0]["data"]
+    assert len(component["items"]) == 5
+    assert component["page"]["total"] == 30
+
+
+@pytest.mark.asyncio
+async def test_streaming_compact_encoding_round_trips():
+    """encoding="compact" emits a wire payload that decodes to the shaped tree."""
+    from agentinterface.canonical import etag
+    from agentinterface.wire import decode
+
+    async def stream_agent(q: str):
+        yield "Content"
+
+    tree = [{"type": "markdown", "data": {"content": "x"}}]
+    wrapped = ai(stream_agent, llm=StubLLM(json.dumps(tree)), encoding="compact")
+    events = [evt async for evt in wrapped("query")]
+
+    payload = events[-1]["data"]["components"]
+    assert payload["$wire"] == 1
+    assert decode(payload) == tree
+    assert events[-1]["data"]["etag"] == etag(tree)
+
+
+def test_unknown_encoding_rejected():
+    with pytest.raises(ValueError, match="Unknown encoding"):
+        ai(lambda q: q, llm=StubLLM("[]"), encoding="msgpack")
+
+
+@pytest.mark.asyncio
+async def test_incremental_continuation_reshapes_changed_sections_only():
+    """incremental=True reuses components for sections unchanged since the last turn."""
+    prompts = []
+
+    class SectionLLM:
+        async def generate(self, prompt: str) -> str:
+            prompts.append(prompt)
+            tree = '[{"type": "markdown", "data": {"content": "x"}}]'
+            if "[s1]" in prompt:
+                return f'{{"s0": {tree}, "s1": {tree}}}'
+            return tree
+
+    async def stream_agent(query: str):
+        yield "Shared summary paragraph\n\n"
+        yield f"Detail for {query.splitlines()[-1]}"
+
+    class OnceCallback:
+        def __init__(self):
+            self.calls = 0
+
+        def endpoint(self) -> str:
+            return "stub://callback"
+
+        async def await_interaction(self, timeout: int = 300) -> dict:
+            self.calls += 1
+            if self.calls > 1:
+                raise asyncio.TimeoutError()
+            return {"action": "select", "data": "North"}
+
+    wrapped = ai(stream_agent, llm=SectionLLM(), callback=OnceCallback(), incremental=True)
+    events = [evt async for evt in wrapped("Initial")]
+
+    assert len([e for e in events if isinstance(e, dict) and e.get("type") == "component"]) == 2
+    assert len(prompts) == 2  # both sections in one call, then only the changed one
+    assert sum("Shared summary" in prompt for prompt in prompts) == 1
+    assert "Detail for User selected: North" in prompts[1]
+
+
+@pytest.mark.asyncio
+async def test_delta_continuation_emits_component_patch():
+    """delta=True sends a JSON patch against the previous tree on continuation turns."""
+    from agentinterface.patch import apply
+
+    turns = iter(["First", "Second"])
+    trees = [
+        [
+            {"type": "card", "data": {"title": "Revenue", "value": "$5M"}},
+            {"type": "markdown", "data": {"content": "A long unchanged summary paragraph."}},
+        ],
+        [
+            {"type": "card", "data": {"title": "Revenue", "value": "$6M"}},
+            {"type": "markdown", "data": {"content": "A long unchanged summary paragraph."}},
+        ],
+    ]
+
+    class TurnLLM:
+        def __init__(self):
+            self.turn = 0
+
+        async def generate(self, prompt: str) -> str:
+            self.turn += 1
+            return json.dumps(trees[self.turn - 1])
+
+    async def stream_agent(query: str):
+        yield next(turns)
+
+    class OnceCallback:
+        def __init__(self):
+            self.calls = 0
+
+        def endpoint(self) -> str:
+            return "stub://callback"
+
+        async def await_interaction(self, timeout: int = 300) -> dict:
+            self.calls += 1
+            if self.calls > 1:
+                raise asyncio.TimeoutError()
+            return {"action": "select", "data": "Refresh"}
+
+    wrapped = ai(stream_agent, llm=TurnLLM(), callback=OnceCallback(), delta=True)
+    events = [evt async for evt in wrapped("query")]
+
+    full = next(e for e in events if isinstance(e, dict) and e.get("type") == "component")
+    patch = next(e for e in events if isinstance(e, dict) and e.get("type") == "component_patch")
+    assert patch["data"]["base"] == full["data"]["etag"]
+    assert patch["data"]["callback_url"] == "stub://callback"
+    assert apply(full["data"]["components"], patch["data"]["patch"]) == trees[1]
+
+
+@pytest.mark.asyncio
+async def test_long_session_keeps_constant_stack_depth():
+    """Continuation turns run in a flat loop rather than nested generators."""
+    import sys
+
+    depths = []
+
+    def _depth() -> int:
+        frame, depth = sys._getframe(1), 0
+        while frame:
+            frame, depth = frame.f_back, depth + 1
+        return depth
+
+    async def stream_agent(query: str):
+        depths.append(_depth())
+        yield "Turn"
+
+    class ManyTurns:
+        def __init__(self, turns: int):
+            self.remaining = turns
+
+        def endpoint(self) -> str:
+            return "stub://callback"
+
+        async def await_interaction(self, timeout: int = 300) -> dict:
+            if not self.remaining:
+                raise asyncio.TimeoutError()
+            self.remaining -= 1
+            return {"action": "select", "data": "next"}
+
+    wrapped = ai(
+        stream_agent,
+        llm=StubLLM('[{"type": "markdown", "data": {"content": "x"}}]'),
+        callback=ManyTurns(50),
+    )
+    events = [evt async for evt in wrapped("query")]
+
+    assert len(depths) == 51
+    assert len(set(depths)) == 1
+    assert len([e for e in events if isinstance(e, dict) and e.get("type") == "component"]) == 51
+
+
 @pytest.mark.asyncio
 async def test_rotator_integration_with_rate_limit():
     """ai() with rotation handles rate limit signal."""
@@ -336,3 +579,378 @@ async def test_ai_timeout_with_callback_logs_warning():
         events.append(evt)
 
     assert len(events) > 0
+
+
+@pytest.mark.asyncio
+async def test_detached_session_ends_stream_and_resumes_by_id():
+    """With a session store the stream ends after components; resume() runs the next turn."""
+    from agentinterface import SessionStore
+
+    queries = []
+
+    async def stream_agent(query: str):
+        queries.append(query)
+        yield "Turn"
+
+    class NeverCalled:
+        def endpoint(self) -> str:
+            return "stub://callback"
+
+        async def await_interaction(self, timeout: int = 300) -> dict:
+            raise AssertionError("detached sessions must not park on the callback")
+
+    sessions = SessionStore()
+    wrapped = ai(
+        stream_agent,
+        llm=StubLLM('[{"type": "markdown", "data": {"content": "x"}}]'),
+        callback=NeverCalled(),
+        sessions=sessions,
+    )
+    first = [evt async for evt in wrapped("Initial query")]
+    session_id = first[-1]["data"]["session_id"]
+    assert session_id in sessions
+
+    second = [evt async for evt in wrapped.resume(session_id, {"action": "select", "data": "A"})]
+    assert second[-1]["data"]["session_id"] == session_id
+    assert queries[1] == "Initial query\n\nUser selected: A"
+
+    with pytest.raises(KeyError):
+        wrapped.resume("missing", {"action": "select", "data": "A"})
+
+
+def test_resume_requires_session_store():
+    wrapped = ai(lambda q: q, llm=StubLLM("[]"))
+    with pytest.raises(ValueError):
+        wrapped.resume("any", {"action": "select", "data": "A"})
+
+
+@pytest.mark.asyncio
+async def test_prefetch_serves_matching_choice_without_rerunning_agent():
+    """Likely choices run ahead; a matching interaction replays the prefetched turn."""
+    queries = []
+
+    async def stream_agent(query: str):
+        queries.append(query)
+        yield f"Answer to {query.splitlines()[-1]}"
+
+    suggestions = {
+        "type": "suggestions",
+        "data": {"suggestions": [{"text": "A", "priority": "high"}, {"text": "B"}, {"text": "C"}]},
+    }
+
+    class PickA:
+        def __init__(self):
+            self.picked = False
+
+        def endpoint(self) -> str:
+            return "stub://callback"
+
+        async def await_interaction(self, timeout: int = 300) -> dict:
+            if self.picked:
+                raise asyncio.TimeoutError()
+            self.picked = True
+            await asyncio.sleep(0.01)
+            return {"action": "select", "data": {"text": "A", "priority": "high"}}
+
+    wrapped = ai(stream_agent, llm=StubLLM(json.dumps([suggestions])), callback=PickA(), prefetch=2)
+    events = [evt async for evt in wrapped("Initial query")]
+
+    assert queries == [
+        "Initial query",
+        "Initial query\n\nUser selected: {'text': 'A', 'priority': 'high'}",
+        "Initial query\n\nUser selected: {'text': 'B'}",
+    ]
+    assert "Answer to User selected: {'text': 'A', 'priority': 'high'}" in events
+    assert len([e for e in events if isinstance(e, dict) and e.get("type") == "component"]) == 2
+
+
+def _orphans() -> list:
+    """Pending tasks other than the test itself."""
+    return [
+        task
+        for task in asyncio.all_tasks()
+        if task is not asyncio.current_task() and not task.done()
+    ]
+
+
+@pytest.mark.asyncio
+async def test_aclose_stops_agent_stream():
+    """Closing the wrapper closes the agent stream instead of leaving it suspended."""
+    closed = []
+
+    async def stream_agent(query: str):
+        try:
+            yield "first"
+            yield "second"
+        finally:
+            closed.append(True)
+
+    stream = ai(stream_agent, llm=StubLLM("[]"))("query")
+    assert await stream.__anext__() == "first"
+    await stream.aclose()
+
+    assert closed == [True]
+
+
+@pytest.mark.asyncio
+async def test_cancel_during_shaping_cancels_llm_call():
+    """Cancelling the consumer cancels the in-flight shaping call."""
+    started, cancelled = asyncio.Event(), []
+
+    class HangingLLM:
+        async def generate(self, prompt: str) -> str:
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+    async def stream_agent(query: str):
+        yield "Text"
+
+    async def consume():
+        return [evt async for evt in ai(stream_agent, llm=HangingLLM())("query")]
+
+    task = asyncio.create_task(consume())
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert cancelled == [True]
+    assert _orphans() == []
+
+
+@pytest.mark.asyncio
+async def test_cancel_during_interaction_deregisters_callback_and_prefetch():
+    """Cancelling while waiting for the user removes the callback and speculative turns."""
+
+    async def stream_agent(query: str):
+        if "User selected" in query:
+            await asyncio.Event().wait()
+        yield "Text"
+
+    suggestions = {"type": "suggestions", "data": {"suggestions": [{"text": "A"}]}}
+    callback = Http(id="cancel-test")
+    wrapped = ai(
+        stream_agent, llm=StubLLM(json.dumps([suggestions])), callback=callback, prefetch=1
+    )
+
+    async def consume():
+        return [evt async for evt in wrapped("query")]
+
+    task = asyncio.create_task(consume())
+    while "cancel-test" not in callback._server.callbacks:
+        await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0.01)
+
+    assert "cancel-test" not in callback._server.callbacks
+    assert _orphans() == []
+
+
+@pytest.mark.asyncio
+async def test_deadline_stops_slow_agent_and_shapes_partial_output():
+    """A streaming turn past its deadline stops the agent and still emits components."""
+
+    async def stream_agent(query: str):
+        yield "Partial"
+        await asyncio.sleep(10)
+        yield "never"
+
+    wrapped = ai(stream_agent, llm=StubLLM("[]"), deadline=0.05)
+    events = await asyncio.wait_for(_collect(wrapped("query")), timeout=1)
+
+    assert events[0] == "Partial"
+    assert "never" not in events
+    assert events[-1]["type"] == "component"
+
+
+@pytest.mark.asyncio
+async def test_deadline_falls_back_to_markdown_when_shaping_is_slow():
+    class HangingLLM:
+        async def generate(self, prompt: str) -> str:
+            await asyncio.Event().wait()
+
+    async def agent(query: str) -> str:
+        return "Answer"
+
+    text, components = await asyncio.wait_for(
+        ai(agent, llm=HangingLLM(), deadline=0.05)("query"), timeout=1
+    )
+
+    assert text == "Answer"
+    assert components == [{"type": "markdown", "data": {"content": "Answer"}}]
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_async_agent():
+    async def agent(query: str) -> str:
+        await asyncio.sleep(10)
+        return "late"
+
+    with pytest.raises(asyncio.TimeoutError):
+        await ai(agent, llm=StubLLM("[]"), deadline=0.05)("query")
+
+
+async def _collect(stream) -> list:
+    return [evt async for evt in stream]
+
+
+@pytest.mark.asyncio
+async def test_progressive_emits_markdown_then_shaped_tree():
+    """Progressive mode shows the markdown fallback first, then replaces it."""
+    card = {"type": "card", "data": {"title": "Revenue"}}
+
+    async def stream_agent(query: str):
+        yield "Revenue is up"
+
+    events = [
+        evt
+        async for evt in ai(stream_agent, llm=StubLLM(json.dumps([card])), progressive=True)(
+            "query"
+        )
+    ]
+    provisional, final = events[1], events[2]
+
+    assert provisional["data"]["provisional"] is True
+    assert provisional["data"]["components"] == [
+        {"type": "markdown", "data": {"content": "Revenue is up"}}
+    ]
+    assert final["data"]["components"] == [card]
+    assert "provisional" not in final["data"]
+
+
+@pytest.mark.asyncio
+async def test_progressive_confirms_markdown_when_shaping_falls_back():
+    """Every provisional tree is followed by its replacement, even an identical one."""
+
+    async def stream_agent(query: str):
+        yield "Plain text"
+
+    wrapped = ai(stream_agent, llm=StubLLM("not json"), progressive=True)
+    events = [evt async for evt in wrapped("query")]
+
+    assert len(events) == 3
+    assert events[1]["data"]["provisional"] is True
+    assert "provisional" not in events[2]["data"]
+    assert events[2]["data"]["components"] == events[1]["data"]["components"]
+
+
+@pytest.mark.asyncio
+async def test_progressive_replacement_is_an_empty_patch_under_delta():
+    async def stream_agent(query: str):
+        yield "Plain text"
+
+    wrapped = ai(stream_agent, llm=StubLLM("not json"), progressive=True, delta=True)
+    events = [evt async for evt in wrapped("query")]
+
+    assert events[2]["type"] == "component_patch"
+    assert events[2]["data"]["patch"] == []
+
+
+@pytest.mark.asyncio
+async def test_progressive_disabled_when_markdown_not_allowed():
+    async def stream_agent(query: str):
+        yield "Revenue"
+
+    card = {"type": "card", "data": {"title": "Revenue"}}
+    wrapped = ai(
+        stream_agent, llm=StubLLM(json.dumps([card])), components=["card"], progressive=True
+    )
+    events = [evt async for evt in wrapped("query")]
+
+    assert len(events) == 2
+    assert events[1]["data"]["components"] == [card]
+
+
+@pytest.mark.asyncio
+async def test_pool_keeps_event_loop_responsive_for_blocking_agent():
+    """A blocking sync agent in a pool does not stall other coroutines."""
+    import time
+
+    from agentinterface import AgentPool
+
+    def blocking_agent(query: str) -> str:
+        time.sleep(0.2)
+        return "Done"
+
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    pool = AgentPool(max_workers=1)
+    ticking = asyncio.create_task(ticker())
+    try:
+        text, components = await ai(blocking_agent, llm=StubLLM("[]"), pool=pool)("query")
+    finally:
+        ticking.cancel()
+        pool.shutdown()
+
+    assert text == "Done"
+    assert components == []
+    assert len(ticks) > 5
+
+
+@pytest.mark.asyncio
+async def test_pool_rejects_sync_factory_returning_a_stream():
+    """A stream from a pooled sync agent is an error, not shaped as its repr."""
+    from agentinterface import AgentPool
+
+    async def events():
+        yield {"type": "text", "content": "Hello"}
+
+    stream = events()
+
+    def factory(query: str):
+        return stream
+
+    pool = AgentPool(max_workers=1)
+    try:
+        with pytest.raises(TypeError, match="returned a stream"):
+            await ai(factory, llm=StubLLM("[]"), pool=pool)("query")
+    finally:
+        pool.shutdown()
+    assert stream.ag_frame is None  # closed, not left pending
+
+
+@pytest.mark.asyncio
+async def test_socket_carries_components_and_interactions_on_one_connection():
+    """Socket.serve streams events out and reads interactions back over one duplex pipe."""
+    from agentinterface import Socket
+
+    async def stream_agent(query: str):
+        yield f"Answer for {query.splitlines()[-1]}"
+
+    inbound: asyncio.Queue = asyncio.Queue()
+    sent = []
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+        if len(sent) == 2:
+            await inbound.put({"id": "conn", "action": "select", "data": "North"})
+            await inbound.put({"id": "conn", "action": "select", "data": "Stale"})
+        elif len(sent) == 4:
+            await inbound.put(ConnectionError("client left"))
+
+    async def receive() -> dict:
+        message = await inbound.get()
+        if isinstance(message, Exception):
+            raise message
+        return message
+
+    socket = Socket(send, id="conn")
+    wrapped = ai(stream_agent, llm=StubLLM("[]"), callback=socket)
+    await asyncio.wait_for(socket.serve(wrapped("Initial"), receive), 1)
+
+    components = [m for m in sent if isinstance(m, dict) and m.get("type") == "component"]
+    assert len(components) == 2
+    assert components[0]["data"]["callback_url"] == "socket:conn"
+    assert "North" in sent[2]
+    assert not any("Stale" in str(message) for message in sent)
@@ -5,7 +5,7 @@ from unittest.mock import patch
 
 import pytest
 
-from agentinterface.callback import Callback, Http, _get_shared_server
+from agentinterface.callback import ABANDONED_CALLBACK_TIMEOUT, Callback, Http, _get_shared_server
 
 
 def test_callback_protocol():
@@ -121,39 +121,293 @@ async def test_concurrent_callback_registration():
 
 
 @pytest.mark.asyncio
-async def test_callback_cleanup_abandoned():
-    callback = Http(id="test-cleanup", port=8123)
+async def test_callback_expires_at_deadline():
     server = _get_shared_server(port=8123)
+    loop = asyncio.get_running_loop()
 
-    # Start interaction to register
-    _interaction_task = asyncio.create_task(callback.await_interaction(timeout=0.5))
-    await asyncio.sleep(0.01)
-
-    # Now should be registered
+    # Abandoned entry: nobody awaits the future
+    future = loop.create_future()
+    server.register("test-cleanup", future, ttl=0.05)
     assert "test-cleanup" in server.callbacks
 
-    # Modify timestamp to appear abandoned
-    _loop, future = server.callbacks["test-cleanup"]
-    future._created_at = asyncio.get_event_loop().time() - 700  # 11+ minutes ago
-
-    # Run one iteration of cleanup manually (avoid infinite loop)
-    current_time = asyncio.get_event_loop().time()
-    abandoned = []
-
-    for callback_id, (_cb_loop, cb_future) in server.callbacks.items():
-        if (
-            not cb_future.done()
-            and hasattr(cb_future, "_created_at")
-            and current_time - cb_future._created_at > 600
-        ):
-            abandoned.append(callback_id)
-
-    for callback_id in abandoned:
-        entry = server.callbacks.pop(callback_id, None)
-        if entry:
-            cb_loop, cb_future = entry
-            if not cb_future.done():
-                cb_loop.call_soon_threadsafe(cb_future.cancel)
-
-    # Should be cleaned up due to age
+    await asyncio.sleep(0.1)
+
+    # Removed and timed out at its own deadline, without a sweep
     assert "test-cleanup" not in server.callbacks
+    assert isinstance(future.exception(), asyncio.TimeoutError)
+
+
+@pytest.mark.asyncio
+async def test_callback_deadline_is_the_interaction_timeout():
+    """Timeouts over the abandoned-callback cap are honoured, not clipped."""
+    server = _get_shared_server(port=8123)
+    loop = asyncio.get_running_loop()
+
+    server.register("long-wait", loop.create_future(), ttl=3600)
+    server.register("no-ttl", loop.create_future())
+    try:
+        assert server._expiry["long-wait"].when() - loop.time() > 3500
+        assert server._expiry["no-ttl"].when() - loop.time() <= ABANDONED_CALLBACK_TIMEOUT
+    finally:
+        server.unregister("long-wait")
+        server.unregister("no-ttl")
+
+
+@pytest.mark.asyncio
+async def test_pending_callbacks_capacity_rejects_excess():
+    server = _get_shared_server(port=8123)
+    loop = asyncio.get_running_loop()
+
+    with patch.object(server, "max_pending", len(server.callbacks) + 1):
+        server.register("cap-1", loop.create_future(), ttl=1)
+        with pytest.raises(RuntimeError):
+            await Http(id="cap-2", port=8123).await_interaction(timeout=1)
+
+        # Re-registering an existing id replaces rather than grows
+        server.register("cap-1", loop.create_future(), ttl=1)
+
+    server.unregister("cap-1")
+    assert "cap-1" not in server.callbacks
+    assert "cap-1" not in server._expiry
+
+
+@pytest.mark.asyncio
+async def test_mounted_callback_app_resolves_on_host_loop():
+    """mount() serves callbacks inside the host app without a server thread."""
+    import threading
+
+    httpx = pytest.importorskip("httpx")
+    from agentinterface.callback import _servers, mount
+
+    threads = threading.active_count()
+    ports = set(_servers)
+    app = mount("https://api.example.com/ai/")
+    callback = Http(id="mounted", base_url="https://api.example.com/ai")
+
+    assert callback.endpoint() == "https://api.example.com/ai/callback/mounted"
+    assert set(_servers) == ports
+    assert threading.active_count() == threads
+
+    interaction = asyncio.create_task(callback.await_interaction(timeout=1))
+    await asyncio.sleep(0)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/callback/mounted", json={"action": "select", "data": "A"})
+
+    assert response.json() == {"status": "continued"}
+    assert await interaction == {"action": "select", "data": "A"}
+    assert "mounted" not in callback._server.callbacks
+
+
+@pytest.mark.asyncio
+async def test_asyncio_backend_resolves_interaction_without_fastapi():
+    """backend="asyncio" serves callbacks from the caller's loop."""
+    import socket
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    callback = Http(id="lite", port=port, backend="asyncio")
+    interaction = asyncio.create_task(callback.await_interaction(timeout=1))
+    while "lite" not in callback._server.callbacks:
+        await asyncio.sleep(0.01)
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = b'{"action": "select", "data": "A"}'
+    writer.write(
+        b"POST /callback/lite HTTP/1.1\r\nContent-Type: application/json\r\n"
+        b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+    )
+    await writer.drain()
+
+    assert await interaction == {"action": "select", "data": "A"}
+    assert (await reader.readline()).startswith(b"HTTP/1.1 200")
+    writer.close()
+    await writer.wait_closed()
+    await callback._server.close()
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(ValueError):
+        Http(port=port)
+
+
+@pytest.mark.asyncio
+async def test_broker_routes_interaction_to_owning_worker(tmp_path):
+    """A POST landing on a worker without the future is forwarded to its owner."""
+    from agentinterface.broker import UnixSocketBroker
+    from agentinterface.callback import _AsyncioCallbackServer
+
+    def worker(name: str) -> _AsyncioCallbackServer:
+        broker = UnixSocketBroker(str(tmp_path))
+        broker.socket_path = broker.directory / f"worker-{name}.sock"
+        return _AsyncioCallbackServer(port=0, broker=broker)
+
+    owner, other = worker("a"), worker("b")
+    await owner.broker.start(owner.deliver)
+    await other.broker.start(other.deliver)
+    try:
+        future = asyncio.get_running_loop().create_future()
+        owner.register("routed", future, ttl=1)
+
+        status, payload = await other.handle(
+            "POST", "/callback/routed", {}, {"action": "select", "data": "A"}
+        )
+        assert (status, payload) == (200, {"status": "continued"})
+        assert await asyncio.wait_for(future, 1) == {"action": "select", "data": "A"}
+
+        owner.unregister("routed")
+        status, payload = await other.handle("POST", "/callback/routed", {}, {})
+        assert (status, payload) == (404, {"status": "expired"})
+    finally:
+        await owner.broker.close()
+        await other.broker.close()
+
+
+@pytest.mark.asyncio
+async def test_broker_routes_page_reads_to_owning_worker(tmp_path):
+    """With SO_REUSEPORT a page GET can land on any worker; it is read from the owner."""
+    from agentinterface.broker import UnixSocketBroker
+    from agentinterface.callback import _AsyncioCallbackServer
+
+    def worker(name: str) -> _AsyncioCallbackServer:
+        broker = UnixSocketBroker(str(tmp_path))
+        broker.socket_path = broker.directory / f"worker-{name}.sock"
+        return _AsyncioCallbackServer(port=0, broker=broker)
+
+    owner, other = worker("a"), worker("b")
+    await owner.broker.start(owner.deliver, owner.pages.get)
+    await other.broker.start(other.deliver, other.pages.get)
+    try:
+        handle = owner.store_page(list(range(120)))
+        status, page = await other.handle("GET", f"/page/{handle}", {"offset": "100"}, None)
+        assert status == 200
+        assert page == {"items": list(range(100, 120)), "offset": 100, "total": 120}
+
+        with patch.object(owner.pages, "capacity", 1):
+            owner.store_page([])  # evicts the first dataset and releases its claim
+        assert await other.handle("GET", f"/page/{handle}", {}, None) == (
+            404,
+            {"status": "expired"},
+        )
+    finally:
+        await owner.broker.close()
+        await other.broker.close()
+
+
+@pytest.mark.asyncio
+async def test_broker_forwards_messages_larger_than_a_stream_buffer(tmp_path):
+    """Pages and interactions past asyncio's 64 KB line limit still cross workers."""
+    from agentinterface.broker import UnixSocketBroker
+    from agentinterface.callback import _AsyncioCallbackServer
+
+    def worker(name: str) -> _AsyncioCallbackServer:
+        broker = UnixSocketBroker(str(tmp_path))
+        broker.socket_path = broker.directory / f"worker-{name}.sock"
+        return _AsyncioCallbackServer(port=0, broker=broker)
+
+    owner, other = worker("a"), worker("b")
+    await owner.broker.start(owner.deliver, owner.pages.get)
+    await other.broker.start(other.deliver, other.pages.get)
+    try:
+        rows = [{"id": i, "name": f"Region {i}", "note": "x" * 200} for i in range(500)]
+        handle = owner.store_page(rows)
+        status, page = await other.handle("GET", f"/page/{handle}", {"limit": "500"}, None)
+        assert status == 200 and page["items"] == rows
+
+        future = asyncio.get_running_loop().create_future()
+        owner.register("large", future, ttl=1)
+        interaction = {"action": "submit", "data": {"text": "y" * 100_000}}
+        assert await other.broker.forward("large", interaction) is True
+        assert await asyncio.wait_for(future, 1) == interaction
+    finally:
+        await owner.broker.close()
+        await other.broker.close()
+
+
+@pytest.mark.asyncio
+async def test_page_miss_under_callback_only_broker_is_explicit():
+    from agentinterface.callback import _AsyncioCallbackServer
+
+    class CallbackBroker:
+        async def start(self, deliver):
+            pass
+
+        def claim(self, callback_id):
+            pass
+
+        def release(self, callback_id):
+            pass
+
+        async def forward(self, callback_id, interaction):
+            return False
+
+    server = _AsyncioCallbackServer(port=0, broker=CallbackBroker())
+    status, payload = await server.handle("GET", "/page/elsewhere", {}, None)
+    assert status == 501 and payload["status"] == "unroutable"
+
+
+def test_mount_accepts_the_callbacks_broker(tmp_path):
+    from agentinterface.broker import UnixSocketBroker
+    from agentinterface.callback import mount
+
+    broker = UnixSocketBroker(str(tmp_path))
+    mount("https://workers.example.com/ai", broker=broker)
+    callback = Http(base_url="https://workers.example.com/ai", broker=broker)
+    assert callback._server.broker is broker
+
+    with pytest.raises(ValueError, match="different broker"):
+        Http(base_url="https://workers.example.com/ai", broker=UnixSocketBroker(str(tmp_path)))
+
+
+def test_callbacks_across_threaded_event_loops():
+    """Many loops in many threads share one server; each interaction resolves on its own loop."""
+    import threading
+    import time
+
+    from agentinterface.callback import _servers
+
+    threads, per_thread = 8, 40
+    barrier = threading.Barrier(threads)
+    servers, results, errors = [], [], []
+    done = threading.Event()
+
+    async def worker(n: int) -> None:
+        callbacks = [Http(id=f"stress-{n}-{i}", port=8131) for i in range(per_thread)]
+        servers.extend(cb._server for cb in callbacks[:1])
+        got = await asyncio.gather(*(cb.await_interaction(timeout=5) for cb in callbacks))
+        results.extend(item["data"] for item in got)
+
+    def run(n: int) -> None:
+        barrier.wait()
+        try:
+            asyncio.run(worker(n))
+        except Exception as e:  # surfaced by the assertions below
+            errors.append(e)
+
+    def resolver() -> None:
+        while not done.is_set():
+            server = _servers.get(8131)
+            if server is not None:
+                for callback_id in list(server.callbacks):
+                    server.deliver(callback_id, {"action": "select", "data": callback_id})
+            time.sleep(0.001)
+
+    pool = [threading.Thread(target=run, args=(n,)) for n in range(threads)]
+    routing = threading.Thread(target=resolver)
+    routing.start()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join(10)
+    done.set()
+    routing.join()
+
+    assert errors == []
+    assert len({id(server) for server in servers}) == 1
+    assert sorted(results) == sorted(
+        f"stress-{n}-{i}" for n in range(threads) for i in range(per_thread)
+    )
+    assert servers[0].callbacks == {}
+    assert servers[0]._expiry == {}
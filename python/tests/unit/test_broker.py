@@ -0,0 +1,68 @@
+"""Broker tests - ownership claims, forwarding between workers."""
+
+import pytest
+
+from agentinterface.broker import Broker, PageBroker, UnixSocketBroker, page_id
+
+
+def _worker(directory, name: str) -> UnixSocketBroker:
+    broker = UnixSocketBroker(str(directory))
+    broker.socket_path = broker.directory / f"worker-{name}.sock"
+    return broker
+
+
+def test_unix_socket_broker_implements_protocol(tmp_path):
+    assert isinstance(UnixSocketBroker(str(tmp_path)), Broker)
+    assert isinstance(UnixSocketBroker(str(tmp_path)), PageBroker)
+
+
+@pytest.mark.asyncio
+async def test_forward_reaches_owning_worker(tmp_path):
+    delivered = []
+    owner, other = _worker(tmp_path, "a"), _worker(tmp_path, "b")
+    await owner.start(lambda cid, interaction: delivered.append((cid, interaction)) or True)
+    await other.start(lambda cid, interaction: False)
+    try:
+        owner.claim("cb-1")
+        assert await other.forward("cb-1", {"action": "select", "data": "A"})
+        assert delivered == [("cb-1", {"action": "select", "data": "A"})]
+
+        assert not await other.forward("unknown", {"action": "select", "data": "A"})
+
+        other.release("cb-1")
+        assert await other.forward("cb-1", {"action": "select", "data": "B"})
+        owner.release("cb-1")
+        assert not await other.forward("cb-1", {"action": "select", "data": "C"})
+    finally:
+        await owner.close()
+        await other.close()
+
+
+@pytest.mark.asyncio
+async def test_forward_to_dead_worker_fails(tmp_path):
+    owner, other = _worker(tmp_path, "a"), _worker(tmp_path, "b")
+    await owner.start(lambda cid, interaction: True)
+    owner.claim("cb-1")
+    await owner.close()
+
+    assert not await other.forward("cb-1", {"action": "select", "data": "A"})
+
+
+@pytest.mark.asyncio
+async def test_fetch_reads_page_from_owning_worker(tmp_path):
+    pages = {"h1": {"items": [1, 2], "offset": 0, "total": 2}}
+    owner, other = _worker(tmp_path, "a"), _worker(tmp_path, "b")
+    await owner.start(lambda cid, interaction: False, lambda handle, o, n: pages.get(handle))
+    await other.start(lambda cid, interaction: False)
+    try:
+        owner.claim(page_id("h1"))
+        assert await other.fetch("h1", 0, 50) == pages["h1"]
+        assert not await other.forward("h1", {"action": "select", "data": "A"})
+
+        del pages["h1"]
+        assert await other.fetch("h1", 0, 50) is None
+        owner.release(page_id("h1"))
+        assert await other.fetch("h1", 0, 50) is None
+    finally:
+        await owner.close()
+        await other.close()
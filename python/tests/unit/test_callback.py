@@ -3,11 +3,11 @@
 import asyncio
 import contextlib
 import os
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from agentinterface.callback import Callback, Http
+from agentinterface.callback import Callback, Http, Socket, _PageStore
 
 
 def test_http_has_endpoint():
@@ -113,3 +113,97 @@ def test_incomplete_callback_not_recognized():
             return "incomplete://endpoint"
 
     assert not isinstance(IncompleteCallback(), Callback)
+
+
+def test_page_store_slices_items():
+    """Page store serves slices with total count."""
+    store = _PageStore()
+    handle = store.put(list(range(10)))
+    assert store.get(handle, 4, 3) == {"items": [4, 5, 6], "offset": 4, "total": 10}
+    assert store.get("missing", 0, 3) is None
+
+
+def test_page_store_evicts_least_recently_used():
+    """Page store stays within capacity."""
+    store = _PageStore(capacity=2)
+    first = store.put([1])
+    second = store.put([2])
+    store.get(first, 0, 1)
+    store.put([3])
+    assert len(store) == 2
+    assert store.get(second, 0, 1) is None
+    assert store.get(first, 0, 1) is not None
+
+
+def test_page_store_expires_entries():
+    """Page store drops entries past their TTL."""
+    store = _PageStore(ttl=0)
+    handle = store.put([1, 2])
+    assert store.get(handle, 0, 1) is None
+
+
+def test_http_paginate_truncates_large_fields():
+    """paginate() ships the first page and a handle for the rest."""
+    callback = Http(id="page-test")
+    table = {
+        "type": "table",
+        "data": {
+            "attributes": [],
+            "items": [{"id": str(i), "name": str(i), "attributes": {}} for i in range(25)],
+        },
+    }
+    nested = {"type": "card", "data": {"title": "Wrapper", "content": [table]}}
+
+    paged = callback.paginate([nested, [table]], page_size=10)
+
+    inner = paged[0]["data"]["content"][0]["data"]
+    assert len(inner["items"]) == 10
+    assert inner["page"]["total"] == 25
+    assert inner["page"]["field"] == "items"
+    assert len(paged[1][0]["data"]["items"]) == 10
+    assert len(table["data"]["items"]) == 25
+
+    handle = inner["page"]["url"].rsplit("/", 1)[1]
+    rest = callback._server.pages.get(handle, 10, 50)
+    assert [item["id"] for item in rest["items"]] == [str(i) for i in range(10, 25)]
+
+
+def test_http_paginate_leaves_small_fields():
+    """paginate() leaves data under the page size untouched."""
+    callback = Http(id="small-page")
+    timeline = {"type": "timeline", "data": {"events": [{"date": "d", "title": "t"}]}}
+    assert callback.paginate([timeline], page_size=10) == [timeline]
+
+
+@pytest.mark.asyncio
+async def test_socket_queues_interactions_for_its_id():
+    """Socket normalizes client messages and ignores ones addressed elsewhere."""
+    socket = Socket(AsyncMock(), id="sock")
+    assert isinstance(socket, Callback)
+    assert socket.endpoint() == "socket:sock"
+
+    socket.arm()
+    assert not socket.receive({"id": "other", "action": "select", "data": "X"})
+    assert not socket.receive("not a message")
+    assert socket.receive({"id": "sock", "action": "select", "data": "A", "extra": 1})
+    assert await socket.await_interaction(timeout=1) == {"action": "select", "data": "A"}
+
+    waiting = asyncio.ensure_future(socket.await_interaction(timeout=1))
+    await asyncio.sleep(0)
+    assert socket.receive({"action": "select", "data": "B"})
+    assert await waiting == {"action": "select", "data": "B"}
+
+
+async def test_socket_drops_interactions_outside_a_turn():
+    """Clicks with no open turn, or after the turn's answer, never reach a later wait."""
+    socket = Socket(AsyncMock(), id="sock")
+
+    assert not socket.receive({"action": "select", "data": "early"})
+    socket.arm()
+    assert socket.receive({"action": "select", "data": "first"})
+    assert not socket.receive({"action": "select", "data": "double click"})
+
+    assert await socket.await_interaction(timeout=1) == {"action": "select", "data": "first"}
+    assert not socket.receive({"action": "select", "data": "stale"})
+    with pytest.raises(asyncio.TimeoutError):
+        await socket.await_interaction(timeout=0.01)
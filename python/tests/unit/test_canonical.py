@@ -0,0 +1,44 @@
+"""Canonical serialization tests - stability, backends, ETags."""
+
+import json
+from unittest.mock import patch
+
+from agentinterface import canonical
+
+TREE = [{"type": "card", "data": {"title": "Revenue", "value": "€5M", "tags": [1, 2.5, None]}}]
+
+
+def test_dumps_is_compact_and_sorted():
+    text = canonical.dumps({"b": 1, "a": [1, 2]})
+    assert text == '{"a":[1,2],"b":1}'
+
+
+def test_key_order_does_not_change_digest():
+    reordered = [
+        {"data": {"tags": [1, 2.5, None], "value": "€5M", "title": "Revenue"}, "type": "card"}
+    ]
+    assert canonical.digest(TREE) == canonical.digest(reordered)
+
+
+def test_content_change_changes_digest():
+    changed = [
+        {"type": "card", "data": {"title": "Revenue", "value": "$5M", "tags": [1, 2.5, None]}}
+    ]
+    assert canonical.digest(TREE) != canonical.digest(changed)
+
+
+def test_stdlib_backend_matches_orjson():
+    fast = canonical.dumpb(TREE)
+    with patch.object(canonical, "orjson", None):
+        assert canonical.dumpb(TREE) == fast
+    assert json.loads(fast) == TREE
+
+
+def test_unsupported_values_fall_back_to_stdlib():
+    assert canonical.dumps({1: "non-string key"}) == '{"1":"non-string key"}'
+
+
+def test_etag_is_quoted_digest_prefix():
+    tag = canonical.etag(TREE)
+    assert tag.startswith('"') and tag.endswith('"')
+    assert tag.strip('"') == canonical.digest(TREE)[:32]
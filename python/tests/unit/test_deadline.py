@@ -0,0 +1,30 @@
+"""Deadline tests - nesting, remaining time, bounded awaits."""
+
+import asyncio
+
+import pytest
+
+from agentinterface.deadline import bounded, expires_in, remaining, until
+
+
+def test_unbounded_by_default():
+    assert expires_in(None) is None
+    assert remaining() is None
+    with until(None):
+        assert remaining() is None
+
+
+def test_inner_deadline_never_loosens_outer():
+    with until(expires_in(1)):
+        with until(expires_in(60)):
+            assert remaining() <= 1
+        with until(expires_in(0.5)):
+            assert remaining() <= 0.5
+    assert remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_bounded_times_out():
+    assert await bounded(asyncio.sleep(0, result="done")) == "done"
+    with until(expires_in(0.01)), pytest.raises(asyncio.TimeoutError):
+        await bounded(asyncio.sleep(1))
@@ -0,0 +1,95 @@
+"""Continuation context tests - budget, compaction, summarization fallback."""
+
+import pytest
+
+from agentinterface.history import ContextWindow, estimate_tokens, selection_text
+
+
+class StubSummarizer:
+    def __init__(self, fail: bool = False):
+        self.prompts = []
+        self.fail = fail
+
+    async def generate(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        if self.fail:
+            raise RuntimeError("summarizer down")
+        return "User browsed several products"
+
+
+def test_selection_text_keeps_full_payload():
+    assert selection_text({"id": "row-5", "value": 42}) == "{'id': 'row-5', 'value': 42}"
+    assert selection_text("North") == "North"
+
+
+@pytest.mark.asyncio
+async def test_first_selection_matches_plain_continuation():
+    window = ContextWindow("Show sales")
+    assert await window.add("North") == "Show sales\n\nUser selected: North"
+
+
+@pytest.mark.asyncio
+async def test_history_includes_previous_selections():
+    window = ContextWindow("Show sales")
+    await window.add("North")
+    query = await window.add("Q3")
+
+    assert "Previously selected: North" in query
+    assert query.endswith("User selected: Q3")
+
+
+@pytest.mark.asyncio
+async def test_budget_holds_over_many_turns():
+    window = ContextWindow("Show sales", budget=60)
+    for turn in range(200):
+        query = await window.add(f"selection number {turn}")
+        assert estimate_tokens(query) <= 60
+
+    assert query.startswith("Show sales")
+    assert query.endswith("User selected: selection number 199")
+    assert "earlier selections omitted" in query
+
+
+@pytest.mark.asyncio
+async def test_dropped_selections_are_summarized():
+    summarizer = StubSummarizer()
+    window = ContextWindow("Show sales", budget=40, summarizer=summarizer)
+    for turn in range(20):
+        query = await window.add(f"product {turn}")
+
+    assert summarizer.prompts
+    assert "Earlier selections (summary): User browsed several products" in query
+    assert estimate_tokens(query) <= 40
+
+
+@pytest.mark.asyncio
+async def test_summarizer_failure_falls_back_to_dropping():
+    window = ContextWindow("Show sales", budget=30, summarizer=StubSummarizer(fail=True))
+    for turn in range(20):
+        query = await window.add(f"product {turn}")
+
+    assert "earlier selections omitted" in query
+    assert estimate_tokens(query) <= 30
+
+
+@pytest.mark.asyncio
+async def test_latest_selection_is_never_truncated():
+    """An oversized query or selection goes out whole rather than losing the user's choice."""
+    window = ContextWindow("q" * 4400)
+    query = await window.add({"title": "Option A"})
+    assert query.endswith("User selected: {'title': 'Option A'}")
+
+    window = ContextWindow("Show sales", budget=20)
+    query = await window.add("x" * 10_000)
+    assert query == "Show sales\n\nUser selected: " + "x" * 10_000
+
+
+@pytest.mark.asyncio
+async def test_history_under_budget_is_untouched():
+    window = ContextWindow("Show sales", summarizer=StubSummarizer())
+    await window.add({"id": "row-5", "value": 42})
+    query = await window.add("Q3")
+
+    assert window.omitted == 0
+    assert window.summarizer.prompts == []
+    assert "Previously selected: {'id': 'row-5', 'value': 42}" in query
@@ -0,0 +1,73 @@
+"""Incremental shaping tests - sectioning, cache reuse, partial failure."""
+
+import pytest
+
+from agentinterface.incremental import SectionCache, split_sections
+
+
+class CountingShaper:
+    def __init__(self, fail_on: str = ""):
+        self.calls = []
+        self.fail_on = fail_on
+
+    async def __call__(self, sections: list) -> list:
+        self.calls.append(sections)
+        if self.fail_on and any(self.fail_on in section for section in sections):
+            raise ValueError("shaper failed")
+        return [[{"type": "markdown", "data": {"content": section}}] for section in sections]
+
+
+def test_split_sections_on_paragraphs_and_headings():
+    text = "Intro line\n\nSecond para\n# Heading\nBody\n\n\n  \n"
+    assert split_sections(text) == ["Intro line", "Second para", "# Heading\nBody"]
+
+
+@pytest.mark.asyncio
+async def test_reshape_only_shapes_new_sections():
+    cache = SectionCache()
+    shaper = CountingShaper()
+
+    first = await cache.reshape("Alpha\n\nBeta", shaper)
+    second = await cache.reshape("Alpha\n\nBeta\n\nGamma", shaper)
+
+    assert shaper.calls == [["Alpha", "Beta"], ["Gamma"]]
+    assert [c["data"]["content"] for c in first] == ["Alpha", "Beta"]
+    assert [c["data"]["content"] for c in second] == ["Alpha", "Beta", "Gamma"]
+
+
+@pytest.mark.asyncio
+async def test_reshape_batches_changed_sections_in_order():
+    cache = SectionCache()
+    shaper = CountingShaper()
+    await cache.reshape("B\n\nD", shaper)
+
+    result = await cache.reshape("A\n\nD\n\nC\n\nB", shaper)
+    assert shaper.calls[-1] == ["A", "C"]
+    assert [c["data"]["content"] for c in result] == ["A", "D", "C", "B"]
+
+    assert await cache.reshape("D\n\nA", shaper) and len(shaper.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_reshape_caches_nothing_from_a_failed_batch():
+    cache = SectionCache()
+    shaper = CountingShaper(fail_on="Broken")
+
+    with pytest.raises(ValueError):
+        await cache.reshape("Good\n\nBroken", shaper)
+    assert len(cache) == 0
+
+    async def short(sections: list) -> list:
+        return [[]]
+
+    with pytest.raises(ValueError, match="1 trees for 2 sections"):
+        await cache.reshape("Good\n\nBroken", short)
+    assert len(cache) == 0
+
+
+def test_cache_is_bounded():
+    cache = SectionCache(capacity=2)
+    for key in "abc":
+        cache.put(key, [])
+    assert len(cache) == 2
+    assert cache.get("a") is None
@@ -1,11 +1,13 @@
 """LLM factory unit tests - rotation logic, key loading, provider contracts."""
 
+import asyncio
 import os
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from agentinterface.llms import LLM, Rotator, create_llm
+from agentinterface.deadline import expires_in, until
+from agentinterface.llms import LLM, Rotator, _timeout, create_llm, with_rotation
 
 
 class MockLLM(LLM):
@@ -199,3 +201,50 @@ def test_rotator_load_anthropic_alias():
     with patch.dict(os.environ, {"CLAUDE_API_KEY": "claude_key"}, clear=True):
         rot = Rotator("anthropic")
         assert rot.key == "claude_key"
+
+
+@pytest.mark.asyncio
+async def test_with_rotation_stops_at_deadline():
+    calls = []
+
+    async def slow(key: str) -> str:
+        calls.append(key)
+        await asyncio.sleep(1)
+        return "late"
+
+    with patch.dict(os.environ, {"SLOWSVC_API_KEY": "k1"}, clear=False):
+        with until(expires_in(0.01)), pytest.raises(asyncio.TimeoutError):
+            await with_rotation("slowsvc", slow)
+        with until(expires_in(0)), pytest.raises(asyncio.TimeoutError):
+            await with_rotation("slowsvc", slow)
+
+    assert calls == ["k1"]
+
+
+def test_timeout_kwargs_follow_deadline():
+    assert _timeout() == {}
+    with until(expires_in(5)):
+        assert 0 < _timeout()["timeout"] <= 5
+
+
+def test_rotator_shared_across_threads():
+    """Concurrent first use creates one rotator per service."""
+    import threading
+
+    from agentinterface import llms
+
+    barrier = threading.Barrier(16)
+    seen = []
+
+    def grab():
+        barrier.wait()
+        seen.append(llms._rotator("stress-service"))
+
+    threads = [threading.Thread(target=grab) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(rotator) for rotator in seen}) == 1
+    llms._rotators.pop("STRESS-SERVICE", None)
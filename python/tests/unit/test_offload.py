@@ -0,0 +1,114 @@
+"""Agent pool tests - async detection, offload, queue bounds, stats."""
+
+import asyncio
+import functools
+import threading
+import time
+
+import pytest
+
+from agentinterface.offload import AgentPool, is_async
+
+
+def test_is_async_detects_agent_kinds():
+    async def coroutine_agent(q):
+        return q
+
+    async def stream_agent(q):
+        yield q
+
+    class CallableAgent:
+        async def __call__(self, q):
+            return q
+
+    assert is_async(coroutine_agent)
+    assert is_async(stream_agent)
+    assert is_async(CallableAgent())
+    assert is_async(functools.partial(coroutine_agent, "q"))
+    assert not is_async(lambda q: q)
+
+
+def test_unknown_pool_kind_rejected():
+    with pytest.raises(ValueError):
+        AgentPool(kind="fiber")
+
+
+@pytest.mark.asyncio
+async def test_run_offloads_to_worker_thread():
+    pool = AgentPool(max_workers=2)
+    try:
+        thread = await pool.run(threading.get_ident)
+        assert thread != threading.get_ident()
+        assert pool.stats()["completed"] == 1
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_queue_depth_and_rejection():
+    pool = AgentPool(max_workers=1, max_queued=1)
+    release = threading.Event()
+    try:
+        running = asyncio.ensure_future(pool.run(release.wait))
+        waiting = asyncio.ensure_future(pool.run(time.sleep, 0))
+        await asyncio.sleep(0.01)
+
+        stats = pool.stats()
+        assert (stats["active"], stats["queued"]) == (1, 1)
+        with pytest.raises(RuntimeError):
+            await pool.run(time.sleep, 0)
+        assert pool.stats()["rejected"] == 1
+
+        release.set()
+        await asyncio.gather(running, waiting)
+        assert pool.stats()["queued"] == 0
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_run_counts_until_worker_finishes():
+    release = threading.Event()
+    pool = AgentPool(max_workers=1)
+    try:
+        running = asyncio.create_task(pool.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        running.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+
+        # The worker thread is still blocked, so a new call queues behind it
+        waiting = asyncio.ensure_future(pool.run(time.sleep, 0))
+        await asyncio.sleep(0.01)
+        assert (pool.stats()["active"], pool.stats()["queued"]) == (1, 1)
+
+        release.set()
+        await waiting
+        for _ in range(100):
+            if pool.stats()["active"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.stats()["active"] == 0
+        assert pool.stats()["completed"] == 2
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_executor_created_once_across_threads():
+    pool = AgentPool(max_workers=2)
+    results = []
+
+    def call() -> None:
+        results.append(asyncio.run(pool.run(threading.get_ident)))
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 8
+    assert len(set(results)) <= 2  # every call ran on the one 2-worker executor
+    pool.shutdown()
@@ -0,0 +1,68 @@
+"""Patch tests - diff minimality, round trips, session differ."""
+
+import pytest
+
+from agentinterface.patch import TreeDiffer, apply, diff
+
+BASE = [
+    {"type": "card", "data": {"title": "Revenue", "value": "$5M"}},
+    [{"type": "card", "data": {"title": "L"}}, {"type": "card", "data": {"title": "R"}}],
+    {"type": "markdown", "data": {"content": "Summary"}},
+]
+
+
+@pytest.mark.parametrize(
+    "new",
+    [
+        BASE,
+        [BASE[0], BASE[1], {"type": "markdown", "data": {"content": "Updated"}}],
+        [BASE[0], {"type": "card", "data": {"title": "Inserted"}}, BASE[1], BASE[2]],
+        [BASE[0], BASE[2]],
+        [{"type": "card", "data": {"title": "Revenue"}}, BASE[1], BASE[2]],
+        [{"type": "card", "data": {"title": "Revenue", "value": "$5M", "note": "new"}}],
+        {"type": "card", "data": {}},
+        [],
+    ],
+)
+def test_diff_round_trips(new):
+    assert apply(BASE, diff(BASE, new)) == new
+
+
+def test_diff_targets_changed_leaf_only():
+    new = [BASE[0], BASE[1], {"type": "markdown", "data": {"content": "Updated"}}]
+    assert diff(BASE, new) == [{"op": "replace", "path": "/2/data/content", "value": "Updated"}]
+
+
+def test_diff_inserts_without_rewriting_suffix():
+    inserted = {"type": "card", "data": {"title": "Inserted"}}
+    ops = diff(BASE, [BASE[0], inserted, BASE[1], BASE[2]])
+    assert ops == [{"op": "add", "path": "/1", "value": inserted}]
+
+
+def test_diff_escapes_pointer_tokens():
+    old = {"a/b": 1, "c~d": 1}
+    new = {"a/b": 2, "c~d": 2}
+    ops = diff(old, new)
+    assert {op["path"] for op in ops} == {"/a~1b", "/c~0d"}
+    assert apply(old, ops) == new
+
+
+def test_apply_does_not_mutate_input():
+    original = [{"type": "card", "data": {"title": "A"}}]
+    apply(original, [{"op": "replace", "path": "/0/data/title", "value": "B"}])
+    assert original[0]["data"]["title"] == "A"
+
+
+def test_differ_sends_full_tree_first_then_patches():
+    differ = TreeDiffer()
+    assert differ.update(BASE, '"a"') is None
+
+    new = [BASE[0], BASE[1], {"type": "markdown", "data": {"content": "Updated"}}]
+    assert differ.update(new, '"b"') == diff(BASE, new)
+    assert differ.etag == '"b"'
+
+
+def test_differ_prefers_full_tree_when_patch_is_larger():
+    differ = TreeDiffer()
+    differ.update(BASE, '"a"')
+    assert differ.update([{"type": "markdown", "data": {}}], '"b"') is None
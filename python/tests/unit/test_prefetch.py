@@ -0,0 +1,65 @@
+"""Prefetch tests - choice extraction, claim, cancellation."""
+
+import asyncio
+
+import pytest
+
+from agentinterface.prefetch import Prefetcher, choices
+
+
+def _suggestions(*items) -> dict:
+    return {"type": "suggestions", "data": {"suggestions": list(items)}}
+
+
+def test_choices_ranked_by_priority_and_limited():
+    tree = [
+        {"type": "markdown", "data": {"content": "x"}},
+        [
+            _suggestions(
+                {"text": "Low", "priority": "low"},
+                {"text": "Plain"},
+                {"text": "High", "priority": "high"},
+            )
+        ],
+    ]
+    assert [c["text"] for c in choices(tree, 2)] == ["High", "Plain"]
+
+
+def test_choices_dedupe_and_skip_malformed():
+    tree = [
+        _suggestions({"text": "A"}, {"text": "A"}, {"text": "A", "id": "a2"}, "bad", {"id": "x"})
+    ]
+    assert choices(tree, 5) == [{"text": "A"}, {"text": "A", "id": "a2"}]
+
+
+@pytest.mark.asyncio
+async def test_claim_returns_matching_turn_and_cancels_rest():
+    started = []
+
+    async def run(choice):
+        started.append(choice["text"])
+        if choice["text"] == "B":
+            await asyncio.sleep(10)
+        return f"turn {choice['text']}"
+
+    prefetcher = Prefetcher(2)
+    prefetcher.start([_suggestions({"text": "A"}, {"text": "B"}, {"text": "C"})], run)
+    assert len(prefetcher) == 2
+
+    turn = await prefetcher.claim({"action": "select", "data": {"text": "A", "id": None}})
+    assert turn == "turn A"
+    assert len(prefetcher) == 0
+    assert "C" not in started
+
+
+@pytest.mark.asyncio
+async def test_claim_miss_or_failure_returns_none():
+    async def run(choice):
+        raise RuntimeError("agent failed")
+
+    prefetcher = Prefetcher(3)
+    prefetcher.start([_suggestions({"text": "A"})], run)
+    assert await prefetcher.claim({"data": "Other"}) is None
+
+    prefetcher.start([_suggestions({"text": "A"})], run)
+    assert await prefetcher.claim({"data": {"text": "A"}}) is None
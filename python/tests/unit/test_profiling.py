@@ -0,0 +1,133 @@
+"""Profiler tests - 1-in-N selection, runtime toggle, output formats."""
+
+import asyncio
+import pstats
+import sys
+import threading
+import time
+
+import pytest
+
+from agentinterface import ai, profiling
+from agentinterface.profiling import Profiler, set_profiler
+
+
+class StubLLM:
+    async def generate(self, prompt: str) -> str:
+        return '[{"type": "markdown", "data": {"content": "x"}}]'
+
+
+def busy_agent(query: str) -> str:
+    end = time.perf_counter() + 0.05
+    while time.perf_counter() < end:
+        pass
+    return "Done"
+
+
+@pytest.fixture
+def enable():
+    def _enable(profiler):
+        set_profiler(profiler)
+        return profiler
+
+    yield _enable
+    set_profiler(None)
+
+
+def test_profiler_rejects_bad_config(tmp_path):
+    with pytest.raises(ValueError):
+        Profiler(tmp_path, format="svg")
+    with pytest.raises(ValueError):
+        Profiler(tmp_path, every=0)
+
+
+def test_disabled_profiler_takes_no_samples(tmp_path):
+    assert profiling.sample() is None
+
+
+@pytest.mark.asyncio
+async def test_samples_one_in_n_invocations(tmp_path, enable):
+    enable(Profiler(tmp_path, every=3, format="pstats"))
+    wrapped = ai(busy_agent, llm=StubLLM())
+
+    for _ in range(6):
+        await wrapped("q")
+
+    assert len(list(tmp_path.glob("*.pstats"))) == 2
+
+
+@pytest.mark.asyncio
+async def test_pstats_sample_covers_agent_and_validation(tmp_path, enable):
+    enable(Profiler(tmp_path, every=1, format="pstats"))
+    await ai(busy_agent, llm=StubLLM())("q")
+
+    (path,) = tmp_path.glob("*.pstats")
+    functions = {name for _file, _line, name in pstats.Stats(str(path)).stats}
+    assert {"busy_agent", "_validate_component_tree"} <= functions
+
+
+@pytest.mark.asyncio
+async def test_collapsed_sample_records_stacks_for_streams(tmp_path, enable):
+    async def stream_agent(query: str):
+        yield busy_agent(query)
+
+    enable(Profiler(tmp_path, every=1, interval=0.001))
+    events = [event async for event in ai(stream_agent, llm=StubLLM())("q")]
+    assert events[0] == "Done"
+
+    for _ in range(100):
+        paths = list(tmp_path.glob("*.collapsed"))
+        if paths:
+            break
+        await asyncio.sleep(0.01)
+
+    lines = paths[0].read_text().splitlines()
+    assert any("busy_agent" in line for line in lines)
+    stack, hits = lines[0].rsplit(" ", 1)
+    assert ";" in stack and int(hits) > 0
+
+
+@pytest.mark.asyncio
+async def test_unconsumed_results_leave_nothing_running(tmp_path, enable):
+    async def stream_agent(query: str):
+        yield "Done"
+
+    async def async_agent(query: str) -> str:
+        return "Done"
+
+    threads = threading.active_count()
+    enable(Profiler(tmp_path, every=1))
+    stream = ai(stream_agent, llm=StubLLM())("q")
+    enable(Profiler(tmp_path, every=1, format="pstats"))
+    coroutine = ai(async_agent, llm=StubLLM())("q")
+
+    await asyncio.sleep(0.05)
+    assert threading.active_count() == threads
+    assert sys.getprofile() is None
+
+    assert [event async for event in stream][0] == "Done"
+    assert (await coroutine)[0] == "Done"
+    assert len(list(tmp_path.glob("*.pstats"))) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_pstats_samples_trace_one_at_a_time(tmp_path, enable):
+    async def slow_agent(query: str) -> str:
+        await asyncio.sleep(0.02)
+        return "Done"
+
+    enable(Profiler(tmp_path, every=1, format="pstats"))
+    wrapped = ai(slow_agent, llm=StubLLM())
+    await asyncio.gather(wrapped("a"), wrapped("b"))
+
+    assert len(list(tmp_path.glob("*.pstats"))) == 1
+    assert sys.getprofile() is None
+    await wrapped("c")
+    assert len(list(tmp_path.glob("*.pstats"))) == 2
+
+
+def test_set_profiler_toggles_at_runtime(tmp_path):
+    profiler = Profiler(tmp_path, every=1)
+    assert set_profiler(profiler) is None
+    assert set_profiler(None) is profiler
+    assert profiling.sample() is None
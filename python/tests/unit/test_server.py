@@ -0,0 +1,87 @@
+"""Asyncio callback server tests - routing, keep-alive, limits, CORS."""
+
+import asyncio
+import json
+
+import pytest
+
+from agentinterface.server import MAX_BODY_BYTES, start_server
+
+
+async def _echo(method, path, query, data):
+    return 200, {"method": method, "path": path, "query": query, "data": data}
+
+
+async def _read_response(reader):
+    head = (await reader.readuntil(b"\r\n\r\n")).decode()
+    status = int(head.split(" ")[1])
+    headers = dict(line.split(": ", 1) for line in head.split("\r\n")[1:] if line and ": " in line)
+    body = await reader.readexactly(int(headers["Content-Length"]))
+    return status, headers, json.loads(body) if body else None
+
+
+@pytest.fixture
+async def connection():
+    server = await start_server(_echo, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    yield reader, writer
+    writer.close()
+    await writer.wait_closed()
+    server.close()
+    await server.wait_closed()
+    await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_keep_alive_serves_multiple_requests(connection):
+    reader, writer = connection
+    body = b'{"action": "select", "data": "A"}'
+    writer.write(b"POST /callback/abc HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+    writer.write(b"GET /page/h?offset=5&limit=2 HTTP/1.1\r\n\r\n")
+
+    status, headers, payload = await _read_response(reader)
+    assert status == 200
+    assert headers["Access-Control-Allow-Origin"] == "*"
+    assert payload["data"] == {"action": "select", "data": "A"}
+
+    status, _headers, payload = await _read_response(reader)
+    assert (payload["path"], payload["query"]) == ("/page/h", {"offset": "5", "limit": "2"})
+
+
+@pytest.mark.asyncio
+async def test_preflight_returns_cors_headers(connection):
+    reader, writer = connection
+    writer.write(
+        b"OPTIONS /callback/abc HTTP/1.1\r\nAccess-Control-Request-Headers: content-type\r\n\r\n"
+    )
+
+    status, headers, payload = await _read_response(reader)
+    assert status == 204
+    assert headers["Access-Control-Allow-Headers"] == "content-type"
+    assert "POST" in headers["Access-Control-Allow-Methods"]
+
+
+@pytest.mark.asyncio
+async def test_oversized_body_rejected_and_closed(connection):
+    reader, writer = connection
+    writer.write(
+        b"POST /callback/abc HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % (MAX_BODY_BYTES + 1)
+    )
+
+    status, headers, _payload = await _read_response(reader)
+    assert status == 413
+    assert headers["Connection"] == "close"
+    assert await reader.read() == b""
+
+
+@pytest.mark.asyncio
+async def test_missing_length_and_invalid_json(connection):
+    reader, writer = connection
+    writer.write(b"POST /callback/abc HTTP/1.1\r\nContent-Length: 3\r\n\r\nnot")
+    status, _headers, payload = await _read_response(reader)
+    assert (status, payload) == (400, {"error": "Invalid JSON"})
+
+    writer.write(b"POST /callback/abc HTTP/1.1\r\n\r\n")
+    status, _headers, _payload = await _read_response(reader)
+    assert status == 411
@@ -0,0 +1,34 @@
+"""Session store tests - claim once, LRU bound, TTL expiry."""
+
+from unittest.mock import patch
+
+from agentinterface.sessions import SessionStore
+
+
+def test_pop_claims_session_once():
+    store = SessionStore()
+    store.put("a", "session")
+
+    assert "a" in store
+    assert store.pop("a") == "session"
+    assert store.pop("a") is None
+
+
+def test_capacity_evicts_least_recent():
+    store = SessionStore(capacity=2)
+    store.put("a", 1)
+    store.put("b", 2)
+    store.put("c", 3)
+
+    assert len(store) == 2
+    assert store.pop("a") is None
+    assert store.pop("c") == 3
+
+
+def test_expired_sessions_are_not_resumable():
+    store = SessionStore(ttl=10)
+    with patch("agentinterface.sessions.time.monotonic", return_value=100.0):
+        store.put("a", 1)
+    with patch("agentinterface.sessions.time.monotonic", return_value=111.0):
+        assert "a" not in store
+        assert store.pop("a") is None
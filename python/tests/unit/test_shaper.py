@@ -1,5 +1,6 @@
 """shape() contract tests - LLM output validation."""
 
+import asyncio
 import json
 import tempfile
 from pathlib import Path
@@ -7,7 +8,7 @@ from unittest.mock import patch
 
 import pytest
 
-from agentinterface.shaper import find_registry_path, shape
+from agentinterface.shaper import find_registry_path, shape, shape_components, shape_sections
 
 
 class StubLLM:
@@ -88,6 +89,63 @@ async def test_shape_horizontal_composition():
     assert len(data[0]) == 2
 
 
+@pytest.mark.asyncio
+async def test_shape_components_returns_parsed_tree():
+    llm = StubLLM('[{"type": "markdown", "data": {"content": "Hello"}}]')
+    components = await shape_components("Hello", llm=llm)
+    assert components == [{"type": "markdown", "data": {"content": "Hello"}}]
+
+
+@pytest.mark.asyncio
+async def test_shape_components_without_llm_wraps_markdown():
+    components = await shape_components("Hello world", llm=None)
+    assert components == [{"type": "markdown", "data": {"content": "Hello world"}}]
+
+
+@pytest.mark.asyncio
+async def test_shape_sections_maps_one_call_back_to_sections():
+    prompts = []
+
+    class BatchLLM:
+        async def generate(self, prompt: str) -> str:
+            prompts.append(prompt)
+            return json.dumps(
+                {
+                    "s1": [{"type": "markdown", "data": {"content": "Second"}}],
+                    "s0": [{"type": "markdown", "data": {"content": "First"}}],
+                }
+            )
+
+    trees = await shape_sections(["First", "Second"], llm=BatchLLM())
+    assert [tree[0]["data"]["content"] for tree in trees] == ["First", "Second"]
+    assert len(prompts) == 1
+    assert "[s0]\nFirst" in prompts[0] and "[s1]\nSecond" in prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_shape_sections_rejects_missing_section():
+    llm = StubLLM('{"s0": [{"type": "markdown", "data": {"content": "First"}}]}')
+    with pytest.raises(ValueError, match="section s1"):
+        await shape_sections(["First", "Second"], llm=llm)
+
+
+class HangingLLM:
+    async def generate(self, prompt: str) -> str:
+        await asyncio.Event().wait()
+
+
+@pytest.mark.asyncio
+async def test_shape_components_deadline_falls_back_to_markdown():
+    components = await shape_components("Hello", llm=HangingLLM(), deadline=0.01)
+    assert components == [{"type": "markdown", "data": {"content": "Hello"}}]
+
+
+@pytest.mark.asyncio
+async def test_shape_deadline_respects_whitelist():
+    with pytest.raises(asyncio.TimeoutError):
+        await shape("Hello", {"components": ["card"]}, HangingLLM(), deadline=0.01)
+
+
 def test_find_registry_path_in_cwd():
     with tempfile.TemporaryDirectory() as tmpdir:
         registry = Path(tmpdir) / "ai.json"
@@ -0,0 +1,114 @@
+"""Sync facade tests - shared loop, thread safety, streaming, client reuse."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import pytest
+
+from agentinterface.llms import _client
+from agentinterface.sync import background_loop, iter_sync, run_sync
+
+
+async def _current_loop():
+    return asyncio.get_running_loop()
+
+
+def test_run_sync_reuses_one_background_loop():
+    first = run_sync(_current_loop())
+    second = run_sync(_current_loop())
+
+    assert first is second is background_loop()
+    assert first.is_running()
+
+
+def test_run_sync_from_many_threads():
+    async def double(n: int) -> int:
+        await asyncio.sleep(0.001)
+        return n * 2
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda n: run_sync(double(n)), range(50)))
+
+    assert results == [n * 2 for n in range(50)]
+
+
+def test_run_sync_propagates_errors_and_timeouts():
+    async def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        run_sync(fail())
+    with pytest.raises(FutureTimeout):
+        run_sync(asyncio.sleep(1), timeout=0.01)
+
+
+def test_iter_sync_streams_and_closes():
+    closed = threading.Event()
+
+    async def stream():
+        try:
+            yield "a"
+            yield "b"
+            yield "c"
+        finally:
+            closed.set()
+
+    assert list(iter_sync(stream())) == ["a", "b", "c"]
+
+    events = iter_sync(stream())
+    closed.clear()
+    assert next(events) == "a"
+    events.close()
+    assert closed.is_set()
+
+
+def test_provider_clients_reused_on_background_loop():
+    created = []
+
+    def factory():
+        created.append(object())
+        return created[-1]
+
+    async def get():
+        return _client("test", "key", factory)
+
+    assert run_sync(get()) is run_sync(get())
+    assert len(created) == 1
+    assert asyncio.run(get()) is not created[0]
+
+
+def test_provider_client_cache_holds_no_short_lived_loops():
+    """Clients that pin their loop (like httpx pools) never keep asyncio.run() loops alive."""
+    import gc
+    import weakref
+
+    from agentinterface import llms
+
+    loops = weakref.WeakSet()
+
+    class LoopBoundClient:
+        def __init__(self):
+            self.loop = asyncio.get_running_loop()
+            loops.add(self.loop)
+
+    async def get():
+        return _client("pinned", "key", LoopBoundClient)
+
+    for _ in range(20):
+        asyncio.run(get())
+    gc.collect()
+
+    assert len(loops) == 0
+    assert ("pinned", "key") not in llms._clients
+
+
+@pytest.mark.asyncio
+async def test_run_sync_rejects_blocking_the_background_loop():
+    async def nested():
+        with pytest.raises(RuntimeError):
+            run_sync(asyncio.sleep(0))
+        return True
+
+    assert await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(nested(), background_loop()))
@@ -0,0 +1,149 @@
+"""Tabular shaping tests - detection, schema-plus-sample prompts, local splicing."""
+
+import datetime
+import json
+
+import pytest
+
+from agentinterface.shaper import shape
+from agentinterface.tabular import TABULAR_ROW_THRESHOLD, extract_tables, splice_tables
+
+ROWS = TABULAR_ROW_THRESHOLD * 5
+
+
+class FakeFrame:
+    """DataFrame stand-in exposing the split orientation as pandas serializes it."""
+
+    columns = ["region", "revenue"]
+
+    def to_json(self, orient: str, date_format: str):
+        assert (orient, date_format) == ("split", "iso")
+        return json.dumps(
+            {
+                "columns": self.columns,
+                "index": list(range(ROWS)),
+                "data": [[f"r{i}", i * 10] for i in range(ROWS)],
+            }
+        )
+
+
+class FakeArray:
+    """2-D ndarray stand-in."""
+
+    ndim = 2
+
+    def tolist(self):
+        return [[i, i * 2, i * 3] for i in range(ROWS)]
+
+
+class CapturingLLM:
+    def __init__(self, payload: str):
+        self.payload = payload
+        self.prompts = []
+
+    async def generate(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return self.payload
+
+
+def _markdown_table(rows: int) -> str:
+    lines = ["| Name | Score |", "| --- | --- |"]
+    lines += [f"| user{i} | {i} |" for i in range(rows)]
+    return "\n".join(lines)
+
+
+def test_dataframe_becomes_summary():
+    content, tables = extract_tables(FakeFrame())
+    assert list(tables) == ["t0"]
+    assert f"{ROWS} rows" in content
+    assert "region, revenue" in content
+    assert "r99" not in content
+
+
+def test_ndarray_becomes_summary():
+    content, tables = extract_tables(FakeArray())
+    assert tables["t0"].columns == ["column_1", "column_2", "column_3"]
+    assert len(tables["t0"].rows) == ROWS
+
+
+def test_records_become_summary():
+    records = [{"name": f"n{i}", "value": i} for i in range(ROWS)]
+    _content, tables = extract_tables(records)
+    assert tables["t0"].columns == ["name", "value"]
+
+
+def test_dataset_cells_are_json_safe():
+    """Dates and non-finite floats would otherwise make the shaped tree unserializable."""
+    when = datetime.datetime(2024, 1, 2, 3, 4)
+
+    class DatedArray(FakeArray):
+        def tolist(self):
+            return [[when, float("nan"), float("inf")]] * ROWS
+
+    records = [{"day": when.date(), "value": float("nan")}] * ROWS
+    for dataset in (DatedArray(), records):
+        _content, tables = extract_tables(dataset)
+        components = splice_tables([], tables)
+        json.dumps(components, allow_nan=False)  # raises on datetimes and NaN
+
+    assert tables["t0"].rows[0] == ["2024-01-02", None]
+
+
+def test_small_dataset_passes_through():
+    records = [{"name": "a", "value": 1}]
+    content, tables = extract_tables(records)
+    assert tables == {}
+    assert content == str(records)
+
+
+def test_large_markdown_table_replaced_in_text():
+    text = f"Intro\n\n{_markdown_table(ROWS)}\n\nOutro"
+    content, tables = extract_tables(text)
+    assert "Intro" in content
+    assert "Outro" in content
+    assert "user99" not in content
+    assert tables["t0"].rows[99] == ["user99", "99"]
+
+
+def test_small_markdown_table_kept():
+    text = _markdown_table(3)
+    content, tables = extract_tables(text)
+    assert content == text
+    assert tables == {}
+
+
+def test_disallowed_table_skips_extraction():
+    text = _markdown_table(ROWS)
+    content, tables = extract_tables(text, allowed=["markdown"])
+    assert tables == {}
+    assert content == text
+
+
+def test_splice_fills_referenced_table():
+    _content, tables = extract_tables(FakeFrame())
+    components = [{"type": "card", "data": {"title": "Sales"}}]
+    components.append({"type": "table", "data": {"ref": "t0", "title": "By region"}})
+
+    spliced = splice_tables(components, tables)
+    table = spliced[1]["data"]
+    assert "ref" not in table
+    assert table["title"] == "By region"
+    assert len(table["items"]) == ROWS
+    assert table["items"][3] == {"id": "3", "name": "r3", "attributes": {"revenue": 30}}
+    assert table["attributes"] == [{"key": "revenue", "label": "revenue"}]
+
+
+def test_splice_appends_dropped_tables():
+    _content, tables = extract_tables(FakeFrame())
+    spliced = splice_tables([{"type": "markdown", "data": {"content": "x"}}], tables)
+    assert spliced[-1]["type"] == "table"
+    assert len(spliced[-1]["data"]["items"]) == ROWS
+
+
+@pytest.mark.asyncio
+async def test_shape_prompt_independent_of_row_count():
+    llm = CapturingLLM('[{"type": "table", "data": {"ref": "t0", "title": "Scores"}}]')
+    shaped = json.loads(await shape(_markdown_table(ROWS), llm=llm))
+
+    assert "user99" not in llm.prompts[0]
+    assert len(shaped[0]["data"]["items"]) == ROWS
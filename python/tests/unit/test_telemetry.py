@@ -0,0 +1,133 @@
+"""Telemetry hook tests - no-op default, pipeline instrumentation, adapters."""
+
+import contextlib
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agentinterface import telemetry
+from agentinterface.telemetry import Hooks, NoopHooks, OpenTelemetryHooks, set_hooks
+
+
+class RecordingHooks:
+    def __init__(self):
+        self.spans = []
+        self.samples = []
+        self.counts = []
+
+    @contextlib.contextmanager
+    def span(self, name, **attributes):
+        self.spans.append((name, attributes))
+        yield
+
+    def observe(self, name, value, **attributes):
+        self.samples.append((name, value, attributes))
+
+    def count(self, name, value=1, **attributes):
+        self.counts.append((name, value, attributes))
+
+
+@pytest.fixture
+def hooks():
+    recording = RecordingHooks()
+    previous = set_hooks(recording)
+    yield recording
+    set_hooks(previous)
+
+
+class StubLLM:
+    def __init__(self, response: str):
+        self.response = response
+
+    async def generate(self, prompt: str) -> str:
+        return self.response
+
+
+def test_default_hooks_are_noop():
+    assert isinstance(telemetry._hooks, NoopHooks)
+    assert isinstance(RecordingHooks(), Hooks)
+    with telemetry.span("anything", key="value"):
+        telemetry.observe("anything", 1.0)
+        telemetry.count("anything")
+
+
+def test_set_hooks_none_restores_noop():
+    previous = set_hooks(RecordingHooks())
+    assert isinstance(set_hooks(None), RecordingHooks)
+    assert isinstance(telemetry._hooks, NoopHooks)
+    set_hooks(previous)
+
+
+@pytest.mark.asyncio
+async def test_shaper_stages_emit_spans(hooks):
+    from agentinterface.shaper import shape_components
+
+    llm = StubLLM('[{"type": "markdown", "data": {"content": "x"}}]')
+    await shape_components("text", {"components": ["markdown"]}, llm)
+
+    names = [name for name, _attributes in hooks.spans if name != "shaper.registry"]
+    assert names == ["shaper.protocol", "shaper.llm", "shaper.parse", "shaper.validate"]
+
+
+@pytest.mark.asyncio
+async def test_component_fallback_is_counted(hooks):
+    from agentinterface.ai import _generate_components
+
+    components = await _generate_components("text", ("q",), {}, None, StubLLM("not json"))
+
+    assert components[0]["type"] == "markdown"
+    assert ("shaper.fallback", 1, {"reason": "ValueError"}) in hooks.counts
+
+
+@pytest.mark.asyncio
+async def test_rotation_reports_key_index_and_retries(hooks):
+    from agentinterface.llms import with_rotation
+
+    async def limited(key: str) -> str:
+        if key == "k1":
+            raise RuntimeError("429 rate limit")
+        return "ok"
+
+    env = {"HOOKSVC_API_KEY": "k1", "HOOKSVC_API_KEY_1": "k2"}
+    with patch.dict(os.environ, env, clear=False):
+        assert await with_rotation("hooksvc", limited) == "ok"
+
+    assert hooks.spans == [
+        ("llm.request", {"service": "HOOKSVC", "key": "0"}),
+        ("llm.request", {"service": "HOOKSVC", "key": "1"}),
+    ]
+    assert ("llm.retry", 1, {"service": "HOOKSVC"}) in hooks.counts
+
+
+def test_opentelemetry_hooks_use_tracer_and_meter():
+    pytest.importorskip("opentelemetry")
+    tracer, meter = MagicMock(), MagicMock()
+    otel = OpenTelemetryHooks(tracer=tracer, meter=meter)
+
+    otel.span("shaper.llm", stage="x")
+    otel.observe("ai.agent", 0.5)
+    otel.observe("ai.agent", 0.25)
+    otel.count("shaper.fallback", reason="ValueError")
+
+    tracer.start_as_current_span.assert_called_once_with("shaper.llm", attributes={"stage": "x"})
+    meter.create_histogram.assert_called_once_with("ai.agent")
+    assert meter.create_histogram.return_value.record.call_count == 2
+    meter.create_counter.return_value.add.assert_called_once_with(1, {"reason": "ValueError"})
+
+
+def test_prometheus_hooks_record_histograms_and_counters():
+    prometheus_client = pytest.importorskip("prometheus_client")
+    from agentinterface.telemetry import PrometheusHooks
+
+    registry = prometheus_client.CollectorRegistry()
+    prometheus = PrometheusHooks(registry)
+    with prometheus.span("shaper.llm"):
+        pass
+    prometheus.count("shaper.fallback", reason="ValueError")
+
+    assert registry.get_sample_value("agentinterface_shaper_llm_seconds_count") == 1
+    assert (
+        registry.get_sample_value("agentinterface_shaper_fallback_total", {"reason": "ValueError"})
+        == 1
+    )
@@ -0,0 +1,108 @@
+"""Usage accounting tests - ledgers, request tracking, provider extraction."""
+
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from agentinterface import usage
+from agentinterface.usage import Completion, Usage, UsageLedger, track
+
+
+class MeteredLLM:
+    def __init__(self, response: str):
+        self.response = response
+
+    async def generate(self, prompt: str) -> str:
+        return (await self.complete(prompt)).text
+
+    async def complete(self, prompt: str) -> Completion:
+        return Completion(self.response, Usage("stub", "m1", 100, 20, cached_tokens=40))
+
+
+def test_ledger_groups_totals():
+    ledger = UsageLedger()
+    ledger.record(Usage("openai", "a", 10, 2), agent="search", components=["card", "table"])
+    ledger.record(Usage("gemini", "b", 5, 1, cached_tokens=3), agent="search")
+
+    assert len(ledger) == 2
+    assert ledger.summary()["total"]["input_tokens"] == 15
+    assert ledger.summary("agent")["search"]["calls"] == 2
+    by_component = ledger.summary("component")
+    assert by_component["card"]["input_tokens"] == by_component["table"]["input_tokens"] == 10
+    assert by_component["unknown"]["cached_tokens"] == 3
+    assert set(ledger.summary("service")) == {"openai", "gemini"}
+
+    with pytest.raises(ValueError):
+        ledger.summary("key")
+
+    ledger.reset()
+    assert len(ledger) == 0
+    assert ledger.summary() == {}
+
+
+@pytest.mark.asyncio
+async def test_shaping_usage_attributed_to_agent_and_components():
+    from agentinterface import ai
+
+    def report_agent(query: str) -> str:
+        return "Quarterly numbers"
+
+    tree = '[{"type": "card", "data": {"title": "Q3"}}, {"type": "markdown", "data": {"content": "x"}}]'
+    wrapped = ai(report_agent, llm=MeteredLLM(tree))
+
+    with track() as ledger:
+        await wrapped("q")
+    await wrapped("outside request")
+
+    assert ledger.summary()["total"]["input_tokens"] == 100
+    assert list(ledger.summary("agent")) == [report_agent.__qualname__]
+    assert set(ledger.summary("component")) == {"card", "markdown"}
+    assert usage.summary("model")["m1"]["calls"] >= 2
+
+
+@pytest.mark.asyncio
+async def test_failed_shaping_still_records_usage():
+    from agentinterface.shaper import shape_components
+
+    with track() as ledger, pytest.raises(ValueError):
+        await shape_components("text", {}, MeteredLLM("not json"))
+
+    assert ledger.summary("component")["unknown"]["output_tokens"] == 20
+
+
+@pytest.mark.asyncio
+async def test_openai_completion_reports_usage():
+    from agentinterface.llms import OpenAI
+
+    resp = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="[]"))],
+        usage=SimpleNamespace(
+            prompt_tokens=120,
+            completion_tokens=30,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=64),
+        ),
+    )
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(return_value=resp)
+    fake = SimpleNamespace(AsyncOpenAI=lambda api_key: client)
+
+    env = {"OPENAI_API_KEY": "k0", "OPENAI_API_KEY_1": "k1"}
+    with patch.dict(sys.modules, {"openai": fake}), patch.dict(os.environ, env, clear=False):
+        from agentinterface import llms
+
+        llms._rotators.pop("OPENAI", None)
+        completion = await OpenAI("gpt-test").complete("prompt")
+        llms._rotators.pop("OPENAI", None)
+
+    assert completion.text == "[]"
+    assert (completion.usage.input_tokens, completion.usage.output_tokens) == (120, 30)
+    assert completion.usage.cached_tokens == 64
+    assert (completion.usage.service, completion.usage.model, completion.usage.key) == (
+        "openai",
+        "gpt-test",
+        0,
+    )
+    assert completion.usage.latency >= 0
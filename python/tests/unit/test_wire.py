@@ -0,0 +1,104 @@
+"""Wire encoding tests - columnar rows, references, round trips."""
+
+import json
+
+from agentinterface.wire import WireEncoder, decode
+
+
+def _table(rows: int) -> dict:
+    return {
+        "type": "table",
+        "data": {
+            "title": "Regional revenue",
+            "attributes": [
+                {"key": "revenue", "label": "Revenue"},
+                {"key": "growth", "label": "Growth"},
+            ],
+            "items": [
+                {
+                    "id": str(i),
+                    "name": f"Region {i}",
+                    "attributes": {"revenue": f"${i}M", "growth": f"+{i}%"},
+                }
+                for i in range(rows)
+            ],
+        },
+    }
+
+
+def test_round_trip_mixed_tree():
+    tree = [
+        {"type": "card", "data": {"title": "Top", "content": "Body"}},
+        [{"type": "card", "data": {"title": "L"}}, {"type": "markdown", "data": {"content": "R"}}],
+        _table(3),
+    ]
+    assert decode(WireEncoder().encode(tree)) == tree
+
+
+def test_table_rows_are_columnar():
+    tree = [_table(50)]
+    payload = WireEncoder().encode(tree)
+    encoded = json.dumps(payload)
+
+    assert encoded.count('"growth"') < 5
+    assert len(encoded) < len(json.dumps(tree)) * 0.6
+    assert decode(payload) == tree
+
+
+def test_repeated_objects_become_references():
+    shared = {"type": "markdown", "data": {"content": "A long repeated disclaimer paragraph."}}
+    tree = [shared, {"type": "card", "data": {"title": "x", "content": shared}}, shared]
+    payload = WireEncoder().encode(tree)
+
+    assert len(payload["refs"]) >= 1
+    assert json.dumps(payload).count("repeated disclaimer") == 1
+    assert decode(payload) == tree
+
+
+def test_references_persist_across_turns():
+    encoder = WireEncoder()
+    shared = {"type": "markdown", "data": {"content": "Context that every turn repeats."}}
+
+    first = encoder.encode([shared, shared])
+    second = encoder.encode([shared, {"type": "card", "data": {"title": "New"}}])
+
+    assert second["refs"] == {}
+    assert first["session"] == second["session"]
+
+    refs: dict = {}
+    assert decode(first, refs) == [shared, shared]
+    assert decode(second, refs) == [shared, {"type": "card", "data": {"title": "New"}}]
+
+
+def test_reserved_keys_are_escaped():
+    tree = [{"type": "card", "data": {"$ref": 0, "$cols": ["a"], "title": "Literal"}}]
+    assert decode(WireEncoder().encode(tree)) == tree
+
+
+def test_heterogeneous_lists_stay_row_oriented():
+    tree = [{"type": "card", "data": {"title": "A"}}, [{"type": "card", "data": {"title": "B"}}]]
+    payload = WireEncoder().encode(tree)
+    assert isinstance(payload["tree"], list)
+    assert decode(payload) == tree
+
+
+def test_equal_copies_share_one_reference():
+    def disclaimer() -> dict:
+        return {"type": "markdown", "data": {"content": "A long repeated disclaimer paragraph."}}
+
+    tree = [{"type": "card", "data": {"footer": disclaimer()}}, [disclaimer(), disclaimer()]]
+    payload = WireEncoder().encode(tree)
+
+    assert json.dumps(payload).count("repeated disclaimer") == 1
+    assert decode(payload) == tree
+
+
+def test_scalar_tables_skip_reference_detection():
+    note = "Pending review by the finance team"
+    items = [{"region": f"Region {i}", "note": note} for i in range(20)]
+    tree = [{"type": "table", "data": {"items": items}}]
+    payload = WireEncoder().encode(tree)
+
+    assert payload["refs"] == {}
+    assert "$cols" in json.dumps(payload["tree"])
+    assert decode(payload) == tree
@@ -1,5 +1,6 @@
 import React, { useId, useState } from "react";
 import type { CallbackEvent } from "../types";
+import { LoadMore, usePagedItems, type PageHandle } from "../paging";
 
 export interface AccordionSection {
   title: string;
@@ -9,15 +10,19 @@ export interface AccordionSection {
 
 export interface AccordionProps {
   sections?: AccordionSection[];
+  page?: PageHandle;
   className?: string;
   onCallback?: (event: CallbackEvent) => void;
 }
 
 function AccordionComponent({
-  sections = [],
+  sections: shipped,
+  page,
   className,
   onCallback,
 }: AccordionProps) {
+  const paged = usePagedItems(shipped, page);
+  const sections = paged.items;
   const instanceId = useId();
   const [openSections, setOpenSections] = useState<Set<number>>(
     new Set(
@@ -80,6 +85,7 @@ function AccordionComponent({
           </div>
         );
       })}
+      <LoadMore paged={paged} noun="sections" />
     </div>
   );
 }
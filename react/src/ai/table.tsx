@@ -1,4 +1,5 @@
 import React from "react";
+import { LoadMore, usePagedItems, type PageHandle } from "../paging";
 
 export interface TableItem {
   id: string;
@@ -15,10 +16,19 @@ export interface TableProps {
   items: TableItem[];
   attributes: TableAttribute[];
   title?: string;
+  page?: PageHandle;
   className?: string;
 }
 
-function TableComponent({ items, attributes, title, className }: TableProps) {
+function TableComponent({
+  items,
+  attributes,
+  title,
+  page,
+  className,
+}: TableProps) {
+  const paged = usePagedItems(items, page);
+
   return (
     <div
       className={`bg-white dark:bg-gray-800 rounded-xl border border-gray-200 dark:border-gray-700 shadow-sm overflow-hidden ${className}`}
@@ -46,7 +56,7 @@ function TableComponent({ items, attributes, title, className }: TableProps) {
             </tr>
           </thead>
           <tbody>
-            {items.map((item) => (
+            {paged.items.map((item) => (
               <tr
                 key={item.id}
                 className="hover:bg-gray-50 dark:hover:bg-gray-700 border-b border-gray-200 dark:border-gray-600 transition-colors"
@@ -67,6 +77,7 @@ function TableComponent({ items, attributes, title, className }: TableProps) {
           </tbody>
         </table>
       </div>
+      <LoadMore paged={paged} noun="rows" className="px-6 pb-4" />
     </div>
   );
 }
@@ -2,6 +2,7 @@
  * Chronological event timeline.
  */
 import React from "react";
+import { LoadMore, usePagedItems, type PageHandle } from "../paging";
 
 export interface TimelineEvent {
   date: string;
@@ -11,16 +12,19 @@ export interface TimelineEvent {
 
 export interface TimelineProps {
   events?: TimelineEvent[];
+  page?: PageHandle;
   className?: string;
 }
 
-function TimelineComponent({ events = [], className }: TimelineProps) {
+function TimelineComponent({ events, page, className }: TimelineProps) {
+  const paged = usePagedItems(events, page);
+
   return (
     <div
       className={`bg-white dark:bg-gray-800 rounded-xl border border-gray-200 dark:border-gray-700 shadow-sm p-6 ${className}`}
     >
       <div className="space-y-6">
-        {events.map((event, index) => (
+        {paged.items.map((event, index) => (
           <div key={index} className="border-l-4 border-blue-500 pl-6 relative">
             <div className="absolute top-0 w-3 h-3 bg-blue-500 rounded-full -ml-8 mt-1"></div>
             <div className="font-semibold text-gray-900 dark:text-gray-100 text-lg">
@@ -35,6 +39,7 @@ function TimelineComponent({ events = [], className }: TimelineProps) {
           </div>
         ))}
       </div>
+      <LoadMore paged={paged} noun="events" />
     </div>
   );
 }
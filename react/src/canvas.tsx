@@ -10,13 +10,24 @@ import {
   AgentCanvasProps,
   CallbackEvent,
   ComponentTree,
+  PatchOperation,
 } from "./types";
-import { render } from "./renderer";
+import { applyPatch, render } from "./renderer";
+import { decode, isWirePayload, type WirePayload } from "./wire";
 
 const AUTO_SCROLL_DELAY_MS = 50;
 
+export interface AddResponseOptions {
+  /** Shown until the next response, which replaces it (`data.provisional` events). */
+  provisional?: boolean;
+}
+
 export interface AgentCanvasRef {
-  addResponse: (agentJSON: string | ComponentTree) => void;
+  addResponse: (
+    agentJSON: string | ComponentTree | WirePayload,
+    options?: AddResponseOptions,
+  ) => void;
+  patchResponse: (patch: PatchOperation[]) => void;
 }
 
 export const AgentCanvas = forwardRef<AgentCanvasRef, AgentCanvasProps>(
@@ -25,11 +36,15 @@ export const AgentCanvas = forwardRef<AgentCanvasRef, AgentCanvasProps>(
     const scrollRef = useRef<HTMLDivElement>(null);
 
     const addResponse = useCallback(
-      (agentJSON: string | ComponentTree) => {
+      (
+        agentJSON: string | ComponentTree | WirePayload,
+        options: AddResponseOptions = {},
+      ) => {
         let parsed: ComponentTree;
         try {
-          parsed =
+          const raw =
             typeof agentJSON === "string" ? JSON.parse(agentJSON) : agentJSON;
+          parsed = isWirePayload(raw) ? decode(raw) : raw;
         } catch (error) {
           throw new Error(`Invalid component payload: ${error}`);
         }
@@ -38,10 +53,14 @@ export const AgentCanvas = forwardRef<AgentCanvasRef, AgentCanvasProps>(
           id: `response_${Date.now()}_${Math.random().toString(36).slice(2, 11)}`,
           timestamp: Date.now(),
           content: parsed,
+          provisional: options.provisional,
         };
 
         setResponses((prev) => {
-          const updated = [...prev, response];
+          const kept = prev[prev.length - 1]?.provisional
+            ? prev.slice(0, -1)
+            : prev;
+          const updated = [...kept, response];
           return updated.length > maxResponses
             ? updated.slice(-maxResponses)
             : updated;
@@ -56,6 +75,21 @@ export const AgentCanvas = forwardRef<AgentCanvasRef, AgentCanvasProps>(
       [maxResponses],
     );
 
+    const patchResponse = useCallback((patch: PatchOperation[]) => {
+      setResponses((prev) => {
+        const last = prev[prev.length - 1];
+        if (!last) return prev;
+        return [
+          ...prev.slice(0, -1),
+          {
+            ...last,
+            content: applyPatch(last.content, patch),
+            provisional: false,
+          },
+        ];
+      });
+    }, []);
+
     const handleCallback = useCallback(
       (event: CallbackEvent) => {
         onCallback?.(event);
@@ -63,7 +97,10 @@ export const AgentCanvas = forwardRef<AgentCanvasRef, AgentCanvasProps>(
       [onCallback],
     );
 
-    useImperativeHandle(ref, () => ({ addResponse }), [addResponse]);
+    useImperativeHandle(ref, () => ({ addResponse, patchResponse }), [
+      addResponse,
+      patchResponse,
+    ]);
 
     return (
       <div
@@ -4,10 +4,14 @@
 
 // AgentCanvas - infinite scroll container for agent responses
 export { AgentCanvas } from "./canvas";
-export type { AgentCanvasRef } from "./canvas";
+export type { AddResponseOptions, AgentCanvasRef } from "./canvas";
 
 // Core rendering utilities
-export { render } from "./renderer";
+export { render, applyPatch } from "./renderer";
+export { decode, isWirePayload } from "./wire";
+export type { WirePayload } from "./wire";
+export { LoadMore, usePagedItems } from "./paging";
+export type { PageHandle, PagedItems } from "./paging";
 
 // All AI components
 export { Accordion } from "./ai/accordion";
@@ -26,6 +30,7 @@ export type {
   ComponentJSON,
   ComponentArray,
   ComponentMetadata,
+  PatchOperation,
   AgentResponse,
   AgentCanvasProps,
 } from "./types";
@@ -0,0 +1,122 @@
+/**
+ * On-demand pages for large table/timeline/accordion data.
+ *
+ * With `page_size`, the server ships the first page and a `data.page` handle;
+ * the rest is fetched from `GET {url}?offset=&limit=` as the user asks for it.
+ */
+import React, { useCallback, useMemo, useState } from "react";
+
+export interface PageHandle {
+  url: string;
+  field: string;
+  size: number;
+  total: number;
+}
+
+export interface PagedItems<T> {
+  items: T[];
+  total: number;
+  remaining: number;
+  loading: boolean;
+  error: string | null;
+  loadMore: () => Promise<void>;
+}
+
+const NO_ITEMS: never[] = [];
+
+function pageUrl(page: PageHandle, offset: number): string {
+  const separator = page.url.includes("?") ? "&" : "?";
+  return `${page.url}${separator}offset=${offset}&limit=${page.size}`;
+}
+
+/**
+ * Items shipped with the component plus pages loaded since. Loaded pages are
+ * kept per handle, so re-renders keep them and a new dataset starts over.
+ */
+export function usePagedItems<T>(
+  shipped: T[] | undefined,
+  page?: PageHandle,
+): PagedItems<T> {
+  const [more, setMore] = useState<{ url: string; items: T[] } | null>(null);
+  const [loading, setLoading] = useState(false);
+  const [error, setError] = useState<{ url: string; message: string } | null>(
+    null,
+  );
+
+  const url = page?.url;
+  const extra = more && more.url === url ? more.items : NO_ITEMS;
+  const items = useMemo(
+    () =>
+      extra.length
+        ? [...(shipped ?? NO_ITEMS), ...extra]
+        : (shipped ?? NO_ITEMS),
+    [shipped, extra],
+  );
+  const total = Math.max(page?.total ?? 0, items.length);
+
+  const loadMore = useCallback(async () => {
+    if (!page || loading || items.length >= total) return;
+    setLoading(true);
+    try {
+      const response = await fetch(pageUrl(page, items.length));
+      if (!response.ok) {
+        throw new Error(
+          response.status === 404
+            ? "The rest of this data has expired"
+            : `Could not load more (HTTP ${response.status})`,
+        );
+      }
+      const body = await response.json();
+      setMore({ url: page.url, items: [...extra, ...(body.items as T[])] });
+      setError(null);
+    } catch (e) {
+      const message = e instanceof Error ? e.message : String(e);
+      setError({ url: page.url, message });
+    } finally {
+      setLoading(false);
+    }
+  }, [page, loading, items.length, total, extra]);
+
+  return {
+    items,
+    total,
+    remaining: total - items.length,
+    loading,
+    error: error && error.url === url ? error.message : null,
+    loadMore,
+  };
+}
+
+export interface LoadMoreProps {
+  paged: PagedItems<unknown>;
+  noun?: string;
+  className?: string;
+}
+
+/** "Showing n of total" marker with a button that fetches the next page. */
+export function LoadMore({ paged, noun = "items", className }: LoadMoreProps) {
+  if (paged.remaining <= 0) return null;
+
+  return (
+    <div
+      className={`flex items-center justify-between gap-4 pt-4 text-sm text-gray-600 dark:text-gray-300 ${className ?? ""}`}
+    >
+      <span>
+        Showing {paged.items.length} of {paged.total} {noun}
+        {paged.error && (
+          <span role="alert" className="ml-2 text-red-600 dark:text-red-400">
+            {paged.error}
+          </span>
+        )}
+      </span>
+      <button
+        type="button"
+        onClick={() => void paged.loadMore()}
+        disabled={paged.loading}
+        className="font-medium text-blue-600 dark:text-blue-400 hover:underline disabled:opacity-50"
+      >
+        {paged.loading ? "Loading…" : "Load more"}
+      </button>
+    </div>
+  );
+}
@@ -1,6 +1,12 @@
 import React from "react";
 import type { ComponentType } from "react";
-import { CallbackEvent, ComponentTree, ComponentJSON } from "./types";
+import {
+  CallbackEvent,
+  ComponentTree,
+  ComponentJSON,
+  PatchOperation,
+} from "./types";
+import { decode, isWirePayload, type WirePayload } from "./wire";
 import { Accordion } from "./ai/accordion";
 import { Card } from "./ai/card";
 import { Citation } from "./ai/citation";
@@ -25,8 +31,62 @@ const DEFAULT_COMPONENTS: Record<string, ComponentType<any>> = {
   timeline: Timeline,
 };
 
+function unescapeToken(token: string): string {
+  return token.replace(/~1/g, "/").replace(/~0/g, "~");
+}
+
+function applyAt(
+  node: unknown,
+  tokens: string[],
+  operation: PatchOperation,
+): unknown {
+  const [head = "", ...rest] = tokens;
+
+  if (Array.isArray(node)) {
+    const copy = node.slice();
+    const index = head === "-" ? copy.length : Number(head);
+    if (rest.length) {
+      copy[index] = applyAt(copy[index], rest, operation);
+    } else if (operation.op === "add") {
+      copy.splice(index, 0, operation.value);
+    } else if (operation.op === "remove") {
+      copy.splice(index, 1);
+    } else {
+      copy[index] = operation.value;
+    }
+    return copy;
+  }
+
+  const copy: Record<string, unknown> = {
+    ...(node as Record<string, unknown>),
+  };
+  if (rest.length) {
+    copy[head] = applyAt(copy[head], rest, operation);
+  } else if (operation.op === "remove") {
+    delete copy[head];
+  } else {
+    copy[head] = operation.value;
+  }
+  return copy;
+}
+
+/**
+ * Apply a `component_patch` to the previous tree. Untouched subtrees keep
+ * their identity, so only changed branches re-render.
+ */
+export function applyPatch(
+  tree: ComponentTree,
+  patch: PatchOperation[],
+): ComponentTree {
+  return patch.reduce<unknown>((current, operation) => {
+    if (operation.path === "") return operation.value;
+    const tokens = operation.path.slice(1).split("/").map(unescapeToken);
+    return applyAt(current, tokens, operation);
+  }, tree) as ComponentTree;
+}
+
 export function render(
-  agentJSON: string | ComponentTree,
+  agentJSON: string | ComponentTree | WirePayload,
   components?: Record<string, ComponentType<any>>,
   onCallback?: (event: CallbackEvent) => void,
 ): React.ReactNode {
@@ -73,8 +133,9 @@ export function render(
     return <Component key={key} {...processedData} onCallback={onCallback} />;
   }
 
-  const parsed =
+  const raw =
     typeof agentJSON === "string" ? JSON.parse(agentJSON) : agentJSON;
+  const parsed = isWirePayload(raw) ? decode(raw) : raw;
   return Array.isArray(parsed) ? (
     <div className="space-y-6">
       {parsed.map((item, i) => renderItem(item, i))}
@@ -26,6 +26,12 @@ export type ComponentArray = ComponentJSON[];
 
 export type ComponentTree = ComponentJSON | ComponentArray;
 
+export interface PatchOperation {
+  op: "add" | "remove" | "replace";
+  path: string;
+  value?: unknown;
+}
+
 export interface CallbackEvent {
   type: "click" | "change" | "select" | "toggle";
   component: string;
@@ -36,6 +42,7 @@ export interface AgentResponse {
   id: string;
   timestamp: number;
   content: ComponentTree;
+  provisional?: boolean;
 }
 
 export interface AgentCanvasProps {
@@ -0,0 +1,92 @@
+/**
+ * Compact wire decoding: columnar rows and session-scoped references.
+ */
+import type { ComponentTree } from "./types";
+
+export interface WirePayload {
+  $wire: number;
+  session: string;
+  refs: Record<string, unknown>;
+  tree: unknown;
+}
+
+type ColumnSpec = string | [string, ColumnSpec[]];
+
+const MAX_SESSIONS = 64;
+
+const sessions = new Map<string, Record<string, unknown>>();
+
+export function isWirePayload(value: unknown): value is WirePayload {
+  return (
+    !!value &&
+    typeof value === "object" &&
+    !Array.isArray(value) &&
+    "$wire" in value &&
+    "tree" in value
+  );
+}
+
+function sessionRefs(session: string): Record<string, unknown> {
+  let refs = sessions.get(session);
+  if (refs) {
+    sessions.delete(session);
+  } else {
+    refs = {};
+    if (sessions.size >= MAX_SESSIONS) {
+      const oldest = sessions.keys().next().value;
+      if (oldest !== undefined) sessions.delete(oldest);
+    }
+  }
+  sessions.set(session, refs);
+  return refs;
+}
+
+export function decode(
+  payload: WirePayload,
+  refs: Record<string, unknown> = sessionRefs(payload.session),
+): ComponentTree {
+  Object.assign(refs, payload.refs);
+  const resolved = new Map<string, unknown>();
+
+  function resolve(ref: unknown): unknown {
+    const key = String(ref);
+    if (!resolved.has(key)) {
+      resolved.set(key, decodeValue(refs[key]));
+    }
+    return resolved.get(key);
+  }
+
+  function decodeRow(spec: ColumnSpec[], row: unknown[]): Record<string, any> {
+    const decoded: Record<string, any> = {};
+    spec.forEach((col, i) => {
+      decoded[Array.isArray(col) ? col[0] : col] = Array.isArray(col)
+        ? decodeRow(col[1], row[i] as unknown[])
+        : decodeValue(row[i]);
+    });
+    return decoded;
+  }
+
+  function decodeObject(value: Record<string, unknown>): Record<string, any> {
+    return Object.fromEntries(
+      Object.entries(value).map(([k, v]) => [k, decodeValue(v)]),
+    );
+  }
+
+  function decodeValue(value: unknown): unknown {
+    if (Array.isArray(value)) return value.map(decodeValue);
+    if (!value || typeof value !== "object") return value;
+
+    const node = value as Record<string, any>;
+    const keys = Object.keys(node);
+    if (keys.length === 1 && "$ref" in node) return resolve(node.$ref);
+    if ("$cols" in node && "$rows" in node) {
+      return (node.$rows as unknown[][]).map((row) =>
+        decodeRow(node.$cols as ColumnSpec[], row),
+      );
+    }
+    if (keys.length === 1 && "$lit" in node) return decodeObject(node.$lit);
+    return decodeObject(node);
+  }
+
+  return decodeValue(payload.tree) as ComponentTree;
+}
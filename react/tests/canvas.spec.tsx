@@ -34,4 +34,23 @@ describe("AgentCanvas", () => {
 
     expect(screen.getByText("Stringified")).toBeInTheDocument();
   });
+
+  it("replaces a provisional response with the next one", () => {
+    const ref = React.createRef<AgentCanvasRef>();
+    render(<AgentCanvas ref={ref} />);
+
+    act(() => {
+      ref.current?.addResponse(
+        { type: "markdown", data: { content: "Draft answer" } },
+        { provisional: true },
+      );
+    });
+    expect(screen.getByText("Draft answer")).toBeInTheDocument();
+
+    act(() => {
+      ref.current?.addResponse({ type: "card", data: { title: "Shaped" } });
+    });
+    expect(screen.getByText("Shaped")).toBeInTheDocument();
+    expect(screen.queryByText("Draft answer")).toBeNull();
+  });
 });
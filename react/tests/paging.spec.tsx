@@ -0,0 +1,74 @@
+import React from "react";
+import { render as rtlRender, screen, fireEvent } from "@testing-library/react";
+import { afterEach, describe, it, expect, vi } from "vitest";
+import { render } from "../src/renderer";
+
+function row(i: number) {
+  return { id: String(i), name: `Region ${i}`, attributes: {} };
+}
+
+function pagedTable(total: number, size: number) {
+  return {
+    type: "table",
+    data: {
+      attributes: [],
+      items: Array.from({ length: size }, (_, i) => row(i)),
+      page: { url: "http://test/page/h1", field: "items", size, total },
+    },
+  };
+}
+
+function respond(status: number, body: unknown = {}) {
+  return Promise.resolve({
+    ok: status === 200,
+    status,
+    json: () => Promise.resolve(body),
+  });
+}
+
+afterEach(() => {
+  vi.unstubAllGlobals();
+});
+
+describe("paged components", () => {
+  it("marks truncated data and loads the next page on demand", async () => {
+    const fetch = vi.fn(() =>
+      respond(200, { items: [row(2), row(3)], offset: 2, total: 4 }),
+    );
+    vi.stubGlobal("fetch", fetch);
+
+    rtlRender(<>{render(pagedTable(4, 2))}</>);
+    expect(screen.getByText("Showing 2 of 4 rows")).toBeInTheDocument();
+
+    fireEvent.click(screen.getByText("Load more"));
+
+    expect(await screen.findByText("Region 3")).toBeInTheDocument();
+    expect(fetch).toHaveBeenCalledWith("http://test/page/h1?offset=2&limit=2");
+    expect(screen.queryByText("Load more")).toBeNull();
+  });
+
+  it("reports an expired handle instead of failing silently", async () => {
+    vi.stubGlobal("fetch", vi.fn(() => respond(404, { status: "expired" })));
+
+    rtlRender(<>{render(pagedTable(4, 2))}</>);
+    fireEvent.click(screen.getByText("Load more"));
+
+    expect(await screen.findByRole("alert")).toHaveTextContent("expired");
+    expect(screen.getByText("Region 1")).toBeInTheDocument();
+  });
+
+  it("renders unpaged data without a marker", () => {
+    rtlRender(
+      <>
+        {render({
+          type: "timeline",
+          data: {
+            events: [{ date: "2024", title: "Launch", description: "" }],
+          },
+        })}
+      </>,
+    );
+    expect(screen.getByText("Launch")).toBeInTheDocument();
+    expect(screen.queryByText("Load more")).toBeNull();
+  });
+});
@@ -1,7 +1,7 @@
 import React from "react";
 import { render as rtlRender, screen, fireEvent } from "@testing-library/react";
 import { describe, it, expect, vi } from "vitest";
-import { render } from "../src/renderer";
+import { applyPatch, render } from "../src/renderer";
 
 function mount(node: React.ReactNode) {
   return rtlRender(<>{node}</>);
@@ -108,3 +108,48 @@ describe("render()", () => {
     expect(screen.getByText("Structured")).toBeInTheDocument();
   });
 });
+
+describe("applyPatch()", () => {
+  const tree = [
+    { type: "card", data: { title: "Revenue", value: "$5M" } },
+    [
+      { type: "card", data: { title: "Left" } },
+      { type: "card", data: { title: "Right" } },
+    ],
+  ];
+
+  it("replaces changed leaves and keeps untouched branches", () => {
+    const patched = applyPatch(tree, [
+      { op: "replace", path: "/0/data/value", value: "$6M" },
+    ]) as any[];
+
+    expect(patched[0].data.value).toBe("$6M");
+    expect(patched[1]).toBe(tree[1]);
+    expect(tree[0]).toEqual({
+      type: "card",
+      data: { title: "Revenue", value: "$5M" },
+    });
+  });
+
+  it("inserts and removes array items", () => {
+    const inserted = { type: "markdown", data: { content: "New" } };
+    const patched = applyPatch(tree, [
+      { op: "add", path: "/1", value: inserted },
+      { op: "remove", path: "/2/1" },
+    ]) as any[];
+
+    expect(patched).toHaveLength(3);
+    expect(patched[1]).toBe(inserted);
+    expect(patched[2]).toHaveLength(1);
+  });
+
+  it("unescapes pointer tokens and supports root replacement", () => {
+    const patched = applyPatch({ type: "card", data: { "a/b": 1 } }, [
+      { op: "replace", path: "/data/a~1b", value: 2 },
+    ]) as any;
+    expect(patched.data["a/b"]).toBe(2);
+
+    const replaced = applyPatch(tree, [{ op: "replace", path: "", value: [] }]);
+    expect(replaced).toEqual([]);
+  });
+});
@@ -0,0 +1,73 @@
+import { describe, it, expect } from "vitest";
+import { decode, isWirePayload, type WirePayload } from "../src/wire";
+
+describe("wire decode", () => {
+  it("detects wire payloads", () => {
+    expect(isWirePayload({ $wire: 1, session: "s", refs: {}, tree: [] })).toBe(
+      true,
+    );
+    expect(isWirePayload([{ type: "card", data: {} }])).toBe(false);
+    expect(isWirePayload({ type: "card", data: {} })).toBe(false);
+  });
+
+  it("expands columnar rows with nested columns", () => {
+    const payload: WirePayload = {
+      $wire: 1,
+      session: "columnar",
+      refs: {},
+      tree: [
+        {
+          type: "table",
+          data: {
+            items: {
+              $cols: ["id", "name", ["attributes", ["revenue"]]],
+              $rows: [
+                ["na", "North America", ["$1.2M"]],
+                ["eu", "Europe", ["$800K"]],
+              ],
+            },
+          },
+        },
+      ],
+    };
+
+    expect(decode(payload)).toEqual([
+      {
+        type: "table",
+        data: {
+          items: [
+            { id: "na", name: "North America", attributes: { revenue: "$1.2M" } },
+            { id: "eu", name: "Europe", attributes: { revenue: "$800K" } },
+          ],
+        },
+      },
+    ]);
+  });
+
+  it("resolves references sent in earlier payloads of a session", () => {
+    const shared = { type: "markdown", data: { content: "Repeated context" } };
+    decode({ $wire: 1, session: "turns", refs: { "0": shared }, tree: [] });
+
+    const tree = decode({
+      $wire: 1,
+      session: "turns",
+      refs: {},
+      tree: [{ $ref: 0 }, { type: "card", data: { content: { $ref: 0 } } }],
+    });
+
+    expect(tree).toEqual([shared, { type: "card", data: { content: shared } }]);
+  });
+
+  it("unwraps escaped literal objects", () => {
+    const tree = decode({
+      $wire: 1,
+      session: "literal",
+      refs: {},
+      tree: [{ type: "card", data: { $lit: { $ref: 0, title: "Literal" } } }],
+    });
+
+    expect(tree).toEqual([
+      { type: "card", data: { $ref: 0, title: "Literal" } },
+    ]);
+  });
+});